@@ -0,0 +1,254 @@
+# backend/benchmarks/fake_llm_server.py
+"""
+Deterministic stand-in for Ollama and OpenAI-compatible servers
+
+Answers /api/tags, /api/ps, /api/generate (streaming or not), /v1/models and
+/v1/chat/completions with canned JSON per document type, after a latency drawn
+from a seeded distribution plus generation time at a fixed token rate. Errors
+and hung requests can be injected at given rates. Point the backend at it to
+run and load-test the whole stack offline:
+
+    cd backend
+    python -m benchmarks.fake_llm_server --port 11500 --latency lognormal:0.4:0.3 --tokens-per-second 60
+    OLLAMA_URL=http://localhost:11500 uvicorn src.main:app
+"""
+
+import re
+import json
+import math
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from aiohttp import web
+
+# Outputs match the schemas in prompts.yaml
+CANNED_OUTPUTS: Dict[str, Dict[str, Any]] = {
+    "invoice": {
+        "vendor_name": "ACME Supplies Ltd",
+        "invoice_number": "INV-2025-0042",
+        "total_amount": 135.0,
+        "invoice_date": "2025-02-14",
+        "customer_info": "Northwind Traders, 22 High St, York",
+    },
+    "receipt": {
+        "store_name": "TESCO Stores Ltd",
+        "store_address": "Camden High St, London",
+        "receipt_number": "0098-1123",
+        "total_amount": 3.5,
+        "purchase_date": "12/03/2025",
+        "items_purchased": ["Milk 2L 1.45", "Bread 0.95", "Bananas 1.10"],
+        "payment_method": "VISA",
+        "server_name": "Amy",
+    },
+    "contract": {
+        "parties": ["Contoso Ltd", "Fabrikam Inc"],
+        "contract_type": "Service Agreement",
+        "effective_date": "1 January 2025",
+        "key_terms": ["12 month term", "2,000 GBP per month", "30 days notice"],
+    },
+    "form": {
+        "form_type": "Membership Application",
+        "applicant_name": "Jane Smith",
+        "contact_info": "jane.smith@example.com",
+        "form_fields": {"membership": "annual"},
+    },
+}
+
+_DOC_TYPE = re.compile(r"(?:extract|from this) (\w+) (?:information|excerpt)", re.IGNORECASE)
+
+
+class LatencyModel:
+    """Seeded latency draws: fixed:S, uniform:LO:HI, normal:MEAN:SD or lognormal:MEDIAN:SIGMA (seconds)"""
+
+    def __init__(self, spec: str, rng: random.Random):
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        self.rng = rng
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(*self.params))
+        median, sigma = self.params
+        return self.rng.lognormvariate(math.log(median), sigma)
+
+
+class FakeLLMServer:
+    """Canned, timed answers; every random draw comes from one seeded generator"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.rng = random.Random(args.seed)
+        self.latency = LatencyModel(args.latency, self.rng)
+        self.tokens_per_second = args.tokens_per_second
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.hang_rate = args.hang_rate
+        self.models = [m.strip() for m in args.models.split(",") if m.strip()]
+
+        self.outputs = dict(CANNED_OUTPUTS)
+        if args.outputs:
+            self.outputs.update(json.loads(Path(args.outputs).read_text()))
+
+        self.stats = {"requests": 0, "errors": 0, "hung": 0, "by_doc_type": {}}
+
+    def _doc_type(self, prompt: str) -> str:
+        match = _DOC_TYPE.search(prompt)
+        doc_type = match.group(1).lower() if match else ""
+        return doc_type if doc_type in self.outputs else "invoice"
+
+    def _plan(self, prompt: str) -> Dict[str, Any]:
+        """Decide the outcome and timing of one request up front (keeps draws in request order)"""
+        doc_type = self._doc_type(prompt)
+        text = json.dumps(self.outputs[doc_type])
+        tokens = max(1, len(text) // 4)
+        roll = self.rng.random()
+
+        self.stats["requests"] += 1
+        by_type = self.stats["by_doc_type"]
+        by_type[doc_type] = by_type.get(doc_type, 0) + 1
+
+        plan = {
+            "text": text,
+            "prompt_tokens": max(1, len(prompt) // 4),
+            "tokens": tokens,
+            "first_token": self.latency.sample(),
+            "generation": tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0,
+            "outcome": "ok",
+        }
+        if roll < self.error_rate:
+            plan["outcome"] = "error"
+            self.stats["errors"] += 1
+        elif roll < self.error_rate + self.hang_rate:
+            plan["outcome"] = "hang"
+            self.stats["hung"] += 1
+        return plan
+
+    async def _fail(self, plan: Dict[str, Any]) -> Optional[web.Response]:
+        await asyncio.sleep(plan["first_token"])
+        if plan["outcome"] == "hang":
+            # Held until the client gives up
+            await asyncio.sleep(3600)
+        if plan["outcome"] == "error":
+            return web.json_response({"error": "injected failure"}, status=self.error_status)
+        return None
+
+    # Ollama
+
+    async def tags(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": f"{m}:latest", "model": f"{m}:latest"} for m in self.models]})
+
+    async def ps(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"name": f"{m}:latest"} for m in self.models]})
+
+    async def generate(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        prompt = f"{body.get('system', '')}\n{body.get('prompt', '')}"
+        if (not body.get("prompt") and not body.get("context")) or body.get("options", {}).get("num_predict") == 1:
+            # Load / keep-alive / warm-up request
+            return web.json_response({"model": body.get("model"), "response": "", "done": True, "done_reason": "load"})
+
+        plan = self._plan(prompt)
+        failure = await self._fail(plan)
+        if failure is not None:
+            return failure
+
+        final = {
+            "model": body.get("model"),
+            "done": True,
+            "done_reason": "stop",
+            "context": [1, 2, 3],
+            "prompt_eval_count": plan["prompt_tokens"],
+            "eval_count": plan["tokens"],
+            "total_duration": int((plan["first_token"] + plan["generation"]) * 1e9),
+            "load_duration": 0,
+        }
+
+        if body.get("stream", True):
+            response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+            await response.prepare(request)
+            chunks = [plan["text"][i:i + 16] for i in range(0, len(plan["text"]), 16)]
+            for chunk in chunks:
+                await asyncio.sleep(plan["generation"] / len(chunks))
+                await response.write((json.dumps({"response": chunk, "done": False}) + "\n").encode())
+            await response.write((json.dumps({**final, "response": ""}) + "\n").encode())
+            await response.write_eof()
+            return response
+
+        await asyncio.sleep(plan["generation"])
+        return web.json_response({**final, "response": plan["text"]})
+
+    # OpenAI-compatible
+
+    async def models_list(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "data": [{"id": m, "object": "model"} for m in self.models]})
+
+    async def chat(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+
+        plan = self._plan(prompt)
+        failure = await self._fail(plan)
+        if failure is not None:
+            return failure
+
+        await asyncio.sleep(plan["generation"])
+        return web.json_response({
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": plan["text"]}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": plan["prompt_tokens"],
+                "completion_tokens": plan["tokens"],
+                "total_tokens": plan["prompt_tokens"] + plan["tokens"],
+            },
+        })
+
+    async def fake_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_get("/api/tags", self.tags)
+        app.router.add_get("/api/ps", self.ps)
+        app.router.add_post("/api/generate", self.generate)
+        app.router.add_get("/v1/models", self.models_list)
+        app.router.add_post("/v1/chat/completions", self.chat)
+        app.router.add_get("/fake/stats", self.fake_stats)
+        return app
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Deterministic fake Ollama / OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", default="lognormal:0.3:0.4",
+                        help="Time to first token: fixed:S | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share of requests that never answer")
+    parser.add_argument("--models", default="llama2", help="Comma-separated model names to advertise")
+    parser.add_argument("--outputs", help="JSON file of canned outputs per document type (overrides the defaults)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    server = FakeLLMServer(args)
+    print(f"🧪 Fake LLM server on http://{args.host}:{args.port} (latency {args.latency}, "
+          f"{args.tokens_per_second:g} tok/s, errors {args.error_rate:.0%}, hangs {args.hang_rate:.0%})")
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
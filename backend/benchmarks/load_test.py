@@ -0,0 +1,310 @@
+# backend/benchmarks/load_test.py
+"""
+End-to-end load test of the document API with regression checks against a baseline
+
+Drives /api/documents/scan, /api/documents/batch-scan and /api/workflow/webhook
+at each concurrency level and reports throughput, p50/p95/p99 latency and error
+rate per (endpoint, concurrency). With --spawn it starts the fake LLM server and
+the API itself (on free ports, with throwaway cache/state) so it runs offline.
+
+    cd backend
+    python -m benchmarks.load_test --spawn --concurrency 1,4,16 --requests 40 --save-baseline
+    python -m benchmarks.load_test --spawn --concurrency 1,4,16 --requests 40   # exit 1 on regression
+
+Against an already running API: --url http://localhost:8000 (no --spawn).
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import aiohttp
+
+from benchmarks.prefix_reuse_benchmark import SAMPLE_DOCUMENTS
+
+ENDPOINTS = {
+    "scan": "/api/documents/scan",
+    "batch-scan": "/api/documents/batch-scan",
+    "webhook": "/api/workflow/webhook",
+}
+
+DEFAULT_BASELINE = Path(__file__).with_name("load_baseline.json")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _document(index: int) -> Tuple[str, bytes]:
+    """A distinct document per request so caches and near-duplicate reuse do not short-circuit the LLM"""
+    doc_type = list(SAMPLE_DOCUMENTS)[index % len(SAMPLE_DOCUMENTS)]
+    text = f"{SAMPLE_DOCUMENTS[doc_type]}\nReference: LT-{index:06d} / {index * 7 % 1000}.{index % 100:02d}"
+    return f"{doc_type}_{index}.txt", text.encode("utf-8")
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _failed_documents(endpoint: str, body: Dict[str, Any]) -> bool:
+    """Whether a 200 response still carries a failed extraction"""
+    if endpoint == "batch-scan":
+        return body.get("failed", 0) > 0
+    result = body.get("processing_result", body) if endpoint == "webhook" else body
+    extracted = result.get("extracted_data") if isinstance(result, dict) else None
+    return not isinstance(extracted, dict) or "error" in extracted
+
+
+class LoadTest:
+    """Fires a fixed number of requests per (endpoint, concurrency) and collects latencies"""
+
+    def __init__(self, base_url: str, requests: int, batch_size: int, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.requests = requests
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._counter = 0
+
+    def _form(self, endpoint: str) -> aiohttp.FormData:
+        form = aiohttp.FormData()
+        files = self.batch_size if endpoint == "batch-scan" else 1
+        for _ in range(files):
+            filename, content = _document(self._counter)
+            self._counter += 1
+            form.add_field("files" if endpoint == "batch-scan" else "file", content,
+                           filename=filename, content_type="text/plain")
+        if endpoint == "webhook":
+            form.add_field("workflow_type", "quick_scan")
+        return form
+
+    async def _one(self, session: aiohttp.ClientSession, endpoint: str) -> Tuple[float, Optional[str]]:
+        form = self._form(endpoint)
+        started = time.perf_counter()
+        try:
+            async with session.post(self.base_url + ENDPOINTS[endpoint], data=form) as response:
+                body = await response.json(content_type=None)
+                error = None
+                if response.status >= 400:
+                    error = f"http_{response.status}"
+                elif _failed_documents(endpoint, body):
+                    error = "extraction_failed"
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except aiohttp.ClientError as e:
+            error = type(e).__name__
+        return time.perf_counter() - started, error
+
+    async def run_level(self, endpoint: str, concurrency: int) -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+        remaining = self.requests
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+
+            async def worker():
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    seconds, error = await self._one(session, endpoint)
+                    latencies.append(seconds)
+                    if error:
+                        errors[error] = errors.get(error, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            wall = time.perf_counter() - started
+
+        documents = self.requests * (self.batch_size if endpoint == "batch-scan" else 1)
+        failed = sum(errors.values())
+        return {
+            "endpoint": endpoint,
+            "concurrency": concurrency,
+            "requests": self.requests,
+            "throughput_rps": round(self.requests / wall, 3),
+            "documents_per_second": round(documents / wall, 3),
+            "p50_s": round(_percentile(latencies, 0.50), 4),
+            "p95_s": round(_percentile(latencies, 0.95), 4),
+            "p99_s": round(_percentile(latencies, 0.99), 4),
+            "mean_s": round(statistics.mean(latencies), 4),
+            "error_rate": round(failed / self.requests, 4),
+            "errors": errors,
+        }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float,
+            error_tolerance: float) -> List[str]:
+    """Regressions of throughput, p95 latency or error rate beyond the tolerances"""
+    regressions = []
+    reference = {f"{r['endpoint']}@{r['concurrency']}": r for r in baseline.get("results", [])}
+    for result in results:
+        key = f"{result['endpoint']}@{result['concurrency']}"
+        base = reference.get(key)
+        if base is None:
+            continue
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {result['throughput_rps']} < baseline {base['throughput_rps']}")
+        if result["p95_s"] > base["p95_s"] * (1 + tolerance):
+            regressions.append(f"{key}: p95 {result['p95_s']}s > baseline {base['p95_s']}s")
+        if result["error_rate"] > base["error_rate"] + error_tolerance:
+            regressions.append(f"{key}: error rate {result['error_rate']} > baseline {base['error_rate']}")
+    return regressions
+
+
+class SpawnedStack:
+    """Fake LLM server plus the API in subprocesses, with state in a temporary directory"""
+
+    def __init__(self, fake_args: List[str]):
+        self.fake_args = fake_args
+        self.processes: List[subprocess.Popen] = []
+        self.workdir = tempfile.TemporaryDirectory(prefix="load_test_")
+        self.url = ""
+
+    async def __aenter__(self) -> "SpawnedStack":
+        backend_dir = Path(__file__).resolve().parent.parent
+        fake_port, api_port = _free_port(), _free_port()
+        state = Path(self.workdir.name)
+
+        env = dict(os.environ)
+        env.update({
+            "OLLAMA_URL": f"http://127.0.0.1:{fake_port}",
+            "OLLAMA_URLS": f"http://127.0.0.1:{fake_port}",
+            "FAILOVER_CHAIN": "ollama",
+            "CACHE_DB_PATH": str(state / "extractions.sqlite3"),
+            "NEAR_DUP_SNAPSHOT_PATH": str(state / "near_duplicates.npz"),
+            "VENDOR_TEMPLATES_PATH": str(state / "vendor_templates.json"),
+            # Nothing from the developer's checkout: no backends.yaml (the chain above
+            # applies), no promoted or online classifier, no record/replay
+            "BACKENDS_FILE": str(state / "backends.yaml"),
+            "CLASSIFIER_REGISTRY_DIR": str(state / "classifier"),
+            "LLM_RECORD_MODE": "off",
+            "PYTHONPATH": str(backend_dir),
+        })
+
+        self.processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_llm_server", "--port", str(fake_port), *self.fake_args],
+            cwd=backend_dir, env=env,
+        ))
+        self.processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(api_port), "--log-level", "warning"],
+            cwd=backend_dir, env=env, stdout=subprocess.DEVNULL,
+        ))
+        self.url = f"http://127.0.0.1:{api_port}"
+        await self._wait_ready()
+        return self
+
+    async def _wait_ready(self, seconds: float = 120) -> None:
+        deadline = time.monotonic() + seconds
+        async with aiohttp.ClientSession() as session:
+            while time.monotonic() < deadline:
+                if any(p.poll() is not None for p in self.processes):
+                    raise RuntimeError("A spawned process exited during startup")
+                try:
+                    async with session.get(f"{self.url}/ping") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.5)
+        raise RuntimeError(f"API did not come up within {seconds:.0f}s")
+
+    async def __aexit__(self, *exc) -> None:
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.workdir.cleanup()
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    levels = [int(c) for c in args.concurrency.split(",")]
+    endpoints = [e.strip() for e in args.endpoints.split(",")]
+
+    async def drive(url: str) -> List[Dict[str, Any]]:
+        test = LoadTest(url, args.requests, args.batch_size, args.timeout)
+        results = []
+        for endpoint in endpoints:
+            for concurrency in levels:
+                result = await test.run_level(endpoint, concurrency)
+                print(f"  {endpoint:<11} c={concurrency:<3} {result['throughput_rps']:>8.2f} req/s  "
+                      f"p50 {result['p50_s']:.3f}s  p95 {result['p95_s']:.3f}s  p99 {result['p99_s']:.3f}s  "
+                      f"errors {result['error_rate']:.1%}")
+                results.append(result)
+        return results
+
+    if args.spawn:
+        async with SpawnedStack(args.fake_args.split()) as stack:
+            return await drive(stack.url)
+    return await drive(args.url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the document API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--spawn", action="store_true", help="Start the fake LLM server and the API locally")
+    parser.add_argument("--fake-args", default="--latency lognormal:0.2:0.3 --tokens-per-second 200 --seed 42",
+                        help="Arguments passed to benchmarks.fake_llm_server with --spawn")
+    parser.add_argument("--endpoints", default="scan,batch-scan,webhook")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--batch-size", type=int, default=4, help="Files per batch-scan request")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative throughput drop / p95 increase before failing")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="Allowed absolute error-rate increase")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"🚦 Load test: {args.endpoints} at concurrency {args.concurrency}, {args.requests} requests each")
+    results = asyncio.run(run(args))
+    report = {"created_at": time.time(), "settings": {
+        "requests": args.requests, "batch_size": args.batch_size,
+        "fake_args": args.fake_args if args.spawn else None,
+    }, "results": results}
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"💾 Baseline saved to {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print("⚠️ No baseline to compare against (run with --save-baseline)")
+        return
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance, args.error_tolerance)
+    if regressions:
+        print("❌ Regressions against baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# backend/benchmarks/onnx_benchmark.py
+"""
+PyTorch pipeline vs int8-quantized ONNX Runtime for the Hugging Face extraction model
+
+Each runtime is measured in a fresh process so startup time and peak RSS are
+not polluted by the other one. Requires optimum[onnxruntime] for the ONNX run.
+
+    cd backend
+    python -m benchmarks.onnx_benchmark --runs 10 --output onnx_benchmark.json
+"""
+
+import json
+import time
+import argparse
+import resource
+import statistics
+import multiprocessing
+from typing import Dict, Any
+
+from src.config.app_config import Config
+
+PROMPTS = [
+    "Extract receipt information from: TESCO Stores Camden Milk 1.45 Bread 0.95 TOTAL 3.50 VISA...\nJSON:",
+    "Extract invoice information from: ACME Supplies INV-2025-0042 Widgets x10 Total Due 135.00 GBP...\nJSON:",
+    "Extract contract information from: Service agreement between Contoso Ltd and Fabrikam Inc, 12 months...\nJSON:",
+]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(runtime: str, model_name: str, runs: int, new_tokens: int, queue) -> None:
+    config = Config()
+    started = time.perf_counter()
+
+    if runtime == "onnx":
+        from src.core import onnx_runtime
+
+        generator = onnx_runtime.load_quantized_pipeline(
+            model_name, config.ONNX_MODEL_DIR, config.ONNX_QUANTIZATION
+        )
+    else:
+        from transformers import pipeline
+
+        generator = pipeline("text-generation", model=model_name)
+        if generator.tokenizer.pad_token is None:
+            generator.tokenizer.pad_token = generator.tokenizer.eos_token
+
+    startup = time.perf_counter() - started
+    tokenizer = generator.tokenizer
+
+    # One untimed pass so lazy initialization is not counted as generation
+    generator(PROMPTS[0], max_new_tokens=4, do_sample=False)
+
+    durations, tokens = [], 0
+    for _ in range(runs):
+        for prompt in PROMPTS:
+            begin = time.perf_counter()
+            output = generator(prompt, max_new_tokens=new_tokens, do_sample=False)
+            durations.append(time.perf_counter() - begin)
+            generated = output[0]["generated_text"][len(prompt):]
+            tokens += len(tokenizer.encode(generated))
+
+    queue.put({
+        "runtime": runtime,
+        "startup_seconds": round(startup, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "generations": len(durations),
+        "latency_p50": round(statistics.median(durations), 3),
+        "tokens_per_second": round(tokens / sum(durations), 1) if durations else 0.0,
+    })
+
+
+def run(model_name: str, runs: int, new_tokens: int) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    results: Dict[str, Any] = {"model": model_name, "runtimes": {}}
+
+    for runtime in ("pytorch", "onnx"):
+        queue = context.Queue()
+        process = context.Process(target=_measure, args=(runtime, model_name, runs, new_tokens, queue))
+        process.start()
+        process.join()
+
+        if process.exitcode != 0 or queue.empty():
+            print(f"❌ {runtime} run failed (exit code {process.exitcode})")
+            results["runtimes"][runtime] = {"error": f"exit code {process.exitcode}"}
+            continue
+
+        results["runtimes"][runtime] = queue.get()
+        print(f"{runtime:>8}: {results['runtimes'][runtime]}")
+
+    pytorch, onnx = results["runtimes"].get("pytorch", {}), results["runtimes"].get("onnx", {})
+    if pytorch.get("tokens_per_second") and onnx.get("tokens_per_second"):
+        results["tokens_per_second_speedup"] = round(onnx["tokens_per_second"] / pytorch["tokens_per_second"], 2)
+        results["startup_speedup"] = round(pytorch["startup_seconds"] / max(onnx["startup_seconds"], 0.01), 2)
+        results["rss_ratio"] = round(onnx["peak_rss_mb"] / pytorch["peak_rss_mb"], 2)
+    return results
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(description="PyTorch vs ONNX Runtime int8 benchmark")
+    parser.add_argument("--model", default=config.HF_MODEL)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--new-tokens", type=int, default=64)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.model, args.runs, args.new_tokens)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# backend/benchmarks/prefix_reuse_benchmark.py
+"""
+A/B benchmark for prompt-prefix reuse against a running Ollama
+
+Sends the same documents with the full single prompt (reuse off) and with
+static instructions in the system message (reuse on), and reports latency
+plus Ollama's own prompt-evaluation counters.
+
+    cd backend
+    python -m benchmarks.prefix_reuse_benchmark --rounds 5 --output prefix_reuse.json
+"""
+
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Dict, Any, List
+
+import aiohttp
+
+from src.config.app_config import Config
+from src.core.prompt_loader import PromptLoader
+
+SAMPLE_DOCUMENTS = {
+    "receipt": (
+        "TESCO Stores Ltd\nStore 2345 Camden High St London\nReceipt No 0098-1123\n"
+        "Milk 2L 1.45\nBread 0.95\nBananas 1.10\nTOTAL GBP 3.50\nVISA CONTACTLESS\n"
+        "12/03/2025 14:02 Served by Amy\nThank you for shopping at Tesco"
+    ),
+    "invoice": (
+        "INVOICE\nACME Supplies Ltd, 1 Industrial Way, Leeds\nInvoice Number: INV-2025-0042\n"
+        "Invoice Date: 2025-02-14\nBill To: Northwind Traders, 22 High St, York\n"
+        "Widgets x10 @ 12.00 = 120.00\nShipping 15.00\nTotal Due: 135.00 GBP\nPayment Terms: Net 30"
+    ),
+    "contract": (
+        "SERVICE AGREEMENT\nThis Agreement is made between Contoso Ltd (\"Provider\") and "
+        "Fabrikam Inc (\"Client\") effective 1 January 2025.\nTerm: 12 months.\n"
+        "Fees: 2,000 GBP per month payable in advance.\nEither party may terminate with 30 days notice."
+    ),
+}
+
+
+async def _generate(session, base_url: str, model: str, system: str, prompt: str) -> Dict[str, Any]:
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "options": {"temperature": 0.1, "num_predict": 256},
+    }
+    if system:
+        payload["system"] = system
+
+    started = time.perf_counter()
+    async with session.post(f"{base_url}/api/generate", json=payload) as response:
+        response.raise_for_status()
+        data = await response.json()
+    data["wall_seconds"] = time.perf_counter() - started
+    return data
+
+
+def _summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    wall = [s["wall_seconds"] for s in samples]
+    prompt_tokens = [s.get("prompt_eval_count", 0) for s in samples]
+    prompt_eval = [s.get("prompt_eval_duration", 0) / 1e9 for s in samples]
+    return {
+        "requests": len(samples),
+        "wall_p50": round(statistics.median(wall), 3),
+        "wall_mean": round(statistics.mean(wall), 3),
+        "prompt_eval_tokens_mean": round(statistics.mean(prompt_tokens), 1),
+        "prompt_eval_seconds_mean": round(statistics.mean(prompt_eval), 3),
+    }
+
+
+async def run(base_url: str, model: str, rounds: int) -> Dict[str, Any]:
+    loader = PromptLoader("prompts.yaml")
+    results: Dict[str, Any] = {"model": model, "rounds": rounds, "modes": {}}
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=600)) as session:
+        # Load the model once so neither mode pays the cold start
+        await _generate(session, base_url, model, "", "OK")
+
+        for mode in ("off", "on"):
+            samples = []
+            for _ in range(rounds):
+                for doc_type, text in SAMPLE_DOCUMENTS.items():
+                    if mode == "on":
+                        system, prompt = loader.format_prompt_parts(doc_type, "ollama", text)
+                    else:
+                        system, prompt = "", loader.format_prompt(doc_type, "ollama", text)
+                    samples.append(await _generate(session, base_url, model, system, prompt))
+            results["modes"][mode] = _summarize(samples)
+            print(f"prefix reuse {mode:>3}: {results['modes'][mode]}")
+
+    off, on = results["modes"]["off"], results["modes"]["on"]
+    if off["wall_p50"]:
+        results["wall_p50_speedup"] = round(off["wall_p50"] / on["wall_p50"], 2)
+    return results
+
+
+def main():
+    config = Config()
+    parser = argparse.ArgumentParser(description="Prompt-prefix reuse A/B benchmark")
+    parser.add_argument("--url", default=config.OLLAMA_URL)
+    parser.add_argument("--model", default=config.OLLAMA_MODEL)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.url, args.model, args.rounds))
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
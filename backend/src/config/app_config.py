@@ -12,10 +12,162 @@ class Config:
     # Ollama settings (primary method)
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama2")
     OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+    # Pool of equivalent Ollama instances (comma-separated); requests go to the least loaded
+    OLLAMA_URLS = os.getenv("OLLAMA_URLS", OLLAMA_URL)
+    # Hedging: after the p95 latency, send a duplicate to a second instance and cancel the loser
+    OLLAMA_HEDGE = os.getenv("OLLAMA_HEDGE", "false").lower() == "true"
+    OLLAMA_HEDGE_QUANTILE = float(os.getenv("OLLAMA_HEDGE_QUANTILE", "0.95"))
+    OLLAMA_HEDGE_MIN_DELAY = float(os.getenv("OLLAMA_HEDGE_MIN_DELAY", "1.0"))
+    # Eject an instance for POOL_EJECT_SECONDS after POOL_EJECT_FAILURES consecutive failures
+    POOL_EJECT_FAILURES = int(os.getenv("POOL_EJECT_FAILURES", "3"))
+    POOL_EJECT_SECONDS = float(os.getenv("POOL_EJECT_SECONDS", "30"))
+    # Stream tokens and stop as soon as the JSON object closes
+    OLLAMA_STREAM = os.getenv("OLLAMA_STREAM", "true").lower() == "true"
+    # Model context limit; long documents are chunked to fit it
+    OLLAMA_MAX_CTX = int(os.getenv("OLLAMA_MAX_CTX", "4096"))
+    OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", "1024"))
+    # Output cut off at num_predict is continued from Ollama's returned context, up to this many times
+    OLLAMA_MAX_CONTINUATIONS = int(os.getenv("OLLAMA_MAX_CONTINUATIONS", "2"))
+    CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "64"))
+    CHUNK_PARALLELISM = int(os.getenv("CHUNK_PARALLELISM", "4"))
+    # Send static prompt instructions as the system message so Ollama reuses the evaluated prefix
+    OLLAMA_PREFIX_REUSE = os.getenv("OLLAMA_PREFIX_REUSE", "true").lower() == "true"
+    # Constrain LLM output to the per-document-type JSON schemas in prompts.yaml
+    STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", "true").lower() == "true"
+    # OpenAI JSON mode: "auto" enables it for models that support response_format
+    OPENAI_JSON_MODE = os.getenv("OPENAI_JSON_MODE", "auto").lower()
+    # Model residency: warm-up at startup, keep_alive on every request, LRU across models
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() == "true"
+    OLLAMA_WARMUP_TIMEOUT = float(os.getenv("OLLAMA_WARMUP_TIMEOUT", "120"))
+    OLLAMA_KEEPER_INTERVAL = float(os.getenv("OLLAMA_KEEPER_INTERVAL", "240"))
+    OLLAMA_MAX_RESIDENT_MODELS = int(os.getenv("OLLAMA_MAX_RESIDENT_MODELS", "2"))
+    COLD_START_THRESHOLD = float(os.getenv("COLD_START_THRESHOLD", "1.0"))
     
     # Hugging Face settings (secondary method)
     HF_MODEL = os.getenv("HF_MODEL", "microsoft/DialoGPT-small")
+    # Micro-batching: wait up to HF_BATCH_MAX_WAIT_MS for up to HF_BATCH_MAX_SIZE prompts (1 disables)
+    HF_BATCH_MAX_SIZE = int(os.getenv("HF_BATCH_MAX_SIZE", "8"))
+    HF_BATCH_MAX_WAIT_MS = float(os.getenv("HF_BATCH_MAX_WAIT_MS", "20"))
+    # Int8-quantized ONNX Runtime copy of HF_MODEL (add "onnx" to FAILOVER_CHAIN to use it)
+    ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "models/onnx")
+    ONNX_QUANTIZATION = os.getenv("ONNX_QUANTIZATION", "avx2")  # avx2 | avx512 | avx512_vnni | arm64
+
+    # OpenAI-compatible local server (llama.cpp server, vLLM, LM Studio) - "openai_compatible" backend
+    OPENAI_COMPATIBLE_URL = os.getenv("OPENAI_COMPATIBLE_URL", "http://localhost:8080/v1")
+    OPENAI_COMPATIBLE_MODEL = os.getenv("OPENAI_COMPATIBLE_MODEL", "local-model")
+    OPENAI_COMPATIBLE_API_KEY = os.getenv("OPENAI_COMPATIBLE_API_KEY", "")
+    OPENAI_COMPATIBLE_SCHEMA_MODE = os.getenv("OPENAI_COMPATIBLE_SCHEMA_MODE", "json_schema")  # json_schema | json_object | none
     
+    # Shared HTTP client pool (keep-alive connections to the LLM backends)
+    HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "32"))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+
+    # Extraction result cache (memory LRU + SQLite disk tier)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "1024"))
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "cache/extractions.sqlite3")
+    CACHE_MAX_DISK_MB = int(os.getenv("CACHE_MAX_DISK_MB", "256"))
+
+    # Near-duplicate reuse: OCR text at least NEAR_DUP_MIN_SIMILARITY (MinHash Jaccard) alike a
+    # recent confident result, with the same amounts, returns that result (stored in the extraction cache)
+    NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+    NEAR_DUP_MIN_SIMILARITY = float(os.getenv("NEAR_DUP_MIN_SIMILARITY", "0.8"))
+    NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "2000000"))
+    NEAR_DUP_MIN_CHARS = int(os.getenv("NEAR_DUP_MIN_CHARS", "80"))
+    NEAR_DUP_SNAPSHOT_PATH = os.getenv("NEAR_DUP_SNAPSHOT_PATH", "cache/near_duplicates.npz")
+    NEAR_DUP_SNAPSHOT_EVERY = int(os.getenv("NEAR_DUP_SNAPSHOT_EVERY", "500"))
+
+    # Admission control in front of the LLM backends
+    EXTRACTION_CONCURRENCY = os.getenv("EXTRACTION_CONCURRENCY", "ollama=4,huggingface=8,onnx=8,openai=8,openai_compatible=4")
+    EXTRACTION_DEFAULT_CONCURRENCY = int(os.getenv("EXTRACTION_DEFAULT_CONCURRENCY", "2"))
+    EXTRACTION_QUEUE_SIZE = int(os.getenv("EXTRACTION_QUEUE_SIZE", "64"))
+    EXTRACTION_QUEUE_TIMEOUT = float(os.getenv("EXTRACTION_QUEUE_TIMEOUT", "30"))
+
+    # Adaptive timeouts (p99 × factor per model/doc type) and retry budget
+    ADAPTIVE_TIMEOUT_FACTOR = float(os.getenv("ADAPTIVE_TIMEOUT_FACTOR", "1.5"))
+    ADAPTIVE_TIMEOUT_MIN = float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "10"))
+    ADAPTIVE_TIMEOUT_MAX = float(os.getenv("ADAPTIVE_TIMEOUT_MAX", "120"))
+    ADAPTIVE_TIMEOUT_DEFAULT = float(os.getenv("ADAPTIVE_TIMEOUT_DEFAULT", "90"))
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv("ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20"))
+    EXTRACTION_DEADLINE = float(os.getenv("EXTRACTION_DEADLINE", "150"))
+    EXTRACTION_MAX_ATTEMPTS = int(os.getenv("EXTRACTION_MAX_ATTEMPTS", "3"))
+    RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))
+    RETRY_BUDGET_MAX_TOKENS = float(os.getenv("RETRY_BUDGET_MAX_TOKENS", "10"))
+    RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", "0.5"))
+    RETRY_BACKOFF_MAX = float(os.getenv("RETRY_BACKOFF_MAX", "5"))
+
+    # Runtime failover chain and per-backend circuit breakers
+    # Backends can also be declared by name in BACKENDS_FILE (see backends.example.yaml)
+    BACKENDS_FILE = os.getenv("BACKENDS_FILE", "backends.yaml")
+    FAILOVER_CHAIN = os.getenv("FAILOVER_CHAIN", "ollama,huggingface,openai")
+    CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))
+    CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+    CIRCUIT_WINDOW_SECONDS = float(os.getenv("CIRCUIT_WINDOW_SECONDS", "60"))
+    CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+    CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "120"))
+    CIRCUIT_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_HALF_OPEN_CALLS", "1"))
+    HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+
+    # Record/replay of backend responses: LLM_RECORD_MODE=record captures every extraction
+    # call to LLM_RECORD_PATH; replay serves them at recorded timing divided by LLM_REPLAY_SPEED
+    # (0 = instant); calls missing from the recording fail, or go live with LLM_REPLAY_MISS=passthrough
+    LLM_RECORD_MODE = os.getenv("LLM_RECORD_MODE", "off").lower()
+    LLM_RECORD_PATH = os.getenv("LLM_RECORD_PATH", "cache/llm_recording.jsonl.gz")
+    LLM_REPLAY_SPEED = float(os.getenv("LLM_REPLAY_SPEED", "1.0"))
+    LLM_REPLAY_MISS = os.getenv("LLM_REPLAY_MISS", "error").lower()
+
+    # Rules tier: regex extractors from prompts.yaml answer a document without an LLM
+    # when every required field is found at RULES_MIN_CONFIDENCE or above and the
+    # fields found cover RULES_MIN_COMPLETENESS of the schema (else field recovery fills the rest)
+    RULES_ENGINE = os.getenv("RULES_ENGINE", "true").lower() == "true"
+    RULES_MIN_CONFIDENCE = float(os.getenv("RULES_MIN_CONFIDENCE", "0.85"))
+    RULES_MIN_COMPLETENESS = float(os.getenv("RULES_MIN_COMPLETENESS", "0.8"))
+
+    # Document classifier artifacts (train/promote with python -m src.core.classifier_registry);
+    # workers check the promoted version every CLASSIFIER_RELOAD_INTERVAL seconds
+    CLASSIFIER_REGISTRY_DIR = os.getenv("CLASSIFIER_REGISTRY_DIR", "models/classifier")
+    CLASSIFIER_RELOAD_INTERVAL = float(os.getenv("CLASSIFIER_RELOAD_INTERVAL", "5"))
+    # Online classifier trained from reviewed labels (corrections and confirmations). An
+    # ONLINE_CLASSIFIER_HOLDOUT share is held out; the online model classifies once it has
+    # ONLINE_CLASSIFIER_MIN_FEEDBACK held-out labels, reaches ONLINE_CLASSIFIER_MIN_ACCURACY
+    # on them and beats the registry model there by ONLINE_CLASSIFIER_MARGIN
+    ONLINE_CLASSIFIER = os.getenv("ONLINE_CLASSIFIER", "true").lower() == "true"
+    ONLINE_CLASSIFIER_MIN_FEEDBACK = int(os.getenv("ONLINE_CLASSIFIER_MIN_FEEDBACK", "50"))
+    ONLINE_CLASSIFIER_HOLDOUT = float(os.getenv("ONLINE_CLASSIFIER_HOLDOUT", "0.2"))
+    ONLINE_CLASSIFIER_MARGIN = float(os.getenv("ONLINE_CLASSIFIER_MARGIN", "0.05"))
+    ONLINE_CLASSIFIER_MIN_ACCURACY = float(os.getenv("ONLINE_CLASSIFIER_MIN_ACCURACY", "0.8"))
+    ONLINE_CLASSIFIER_BATCH_SIZE = int(os.getenv("ONLINE_CLASSIFIER_BATCH_SIZE", "32"))
+    ONLINE_CLASSIFIER_QUEUE_SIZE = int(os.getenv("ONLINE_CLASSIFIER_QUEUE_SIZE", "10000"))
+    ONLINE_CLASSIFIER_CHECKPOINT_EVERY = int(os.getenv("ONLINE_CLASSIFIER_CHECKPOINT_EVERY", "100"))
+
+    # Vendor templates: layouts learned from VENDOR_TEMPLATE_MIN_CONFIRMATIONS agreeing LLM results;
+    # VENDOR_TEMPLATE_VALIDATION_SAMPLE of template answers are checked against the LLM and a template
+    # is retired when its pass rate over the last VENDOR_TEMPLATE_WINDOW checks drops below the minimum
+    VENDOR_TEMPLATES = os.getenv("VENDOR_TEMPLATES", "true").lower() == "true"
+    VENDOR_TEMPLATES_PATH = os.getenv("VENDOR_TEMPLATES_PATH", "cache/vendor_templates.json")
+    VENDOR_TEMPLATE_MIN_CONFIRMATIONS = int(os.getenv("VENDOR_TEMPLATE_MIN_CONFIRMATIONS", "3"))
+    VENDOR_TEMPLATE_VALIDATION_SAMPLE = float(os.getenv("VENDOR_TEMPLATE_VALIDATION_SAMPLE", "0.1"))
+    VENDOR_TEMPLATE_MIN_AGREEMENT = float(os.getenv("VENDOR_TEMPLATE_MIN_AGREEMENT", "0.9"))
+    VENDOR_TEMPLATE_MIN_CHECKS = int(os.getenv("VENDOR_TEMPLATE_MIN_CHECKS", "5"))
+    VENDOR_TEMPLATE_WINDOW = int(os.getenv("VENDOR_TEMPLATE_WINDOW", "50"))
+
+    # Model cascade: backends from small to large, e.g. "ollama:tinyllama,ollama" (empty disables)
+    CASCADE_TIERS = os.getenv("CASCADE_TIERS", "")
+    CASCADE_THRESHOLD = float(os.getenv("CASCADE_THRESHOLD", os.getenv("CONFIDENCE_THRESHOLD", "0.6")))
+    # Documents that skip the smallest tier: these types, long texts, or uncertain classification
+    CASCADE_SKIP_DOC_TYPES = os.getenv("CASCADE_SKIP_DOC_TYPES", "contract")
+    CASCADE_MAX_SMALL_CHARS = int(os.getenv("CASCADE_MAX_SMALL_CHARS", "4000"))
+    CASCADE_MIN_ML_CONFIDENCE = float(os.getenv("CASCADE_MIN_ML_CONFIDENCE", "0.2"))
+
+    # Field recovery: re-extract up to FIELD_RECOVERY_MAX_FIELDS empty/invalid fields
+    # from a FIELD_RECOVERY_WINDOW_CHARS window of text around their keywords
+    FIELD_RECOVERY = os.getenv("FIELD_RECOVERY", "true").lower() == "true"
+    FIELD_RECOVERY_MAX_FIELDS = int(os.getenv("FIELD_RECOVERY_MAX_FIELDS", "3"))
+    FIELD_RECOVERY_WINDOW_CHARS = int(os.getenv("FIELD_RECOVERY_WINDOW_CHARS", "1500"))
+
     # General settings
     CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.6"))
     
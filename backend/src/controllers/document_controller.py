@@ -4,13 +4,14 @@ Document controller - Handles HTTP request/response logic
 """
 
 import json
-from typing import List
+from typing import List, Optional
 from fastapi import UploadFile, Request, HTTPException, Form
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from ..services.document_service import DocumentService
 from ..models.document_model import ProcessingResult, BatchProcessingResult
+from ..exceptions.document_exceptions import ExtractionQueueFullError
 
 
 class DocumentController:
@@ -59,6 +60,12 @@ class DocumentController:
             result = await document_service.quick_scan(file_content, file.filename)
             return result
             
+        except ExtractionQueueFullError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -79,6 +86,12 @@ class DocumentController:
                 "access_url": result["access_url"]
             }
             
+        except ExtractionQueueFullError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -97,6 +110,12 @@ class DocumentController:
             result = await document_service.batch_quick_scan(files_data)
             return result
             
+        except ExtractionQueueFullError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -115,6 +134,12 @@ class DocumentController:
             result = await document_service.batch_document_workflow(files_data)
             return result
             
+        except ExtractionQueueFullError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
@@ -175,10 +200,51 @@ class DocumentController:
                 "status": "healthy" if is_healthy else "unhealthy",
                 "processor_ready": is_healthy,
                 "available_methods": document_service.processor.get_supported_document_types() if is_healthy else [],
-                "available_model": document_service.processor.get_model_display_name() if is_healthy else []
+                "available_model": document_service.processor.get_model_display_name() if is_healthy else [],
+                "active_backend": document_service.processor.extraction_method if is_healthy else None,
+                "backends": document_service.processor.get_backend_health() if is_healthy else {}
             }
         except Exception as e:
             return {
                 "status": "unhealthy",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    async def metrics_api(self, document_service: DocumentService) -> dict:
+        """API endpoint for processor runtime metrics"""
+        try:
+            return document_service.processor.get_metrics()
+            
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def classifier_api(self, document_service: DocumentService) -> dict:
+        """API endpoint for classifier versions"""
+        try:
+            return document_service.processor.classifier.stats()
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def promote_classifier_api(self, version: Optional[str], document_service: DocumentService) -> dict:
+        """API endpoint to promote a classifier version"""
+        if not version:
+            raise HTTPException(status_code=400, detail="version is required")
+        if version not in document_service.processor.classifier.registry.versions():
+            raise HTTPException(status_code=404, detail=f"Unknown classifier version: {version}")
+        try:
+            return document_service.processor.classifier.promote(version)
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def classifier_feedback_api(
+        self, text: Optional[str], label: Optional[str], document_service: DocumentService
+    ) -> dict:
+        """API endpoint for document type corrections"""
+        if not text or not label:
+            raise HTTPException(status_code=400, detail="text and label are required")
+        result = document_service.processor.classifier.feedback(text, label)
+        if "error" in result:
+            raise HTTPException(status_code=503 if result.get("retryable") else 400, detail=result["error"])
+        return result
\ No newline at end of file
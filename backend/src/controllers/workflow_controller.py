@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse, Response
 
 from ..services.workflow_service import WorkflowService
 from ..models.workflow_model import WorkflowType, ExportFormat, WorkflowStatus
+from ..exceptions.document_exceptions import ExtractionQueueFullError
 
 
 class WorkflowController:
@@ -38,6 +39,12 @@ class WorkflowController:
             
             return result
             
+        except ExtractionQueueFullError as e:
+            raise HTTPException(
+                status_code=429,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
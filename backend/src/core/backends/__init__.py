@@ -0,0 +1,30 @@
+# backend/src/core/backends/__init__.py
+"""
+Extraction backends package
+"""
+
+from .base import ExtractionBackend, BackendCapabilities, BackendContext, parse_json_response
+from .registry import BackendRegistry, BACKEND_TYPES, register_backend_type
+from .ollama_backend import OllamaBackend
+from .huggingface_backend import HuggingFaceBackend
+from .onnx_backend import OnnxBackend
+from .openai_backend import OpenAIBackend
+from .openai_compatible_backend import OpenAICompatibleBackend
+from .record_replay import RecordReplayBackend, ResponseLog
+
+__all__ = [
+    "ExtractionBackend",
+    "BackendCapabilities",
+    "BackendContext",
+    "BackendRegistry",
+    "BACKEND_TYPES",
+    "register_backend_type",
+    "parse_json_response",
+    "OllamaBackend",
+    "HuggingFaceBackend",
+    "OnnxBackend",
+    "OpenAIBackend",
+    "OpenAICompatibleBackend",
+    "RecordReplayBackend",
+    "ResponseLog",
+]
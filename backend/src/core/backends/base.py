@@ -0,0 +1,209 @@
+# backend/src/core/backends/base.py
+"""
+Extraction backend interface - one implementation per LLM runtime
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+from pydantic import BaseModel
+
+from src.config.app_config import Config
+from src.core.prompt_loader import PromptLoader
+from src.core.http_client import AsyncHTTPClient
+from src.core.structured_output import SchemaValidator
+from src.core.latency import LatencyTracker, AdaptiveTimeoutPolicy, RetryBudget
+
+
+class BackendCapabilities(BaseModel):
+    """What a backend supports - used for routing and feature toggles"""
+    streaming: bool = False
+    batching: bool = False
+    schema_mode: bool = False
+    field_extraction: bool = False
+
+
+class BackendContext:
+    """Shared services every backend may use"""
+
+    def __init__(
+        self,
+        http_client: AsyncHTTPClient,
+        prompt_loader: PromptLoader,
+        schema_validator: SchemaValidator,
+        latency_tracker: LatencyTracker,
+        timeout_policy: AdaptiveTimeoutPolicy,
+        retry_budget: RetryBudget,
+    ):
+        self.config = Config()
+        self.http_client = http_client
+        self.prompt_loader = prompt_loader
+        self.schema_validator = schema_validator
+        self.latency_tracker = latency_tracker
+        self.timeout_policy = timeout_policy
+        self.retry_budget = retry_budget
+
+
+def parse_json_response(response: str) -> Dict[str, Any]:
+    """Parse JSON from AI response"""
+    try:
+        # Handle code block wrapper
+        if "```json" in response:
+            start_marker = response.find("```json") + 7
+            end_marker = response.find("```", start_marker)
+            if end_marker != -1:
+                response = response[start_marker:end_marker].strip()
+                print(f"🔍 Extracted from code block: {len(response)} chars")
+
+        # Find JSON in response
+        start = response.find("{")
+        end = response.rfind("}") + 1
+
+        if start != -1 and end != 0:
+            json_str = response[start:end]
+            parsed = json.loads(json_str)
+            return parsed
+        else:
+            print("❌ No JSON boundaries found")
+            return {"raw_response": response}
+
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON decode error: {e}")
+        return {"raw_response": response}
+
+
+class ExtractionBackend(ABC):
+    """
+    Base class for extraction backends
+
+    A backend is created from a name, a type (`kind`) and free-form options
+    (from backends.yaml or the environment), so several instances of the
+    same type - e.g. two OpenAI-compatible servers - can live side by side.
+    """
+
+    kind = "base"
+    icon = "🤖"
+
+    # Which prompts.yaml entry the backend formats its prompts from
+    prompt_method = "ollama"
+
+    # Remote servers stay in the failover chain when down at startup (circuit
+    # tripped) so health probes can bring them back; in-process models do not
+    remote_server = False
+
+    def __init__(self, name: str, context: BackendContext, options: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.context = context
+        self.config = context.config
+        self.prompt_loader = context.prompt_loader
+        self.options = options or {}
+
+    @property
+    def label(self) -> str:
+        return f"{self.icon} {self.name}"
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Raw model identifier (part of the cache key)"""
+
+    @property
+    def display_name(self) -> str:
+        """Human readable model name for the UI"""
+        return self.model_name
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities()
+
+    def setup(self) -> bool:
+        """Load the model or check the server at startup; False if unavailable"""
+        return True
+
+    @abstractmethod
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        """Extract fields from document text ({"error": ...} on failure)"""
+
+    async def extract_fields(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        """
+        Extract only the given fields from a window of document text (targeted
+        re-extraction); backends that cannot run free-form prompts return an error
+        """
+        return {"error": f"{self.name} does not support field re-extraction"}
+
+    @abstractmethod
+    async def health(self) -> bool:
+        """Cheap liveness check used by the background health probes"""
+
+    async def warmup(self) -> bool:
+        """Prepare the model before real traffic arrives"""
+        return True
+
+    async def start(self) -> None:
+        """Start background work owned by the backend"""
+
+    async def aclose(self) -> None:
+        """Release resources held by the backend"""
+
+    def output_schema(self, doc_type: str) -> Optional[Dict[str, Any]]:
+        """JSON schema the output is constrained to (None when structured output is off)"""
+        if not self.config.STRUCTURED_OUTPUT:
+            return None
+        return self.prompt_loader.get_schema(doc_type)
+
+    def field_schema(self, doc_type: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Output schema narrowed to a subset of fields (none required, so absent fields can be left out)"""
+        schema = self.output_schema(doc_type)
+        if not schema:
+            return None
+        properties = schema.get("properties", {})
+        return {
+            "type": "object",
+            "properties": {field: properties[field] for field in fields if field in properties},
+        }
+
+    def chunk_schema(self, doc_type: str) -> Optional[Dict[str, Any]]:
+        """Output schema for one chunk of a long document (every field nullable, none required,
+        so a chunk without a field returns null instead of inventing a value)"""
+        schema = self.output_schema(doc_type)
+        if not schema:
+            return None
+        return {
+            "type": "object",
+            "properties": {
+                field: {"anyOf": [spec, {"type": "null"}]}
+                for field, spec in schema.get("properties", {}).items()
+            },
+        }
+
+    def parse_output(self, response: str, doc_type: str, partial: bool = False) -> Dict[str, Any]:
+        """
+        Validate output against the document type's schema in one pass,
+        falling back to scraping JSON out of free text
+
+        partial=True validates a chunk result: no field is required.
+        """
+        schema = self.output_schema(doc_type)
+        if not schema:
+            return parse_json_response(response)
+
+        key = doc_type
+        if partial:
+            schema, key = {**schema, "required": []}, f"{doc_type}:chunk"
+
+        validator = self.context.schema_validator
+        validated = validator.validate_json(key, schema, response)
+        if validated is not None:
+            return validated
+
+        parsed = parse_json_response(response)
+        if "raw_response" in parsed:
+            return parsed
+        return validator.validate_python(key, schema, parsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "model": self.model_name,
+            "capabilities": self.capabilities().model_dump(),
+        }
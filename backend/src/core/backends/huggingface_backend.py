@@ -0,0 +1,121 @@
+# backend/src/core/backends/huggingface_backend.py
+"""
+Hugging Face transformers extraction backend (in-process, CPU friendly micro-batching)
+"""
+
+import asyncio
+from typing import Dict, Any, Optional
+
+from src.core.backends.base import ExtractionBackend, BackendCapabilities
+from src.core.micro_batcher import MicroBatcher
+
+
+class HuggingFaceBackend(ExtractionBackend):
+    """Text-generation pipeline run in-process (options: model, batch_max_size, batch_max_wait_ms)"""
+
+    kind = "huggingface"
+    icon = "🤗"
+    prompt_method = "huggingface"
+
+    DISPLAY_NAMES = {
+        "DialoGPT-small": "DialoGPT Small",
+        "DialoGPT-medium": "DialoGPT Medium",
+        "distilbert-base-uncased": "DistilBERT",
+    }
+
+    def __init__(self, name, context, options=None):
+        super().__init__(name, context, options)
+        self.model = self.options.get("model", self.config.HF_MODEL)
+        self.batch_max_size = int(self.options.get("batch_max_size", self.config.HF_BATCH_MAX_SIZE))
+        self.batch_max_wait_ms = float(self.options.get("batch_max_wait_ms", self.config.HF_BATCH_MAX_WAIT_MS))
+
+        self.generator = None
+        # Concurrent prompts are run as one padded batch
+        self.batcher: Optional[MicroBatcher] = None
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    @property
+    def display_name(self) -> str:
+        model_name = self.model.split("/")[-1]
+        return self.DISPLAY_NAMES.get(model_name, model_name)
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(streaming=False, batching=self.batcher is not None, schema_mode=False)
+
+    def setup(self) -> bool:
+        try:
+            self.generator = self._load_pipeline()
+
+            # Decoder-only models must be left-padded for batched generation
+            tokenizer = self.generator.tokenizer
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            tokenizer.padding_side = "left"
+
+            if self.batch_max_size > 1:
+                self.batcher = MicroBatcher(
+                    self._generate_batch,
+                    self.batch_max_size,
+                    self.batch_max_wait_ms,
+                    name=self.name,
+                )
+            return True
+        except Exception as e:
+            print(f"⚠️ {self.name} backend unavailable: {e}")
+            return False
+
+    def _load_pipeline(self):
+        from transformers import pipeline
+
+        return pipeline(
+            "text-generation",
+            model=self.model,
+            max_length=256,
+            do_sample=True,
+            temperature=0.7,
+            pad_token_id=50256,
+        )
+
+    async def health(self) -> bool:
+        return self.generator is not None
+
+    async def aclose(self) -> None:
+        if self.batcher is not None:
+            self.batcher.close()
+
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        """Extract using Hugging Face with centralized prompts (blocking work runs off the event loop)"""
+
+        # Get formatted prompt from prompt loader
+        prompt = self.prompt_loader.format_prompt(doc_type, self.prompt_method, text)
+
+        try:
+            if self.batcher is not None:
+                # Shares a generation batch with concurrent requests
+                response = await self.batcher.submit(prompt)
+            else:
+                response = (await asyncio.to_thread(self._generate_batch, [prompt]))[0]
+            return self.parse_output(response, doc_type)
+
+        except Exception as e:
+            return {"error": str(e), "raw_response": ""}
+
+    def _generate_batch(self, prompts: list) -> list:
+        """Run several prompts through the pipeline as one padded batch"""
+        results = self.generator(
+            prompts,
+            max_length=200,
+            num_return_sequences=1,
+            truncation=True,
+            batch_size=len(prompts),
+        )
+        return [result[0]["generated_text"] for result in results]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "batching": self.batcher.stats() if self.batcher else None,
+        }
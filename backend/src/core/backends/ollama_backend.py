@@ -0,0 +1,479 @@
+# backend/src/core/backends/ollama_backend.py
+"""
+Ollama extraction backend - pooled async HTTP, streaming, chunking, model residency
+and load balancing across a pool of Ollama instances
+"""
+
+import json
+import time
+import asyncio
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+import aiohttp
+import requests
+
+from src.core.backends.base import ExtractionBackend, BackendCapabilities, parse_json_response
+from src.core.json_stream import IncrementalJSONParser
+from src.core.chunking import TokenBudgetSplitter, estimate_tokens, size_context, merge_partial_results
+from src.core.model_residency import shared_residency
+from src.core.instance_pool import InstancePool, ServerInstance
+from src.core.latency import jittered_backoff
+
+
+class OllamaBackend(ExtractionBackend):
+    """
+    Local models served by Ollama (options: url or urls, model, stream, hedge)
+
+    With several urls each request goes to the instance with the fewest
+    outstanding requests; with hedging on, a request still running after the
+    p95 latency is duplicated on a second instance and the slower one cancelled.
+    """
+
+    kind = "ollama"
+    icon = "🦙"
+    prompt_method = "ollama"
+    remote_server = True
+
+    DISPLAY_NAMES = {
+        "tinyllama": "Tiny Llama",
+        "llama2": "Llama 2",
+        "mistral": "Mistral",
+        "codellama": "Code Llama",
+        "llama3": "Llama 3",
+    }
+
+    def __init__(self, name, context, options=None):
+        super().__init__(name, context, options)
+        urls = self.options.get("urls") or self.options.get("url") or self.config.OLLAMA_URLS
+        if isinstance(urls, str):
+            urls = [u.strip() for u in urls.split(",") if u.strip()]
+        self.model = self.options.get("model", self.config.OLLAMA_MODEL)
+        self.stream = self.options.get("stream", self.config.OLLAMA_STREAM)
+        self.hedge = self.options.get("hedge", self.config.OLLAMA_HEDGE)
+        self.http_client = context.http_client
+
+        self.pool = InstancePool(urls, self.http_client)
+        self.url = self.pool.instances[0].url
+
+        # Keep the models we use loaded on every instance (warm-up, keep_alive, LRU residency);
+        # backends on the same server share its manager, so the LRU spans all their models
+        self.residency = {
+            instance.url: shared_residency(self.http_client, instance.url)
+            for instance in self.pool.instances
+        }
+
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+        # Truncated output is continued rather than regenerated; what retries still cost is tracked
+        self.continuations = 0
+        self.truncated = 0
+        self.retried_attempts = 0
+        self.wasted_tokens = 0
+        self.reused_prompt_tokens = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    @property
+    def display_name(self) -> str:
+        return self.DISPLAY_NAMES.get(self.model, self.model.title())
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(streaming=self.stream, batching=False, schema_mode=True, field_extraction=True)
+
+    def setup(self) -> bool:
+        """Test the connection to every instance"""
+        for instance in self.pool.instances:
+            try:
+                response = requests.get(f"{instance.url}/api/tags", timeout=5)
+                instance.healthy = response.status_code == 200
+            except:
+                instance.healthy = False
+            if not instance.healthy and len(self.pool.instances) > 1:
+                print(f"⚠️ Ollama instance {instance.url} is not reachable")
+        return self.pool.available_count() > 0
+
+    async def warmup(self) -> bool:
+        if not self.config.OLLAMA_WARMUP:
+            return True
+        results = await asyncio.gather(*[
+            self.residency[instance.url].warmup(self.model)
+            for instance in self.pool.instances if instance.available()
+        ])
+        return any(results)
+
+    async def start(self) -> None:
+        for residency in self.residency.values():
+            await residency.start()
+
+    async def aclose(self) -> None:
+        for residency in self.residency.values():
+            await residency.stop()
+
+    async def health(self) -> bool:
+        """Probe every instance (ejecting or reinstating them); healthy while any is available"""
+        return await self.pool.check_all()
+
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        """Extract using Ollama, splitting long documents into chunks that fit the
+        model context and merging the partial results (map-reduce)"""
+
+        prompt_overhead = estimate_tokens(self.prompt_loader.format_prompt(doc_type, self.prompt_method, ""))
+        chunk_budget = self.config.OLLAMA_MAX_CTX - self.config.OLLAMA_NUM_PREDICT - prompt_overhead
+        splitter = TokenBudgetSplitter(chunk_budget, self.config.CHUNK_OVERLAP_TOKENS)
+        chunks = splitter.split(text)
+
+        if len(chunks) == 1:
+            return await self._extract_chunk(text, doc_type)
+
+        print(f"✂️ Long document split into {len(chunks)} chunks (~{chunk_budget} tokens each)")
+
+        # Bound the fan-out so one long document cannot flood the backend
+        semaphore = asyncio.Semaphore(self.config.CHUNK_PARALLELISM)
+
+        async def extract_chunk(chunk: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._extract_chunk(chunk, doc_type, partial=True)
+
+        partials = await asyncio.gather(*[extract_chunk(chunk) for chunk in chunks])
+        usable = [p for p in partials if "error" not in p and "raw_response" not in p]
+
+        if not usable:
+            return partials[0]
+
+        print(f"🧩 Merged {len(usable)}/{len(chunks)} chunk results")
+        return merge_partial_results(usable, self.prompt_loader.get_merge_rules(doc_type))
+
+    async def _extract_chunk(self, text: str, doc_type: str, partial: bool = False) -> Dict[str, Any]:
+        """
+        Extract one chunk using Ollama with centralized prompts (non-blocking, pooled connection)
+
+        partial=True marks one chunk of a long document: fields it does not
+        contain come back null and are filled from other chunks by the merge.
+        """
+
+        # Static instructions go in the system message so Ollama reuses their evaluated
+        # prefix across documents; only the document text is evaluated per request
+        if self.config.OLLAMA_PREFIX_REUSE:
+            system_prompt, prompt = self.prompt_loader.format_prompt_parts(doc_type, self.prompt_method, text)
+        else:
+            system_prompt, prompt = "", self.prompt_loader.format_prompt(doc_type, self.prompt_method, text)
+
+        # Constrained decoding: Ollama only samples tokens that fit the document type's schema
+        schema = self.chunk_schema(doc_type) if partial else self.output_schema(doc_type)
+        return await self._run_prompt(
+            system_prompt, prompt, schema, doc_type,
+            lambda response: self.parse_output(response, doc_type, partial),
+        )
+
+    async def extract_fields(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        """Ask for only the given fields (short prompt, short output)"""
+        system_prompt, prompt = self.prompt_loader.format_field_prompt_parts(doc_type, fields, text)
+        return await self._run_prompt(
+            system_prompt, prompt, self.field_schema(doc_type, fields), f"{doc_type}:fields",
+            parse_json_response,
+        )
+
+    async def _run_prompt(
+        self,
+        system_prompt: str,
+        prompt: str,
+        schema: Optional[Dict[str, Any]],
+        latency_key: str,
+        parse: Callable[[str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Generate with retries, adaptive timeouts and continuation of truncated output
+
+        Args:
+            latency_key: latency histogram (and timeout basis) this kind of request is tracked under
+            parse: turns the generated text into the result dict
+        """
+        # Size the context window to this prompt instead of a fixed 4096
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(prompt)
+        num_ctx = size_context(
+            prompt_tokens,
+            self.config.OLLAMA_NUM_PREDICT,
+            self.config.OLLAMA_MAX_CTX,
+        )
+        for residency in self.residency.values():
+            residency.touch(self.model)
+
+        latency_tracker = self.context.latency_tracker
+        timeout_policy = self.context.timeout_policy
+        retry_budget = self.context.retry_budget
+
+        # Adaptive timeouts from live latency, bounded by a per-request deadline
+        max_attempts = self.config.EXTRACTION_MAX_ATTEMPTS
+        deadline = time.monotonic() + self.config.EXTRACTION_DEADLINE
+        retry_budget.record_request()
+        last_result: Dict[str, Any] = {"error": "Ollama request deadline exceeded", "raw_response": ""}
+
+        payload = {
+            "model": self.model,
+            **({"system": system_prompt} if system_prompt else {}),
+            "prompt": prompt,
+            "stream": self.stream,
+            **({"format": schema} if schema else {}),
+            "keep_alive": self.config.OLLAMA_KEEP_ALIVE,
+            "options": {
+                "temperature": 0.1,
+                "top_p": 0.9,
+                "num_predict": self.config.OLLAMA_NUM_PREDICT,  # Max tokens to generate
+                "num_ctx": num_ctx,         # Context window sized to the prompt
+                "repeat_penalty": 1.1,      # Reduce repetition
+                "stop": ["\n\n\n"]          # Stop sequences
+            },
+        }
+
+        for attempt in range(1, max_attempts + 1):
+            timeout, basis = timeout_policy.timeout_for(
+                self.model, latency_key, deadline - time.monotonic()
+            )
+            if timeout <= 0:
+                break
+
+            attempt_start = time.monotonic()
+            try:
+                print(
+                    f"🦙 Ollama attempt {attempt}/{max_attempts} with {timeout:.1f}s timeout "
+                    f"({timeout_policy.describe(basis)})"
+                )
+
+                status, ollama_response, result = await self._generate(payload, timeout, latency_key)
+
+                if status == 200:
+                    # done_reason "length" means generation hit num_predict - carry on from
+                    # the returned context instead of paying for the prompt again
+                    continuations = 0
+                    while (
+                        result.get("done_reason") == "length"
+                        and result.get("context")
+                        and continuations < self.config.OLLAMA_MAX_CONTINUATIONS
+                    ):
+                        remaining = min(timeout, deadline - time.monotonic())
+                        if remaining <= 0:
+                            break
+                        continuations += 1
+                        self.continuations += 1
+                        self.reused_prompt_tokens += result.get("prompt_eval_count", 0) or 0
+                        print(f"↪️ Output truncated after {len(ollama_response)} chars - continuing ({continuations})")
+
+                        status, ollama_response, result = await self._generate(
+                            self._continuation_payload(payload, result["context"]),
+                            remaining, latency_key, prefix=ollama_response,
+                        )
+                        if status != 200:
+                            break
+
+                    if status != 200:
+                        # A failed continuation keeps the last complete text
+                        result = {}
+                    elif result.get("done_reason") == "length":
+                        self.truncated += 1
+                        print("⚠️ Output still truncated after continuing")
+
+                    latency_tracker.record(self.model, latency_key, time.monotonic() - attempt_start)
+
+                    if ollama_response.strip():
+                        print(f"✅ Ollama success on attempt {attempt}")
+                        return parse(ollama_response)
+
+                    print(f"⚠️ Empty response on attempt {attempt}")
+                    self.wasted_tokens += (result.get("eval_count", 0) or 0)
+                    last_result = {"error": "Ollama returned an empty response", "raw_response": ""}
+                else:
+                    print(f"❌ HTTP {status} on attempt {attempt}")
+                    last_result = {"error": f"Ollama API error: {status}"}
+                    if status < 500 and status != 429:
+                        break  # Client errors will not succeed on retry
+
+            except asyncio.TimeoutError:
+                # A timeout is a censored sample - record it so the histogram adapts upward
+                latency_tracker.record(self.model, latency_key, timeout)
+                timeout_policy.record_timeout(basis)
+                print(f"⏳ Timeout after {timeout:.1f}s on attempt {attempt}")
+                last_result = {
+                    "error": f"Ollama timeout after {timeout:.1f}s ({timeout_policy.describe(basis)})",
+                    "timeout_basis": basis,
+                }
+            except Exception as e:
+                print(f"💥 Error on attempt {attempt}: {e}")
+                last_result = {"error": str(e), "raw_response": ""}
+
+            if attempt == max_attempts:
+                break
+
+            # Retries are limited to a share of traffic so they cannot amplify an overload
+            if not retry_budget.try_acquire():
+                print("🚫 Retry budget exhausted - not retrying")
+                break
+
+            delay = jittered_backoff(attempt, self.config.RETRY_BACKOFF_BASE, self.config.RETRY_BACKOFF_MAX)
+            if time.monotonic() + delay >= deadline:
+                break
+            await asyncio.sleep(delay)
+
+            # A fresh attempt evaluates the whole prompt again
+            self.retried_attempts += 1
+            self.wasted_tokens += prompt_tokens
+
+        return last_result
+
+    async def _generate(self, payload: Dict[str, Any], timeout: float, latency_key: str,
+                        prefix: str = "") -> Tuple[int, str, Dict[str, Any]]:
+        """
+        Run one generation on the least loaded instance, hedged on a second
+        instance when it is still running after the hedge delay
+
+        Returns:
+            (HTTP status, prefix + generated text, final Ollama response)
+        """
+        primary = self.pool.pick()
+        hedge_delay = self._hedge_delay(latency_key, timeout)
+        if hedge_delay is None:
+            return await self._post(primary, payload, timeout, prefix)
+
+        tasks = {asyncio.create_task(self._post(primary, payload, timeout, prefix))}
+        hedge = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                secondary = self.pool.pick(exclude=primary)
+                if secondary is not None:
+                    print(f"🏇 Hedging on {secondary.url} after {hedge_delay:.1f}s on {primary.url}")
+                    self.hedges_sent += 1
+                    hedge = asyncio.create_task(self._post(secondary, payload, timeout - hedge_delay, prefix))
+                    tasks.add(hedge)
+            return await self._first_success(tasks, hedge)
+        finally:
+            # Cancelling the loser drops its connection, which aborts its generation
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _first_success(self, tasks: Set[asyncio.Task], hedge: Optional[asyncio.Task]) -> Tuple[int, str, Dict[str, Any]]:
+        """First 200 response among the racing requests, else the last failure"""
+        pending = set(tasks)
+        last = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and task.result()[0] == 200:
+                    if task is hedge:
+                        self.hedges_won += 1
+                    return task.result()
+                last = task
+        return last.result()
+
+    def _hedge_delay(self, latency_key: str, timeout: float) -> Optional[float]:
+        """Seconds to wait before hedging (None: do not hedge this request)"""
+        if not self.hedge or self.pool.available_count() < 2:
+            return None
+        histogram = self.context.latency_tracker.get(self.model, latency_key)
+        if histogram is None or histogram.total < self.config.ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return None
+        delay = max(histogram.quantile(self.config.OLLAMA_HEDGE_QUANTILE), self.config.OLLAMA_HEDGE_MIN_DELAY)
+        return delay if delay < timeout else None
+
+    def _continuation_payload(self, payload: Dict[str, Any], context: list) -> Dict[str, Any]:
+        """
+        Resume generation from Ollama's returned context: raw mode skips the prompt
+        template, and the schema constraint is dropped because it would restart the object
+        """
+        continuation = {key: value for key, value in payload.items() if key not in ("system", "format")}
+        continuation.update({"prompt": "", "raw": True, "context": context})
+        return continuation
+
+    async def _post(self, instance: ServerInstance, payload: Dict[str, Any], timeout: float,
+                    prefix: str = "") -> Tuple[int, str, Dict[str, Any]]:
+        """POST /api/generate to one instance, tracking its load, latency and failures"""
+        session = self.http_client.get_session()
+        started = time.monotonic()
+
+        async with self.pool.track(instance):
+            try:
+                async with session.post(
+                    f"{instance.url}/api/generate",
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                ) as response:
+                    if response.status != 200:
+                        if response.status >= 500 or response.status == 429:
+                            self.pool.record_failure(instance, f"HTTP {response.status}")
+                        return response.status, "", {}
+
+                    if self.stream:
+                        ollama_response, result = await self._read_stream(response, prefix, started)
+                    else:
+                        result = await response.json()
+                        ollama_response = prefix + result.get("response", "")
+            except asyncio.CancelledError:
+                raise  # Lost a hedge race - not the instance's fault
+            except Exception as e:
+                self.pool.record_failure(instance, str(e) or type(e).__name__)
+                raise
+
+        self.pool.record_success(instance, time.monotonic() - started)
+        self.residency[instance.url].observe(self.model, result)
+        return 200, ollama_response, result
+
+    async def _read_stream(self, response: aiohttp.ClientResponse, prefix: str = "",
+                           started: Optional[float] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Read Ollama's NDJSON token stream, stopping once the top-level JSON object closes
+
+        Args:
+            prefix: text generated before this stream (when continuing truncated output)
+            started: when the request was sent, for time to first token
+
+        Returns:
+            (prefix + generated text, final "done" event - only first_token_seconds
+            if generation was cut short, since load_duration comes with the final event)
+        """
+        parser = IncrementalJSONParser()
+        parser.feed(prefix)
+        started = started if started is not None else time.monotonic()
+        timing: Dict[str, Any] = {}
+
+        async for line in response.content:
+            line = line.strip()
+            if not line:
+                continue
+
+            event = json.loads(line)
+            if not timing and event.get("response"):
+                timing["first_token_seconds"] = time.monotonic() - started
+
+            if parser.feed(event.get("response", "")):
+                # Dropping the connection makes Ollama abort the remaining generation
+                print(f"✂️ JSON object closed after {len(parser.text)} chars - stopping generation")
+                response.close()
+                return parser.json_text, timing
+
+            if event.get("done"):
+                return parser.text, {**event, **timing}
+
+        return parser.text, timing
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            "url": self.url,
+            "instances": self.pool.stats(),
+            "hedging": {
+                "enabled": self.hedge,
+                "sent": self.hedges_sent,
+                "won": self.hedges_won,
+            },
+            "residency": {url: residency.stats() for url, residency in self.residency.items()},
+            "generation": {
+                "continuations": self.continuations,
+                "still_truncated": self.truncated,
+                "retried_attempts": self.retried_attempts,
+                "reused_prompt_tokens": self.reused_prompt_tokens,
+                "wasted_tokens": self.wasted_tokens,
+            },
+        }
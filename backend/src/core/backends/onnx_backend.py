@@ -0,0 +1,43 @@
+# backend/src/core/backends/onnx_backend.py
+"""
+Int8-quantized ONNX Runtime copy of the Hugging Face extraction model
+"""
+
+from src.core.backends.huggingface_backend import HuggingFaceBackend
+from src.core import onnx_runtime
+
+
+class OnnxBackend(HuggingFaceBackend):
+    """Same prompts and batching as Hugging Face, executed by onnxruntime
+    (options: model, model_dir, quantization)"""
+
+    kind = "onnx"
+    icon = "⚙️"
+
+    def __init__(self, name, context, options=None):
+        super().__init__(name, context, options)
+        self.model_dir = self.options.get("model_dir", self.config.ONNX_MODEL_DIR)
+        self.quantization = self.options.get("quantization", self.config.ONNX_QUANTIZATION)
+
+    @property
+    def model_name(self) -> str:
+        return f"{self.model}:onnx-int8"
+
+    @property
+    def display_name(self) -> str:
+        return f"{super().display_name} (ONNX int8)"
+
+    def setup(self) -> bool:
+        if not onnx_runtime.ONNX_AVAILABLE:
+            return False
+        return super().setup()
+
+    def _load_pipeline(self):
+        return onnx_runtime.load_quantized_pipeline(
+            self.model,
+            self.model_dir,
+            self.quantization,
+            max_length=256,
+            do_sample=True,
+            temperature=0.7,
+        )
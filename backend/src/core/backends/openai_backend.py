@@ -0,0 +1,122 @@
+# backend/src/core/backends/openai_backend.py
+"""
+OpenAI extraction backend via LangChain
+"""
+
+import asyncio
+from typing import Dict, Any, List
+
+from src.core.backends.base import ExtractionBackend, BackendCapabilities, parse_json_response
+
+# Keep LangChain as optional fallback
+try:
+    from langchain.llms import OpenAI
+    from langchain.prompts import PromptTemplate
+    from langchain.chains import LLMChain
+
+    LANGCHAIN_AVAILABLE = True
+except ImportError:
+    LANGCHAIN_AVAILABLE = False
+
+# Models that accept response_format (JSON mode)
+JSON_MODE_MODELS = (
+    "gpt-4o", "gpt-4.1", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125"
+)
+
+
+class OpenAIBackend(ExtractionBackend):
+    """Hosted OpenAI models (options: model, api_key)"""
+
+    kind = "openai"
+    icon = "🤖"
+    prompt_method = "openai"
+
+    DISPLAY_NAMES = {
+        "gpt-4": "GPT-4",
+        "gpt-3.5-turbo": "GPT-3.5 Turbo",
+        "gpt-4-turbo": "GPT-4 Turbo",
+    }
+
+    def __init__(self, name, context, options=None):
+        super().__init__(name, context, options)
+        self.model = self.options.get("model", self.config.MODEL_NAME)
+        self.api_key = self.options.get("api_key", self.config.OPENAI_API_KEY)
+        self.llm = None
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    @property
+    def display_name(self) -> str:
+        return self.DISPLAY_NAMES.get(self.model, self.model)
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(
+            streaming=False, batching=False, schema_mode=self.json_mode(), field_extraction=True
+        )
+
+    def json_mode(self) -> bool:
+        """Whether to request OpenAI JSON mode (only newer chat models accept response_format)"""
+        mode = self.config.OPENAI_JSON_MODE
+        if not self.config.STRUCTURED_OUTPUT or mode == "false":
+            return False
+        if mode == "true":
+            return True
+        return self.model.startswith(JSON_MODE_MODELS)
+
+    def setup(self) -> bool:
+        try:
+            if LANGCHAIN_AVAILABLE and self.api_key:
+                # JSON mode guarantees a parseable object; the schema is enforced on validation
+                model_kwargs = {"response_format": {"type": "json_object"}} if self.json_mode() else {}
+                self.llm = OpenAI(
+                    openai_api_key=self.api_key,
+                    model_name=self.model,
+                    temperature=0.0,
+                    model_kwargs=model_kwargs,
+                )
+                return True
+        except:
+            pass
+        return False
+
+    async def health(self) -> bool:
+        return self.llm is not None
+
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        # LangChain is blocking - keep it off the event loop
+        return await asyncio.to_thread(self._extract_sync, text, doc_type)
+
+    def _extract_sync(self, text: str, doc_type: str) -> Dict[str, Any]:
+        """GPT-4 intelligent extraction using LangChain with centralized prompts"""
+
+        # Get prompt template from prompt loader
+        prompt_template_str = self.prompt_loader.get_prompt(doc_type, self.prompt_method)
+
+        # Create LangChain prompt and chain
+        prompt = PromptTemplate(template=prompt_template_str, input_variables=["text"])
+        chain = LLMChain(llm=self.llm, prompt=prompt)
+
+        try:
+            # Run extraction
+            response = chain.run(text=text)
+
+            # Parse JSON from response
+            return self.parse_output(response, doc_type)
+
+        except Exception as e:
+            print(f"⚠️ GPT-4 extraction error: {e}")
+            return {"error": str(e), "raw_response": ""}
+
+    async def extract_fields(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._extract_fields_sync, text, doc_type, fields)
+
+    def _extract_fields_sync(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        system_prompt, prompt = self.prompt_loader.format_field_prompt_parts(doc_type, fields, text)
+        try:
+            response = self.llm.predict(f"{system_prompt}\n\n{prompt}".strip())
+            return parse_json_response(response)
+        except Exception as e:
+            print(f"⚠️ GPT-4 field extraction error: {e}")
+            return {"error": str(e), "raw_response": ""}
@@ -0,0 +1,151 @@
+# backend/src/core/backends/openai_compatible_backend.py
+"""
+Extraction backend for any OpenAI-compatible chat completions server
+(llama.cpp server, vLLM, LM Studio, LocalAI, ...)
+"""
+
+import time
+import asyncio
+from typing import Dict, Any, Callable, List, Optional
+
+import aiohttp
+import requests
+
+from src.core.backends.base import ExtractionBackend, BackendCapabilities, parse_json_response
+
+
+class OpenAICompatibleBackend(ExtractionBackend):
+    """
+    /v1/chat/completions over the pooled HTTP client
+    (options: base_url, model, api_key, schema_mode, max_tokens)
+
+    schema_mode is "json_schema" (constrained decoding, llama.cpp / vLLM),
+    "json_object" (JSON mode only) or "none".
+    """
+
+    kind = "openai_compatible"
+    icon = "🔌"
+    prompt_method = "openai"
+    remote_server = True
+
+    def __init__(self, name, context, options=None):
+        super().__init__(name, context, options)
+        self.base_url = self.options.get("base_url", self.config.OPENAI_COMPATIBLE_URL).rstrip("/")
+        self.model = self.options.get("model", self.config.OPENAI_COMPATIBLE_MODEL)
+        self.api_key = self.options.get("api_key", self.config.OPENAI_COMPATIBLE_API_KEY)
+        self.schema_mode = self.options.get("schema_mode", self.config.OPENAI_COMPATIBLE_SCHEMA_MODE)
+        self.max_tokens = int(self.options.get("max_tokens", self.config.OLLAMA_NUM_PREDICT))
+        self.http_client = context.http_client
+
+    @property
+    def model_name(self) -> str:
+        return self.model
+
+    @property
+    def display_name(self) -> str:
+        return f"{self.model} ({self.name})"
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(
+            streaming=False, batching=False, schema_mode=self.schema_mode != "none", field_extraction=True
+        )
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    def setup(self) -> bool:
+        """Test the connection"""
+        try:
+            response = requests.get(f"{self.base_url}/models", headers=self._headers(), timeout=5)
+            return response.status_code == 200
+        except:
+            return False
+
+    async def health(self) -> bool:
+        session = self.http_client.get_session()
+        async with session.get(
+            f"{self.base_url}/models",
+            headers=self._headers(),
+            timeout=aiohttp.ClientTimeout(total=5),
+        ) as response:
+            return response.status == 200
+
+    def _response_format(self, name: str, schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if self.schema_mode == "json_schema" and schema:
+            return {
+                "response_format": {
+                    "type": "json_schema",
+                    "json_schema": {"name": name, "schema": schema},
+                }
+            }
+        if self.schema_mode in ("json_schema", "json_object") and self.config.STRUCTURED_OUTPUT:
+            return {"response_format": {"type": "json_object"}}
+        return {}
+
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        # Static instructions as the system message so the server's prompt cache reuses them
+        system_prompt, prompt = self.prompt_loader.format_prompt_parts(doc_type, self.prompt_method, text)
+        return await self._chat(
+            system_prompt, prompt,
+            self._response_format(f"{doc_type}_extraction", self.output_schema(doc_type)),
+            doc_type, lambda content: self.parse_output(content, doc_type),
+        )
+
+    async def extract_fields(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        system_prompt, prompt = self.prompt_loader.format_field_prompt_parts(doc_type, fields, text)
+        return await self._chat(
+            system_prompt, prompt,
+            self._response_format(f"{doc_type}_fields", self.field_schema(doc_type, fields)),
+            f"{doc_type}:fields", parse_json_response,
+        )
+
+    async def _chat(
+        self,
+        system_prompt: str,
+        prompt: str,
+        response_format: Dict[str, Any],
+        latency_key: str,
+        parse: Callable[[str], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """One chat completion under an adaptive timeout"""
+        messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+
+        timeout_policy = self.context.timeout_policy
+        timeout, basis = timeout_policy.timeout_for(self.model, latency_key, self.config.EXTRACTION_DEADLINE)
+        started = time.monotonic()
+
+        try:
+            session = self.http_client.get_session()
+            async with session.post(
+                f"{self.base_url}/chat/completions",
+                headers=self._headers(),
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "temperature": 0.1,
+                    "max_tokens": self.max_tokens,
+                    **response_format,
+                },
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                if response.status != 200:
+                    return {"error": f"{self.name} API error: {response.status}"}
+                result = await response.json()
+
+            self.context.latency_tracker.record(self.model, latency_key, time.monotonic() - started)
+            content = result["choices"][0]["message"].get("content") or ""
+            return parse(content)
+
+        except asyncio.TimeoutError:
+            self.context.latency_tracker.record(self.model, latency_key, timeout)
+            timeout_policy.record_timeout(basis)
+            return {
+                "error": f"{self.name} timeout after {timeout:.1f}s ({timeout_policy.describe(basis)})",
+                "timeout_basis": basis,
+            }
+        except Exception as e:
+            return {"error": str(e), "raw_response": ""}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "base_url": self.base_url, "schema_mode": self.schema_mode}
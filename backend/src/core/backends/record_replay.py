@@ -0,0 +1,226 @@
+# backend/src/core/backends/record_replay.py
+"""
+Record/replay of backend responses - capture every extraction call with its
+timing to a compact log, and serve it back later without the model
+"""
+
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from src.core.backends.base import ExtractionBackend, BackendCapabilities
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class ResponseLog:
+    """
+    Gzipped JSON lines, one recorded call per line
+
+    A line carries the call key, the backend and model, the response and how
+    long the call took - not the document text, which only enters the key.
+    Several recordings of the same call are replayed in recorded order.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._writer = None
+        self._unflushed = 0
+
+    def load(self) -> int:
+        if not self.path.exists():
+            return 0
+        count = 0
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    record = json.loads(line)
+                    self._records.setdefault(record["key"], []).append(record)
+                    count += 1
+        except (OSError, EOFError, ValueError) as e:
+            # A recording cut short by a crash still replays what was written
+            print(f"⚠️ Recording {self.path} ends early: {e}")
+        return count
+
+    def next(self, key: str) -> Optional[Dict[str, Any]]:
+        """The next recording of this call (cycling when it was replayed more often than recorded)"""
+        records = self._records.get(key)
+        if not records:
+            return None
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        return records[index % len(records)]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = gzip.open(self.path, "at", encoding="utf-8")
+        self._writer.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= 50:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._writer is not None and self._unflushed:
+            self._writer.flush()
+            self._unflushed = 0
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._records.values())
+
+
+class RecordReplayBackend(ExtractionBackend):
+    """
+    Wraps a backend to record its responses or replay them
+
+    record: calls go to the wrapped backend and each (call, response, seconds)
+    is appended to the log. replay: the wrapped backend is never contacted;
+    responses come from the log after the recorded duration divided by speed
+    (0 = no delay). A call that was not recorded returns an error, or goes to
+    the live backend with miss="passthrough".
+
+    Calls are keyed by the backend's type, options and model, the prompt
+    version, the document type, the requested fields and the exact text, so a
+    changed prompt or model does not replay stale responses.
+    """
+
+    def __init__(self, inner: ExtractionBackend, log: ResponseLog, mode: str,
+                 speed: float = 1.0, miss: str = "error"):
+        super().__init__(inner.name, inner.context, inner.options)
+        self.inner = inner
+        self.log = log
+        self.mode = mode
+        self.speed = speed
+        self.miss = miss
+
+        self.kind = inner.kind
+        self.icon = inner.icon
+        self.prompt_method = inner.prompt_method
+        self.remote_server = inner.remote_server
+
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self.replayed_seconds = 0.0
+
+    def __getattr__(self, name: str):
+        # Backend-specific attributes (pools, residency, ...) come from the wrapped backend
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    @property
+    def model_name(self) -> str:
+        return self.inner.model_name
+
+    @property
+    def display_name(self) -> str:
+        return self.inner.display_name
+
+    def capabilities(self) -> BackendCapabilities:
+        return self.inner.capabilities()
+
+    def _live(self) -> bool:
+        return self.mode == RECORD or self.miss == "passthrough"
+
+    def setup(self) -> bool:
+        if self._live():
+            return self.inner.setup()
+        return True
+
+    async def warmup(self) -> bool:
+        return await self.inner.warmup() if self._live() else True
+
+    async def start(self) -> None:
+        if self._live():
+            await self.inner.start()
+
+    async def health(self) -> bool:
+        return await self.inner.health() if self._live() else True
+
+    async def aclose(self) -> None:
+        self.log.close()
+        await self.inner.aclose()
+
+    def _key(self, call: str, text: str, doc_type: str, fields: Optional[List[str]] = None) -> str:
+        digest = hashlib.sha256()
+        parts = (
+            call,
+            self.kind,
+            json.dumps(self.options, sort_keys=True, default=str),
+            self.model_name,
+            self.prompt_loader.get_prompt_version(doc_type, self.prompt_method),
+            str(doc_type),
+            ",".join(fields or []),
+            text,
+        )
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def _call(self, call: str, text: str, doc_type: str, fields: Optional[List[str]], run) -> Dict[str, Any]:
+        key = self._key(call, text, doc_type, fields)
+
+        if self.mode == REPLAY:
+            record = self.log.next(key)
+            if record is not None:
+                if self.speed > 0:
+                    await asyncio.sleep(record["seconds"] / self.speed)
+                self.replayed += 1
+                self.replayed_seconds += record["seconds"]
+                return record["response"]
+            self.misses += 1
+            if self.miss != "passthrough":
+                return {"error": f"No recorded {self.name} response for this {doc_type} ({call})"}
+
+        started = time.monotonic()
+        response = await run()
+        seconds = time.monotonic() - started
+
+        if self.mode == RECORD:
+            self.log.append({
+                "key": key,
+                "call": call,
+                "backend": self.name,
+                "model": self.model_name,
+                "doc_type": str(doc_type),
+                "chars": len(text),
+                "seconds": round(seconds, 4),
+                "recorded_at": round(time.time(), 3),
+                "response": response,
+            })
+            self.recorded += 1
+        return response
+
+    async def extract(self, text: str, doc_type: str) -> Dict[str, Any]:
+        return await self._call("extract", text, doc_type, None, lambda: self.inner.extract(text, doc_type))
+
+    async def extract_fields(self, text: str, doc_type: str, fields: List[str]) -> Dict[str, Any]:
+        return await self._call(
+            "fields", text, doc_type, fields, lambda: self.inner.extract_fields(text, doc_type, fields)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self.inner.stats())
+        stats["record_replay"] = {
+            "mode": self.mode,
+            "path": str(self.log.path),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+            "replayed_model_seconds": round(self.replayed_seconds, 3),
+        }
+        return stats
@@ -0,0 +1,115 @@
+# backend/src/core/backends/registry.py
+"""
+Extraction backend registry - backend types by name, instances from configuration
+"""
+
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Type
+
+import yaml
+
+from src.core.backends.base import ExtractionBackend, BackendContext
+from src.core.backends.ollama_backend import OllamaBackend
+from src.core.backends.huggingface_backend import HuggingFaceBackend
+from src.core.backends.onnx_backend import OnnxBackend
+from src.core.backends.openai_backend import OpenAIBackend
+from src.core.backends.openai_compatible_backend import OpenAICompatibleBackend
+from src.core.backends.record_replay import RecordReplayBackend, ResponseLog, RECORD, REPLAY
+
+BACKEND_TYPES: Dict[str, Type[ExtractionBackend]] = {
+    "ollama": OllamaBackend,
+    "huggingface": HuggingFaceBackend,
+    "onnx": OnnxBackend,
+    "openai": OpenAIBackend,
+    "openai_compatible": OpenAICompatibleBackend,
+}
+
+
+def register_backend_type(kind: str, backend_class: Type[ExtractionBackend]) -> None:
+    """Make a new backend type available to configuration"""
+    BACKEND_TYPES[kind] = backend_class
+
+
+class BackendRegistry:
+    """
+    Build extraction backends in failover order
+
+    Backends are declared in BACKENDS_FILE (YAML) by name:
+
+        backends:
+          local-llamacpp:
+            type: openai_compatible
+            base_url: http://localhost:8080/v1
+            model: qwen2.5-1.5b-instruct
+        failover_chain: [ollama, local-llamacpp, huggingface]
+
+    Without the file, or for names it does not declare, each name in the chain
+    (failover_chain, else FAILOVER_CHAIN) is a backend type with default options;
+    "type:model" (e.g. "ollama:tinyllama") selects a model for that type.
+    """
+
+    def __init__(self, context: BackendContext):
+        self.context = context
+        self.config = context.config
+        self.cascade_spec: Dict[str, Any] = {}
+        self.specs, self.chain = self._load()
+
+    def _load(self):
+        specs: Dict[str, Dict[str, Any]] = {}
+        chain: List[str] = []
+
+        path = Path(self.config.BACKENDS_FILE)
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = yaml.safe_load(file) or {}
+                specs = data.get("backends", {}) or {}
+                chain = data.get("failover_chain", []) or []
+                self.cascade_spec = data.get("cascade", {}) or {}
+                print(f"✅ Loaded backend definitions from {path}: {list(specs)}")
+            except yaml.YAMLError as e:
+                print(f"⚠️ Error loading {path}: {e}. Using FAILOVER_CHAIN.")
+                specs = {}
+
+        if not chain:
+            chain = [m.strip() for m in self.config.FAILOVER_CHAIN.split(",") if m.strip()]
+        return specs, chain
+
+    def _spec_for(self, name: str) -> Dict[str, Any]:
+        if name in self.specs:
+            return dict(self.specs[name])
+        if ":" in name:
+            kind, model = name.split(":", 1)
+            return {"type": kind, "model": model}
+        return {"type": name}
+
+    def build(self, names: Optional[List[str]] = None) -> List[ExtractionBackend]:
+        """Instantiate backends by name, default the failover chain (models are loaded later by setup())"""
+        backends = []
+        for name in names if names is not None else self.chain:
+            options = self._spec_for(name)
+            kind = options.pop("type", name)
+
+            backend_class = BACKEND_TYPES.get(kind)
+            if backend_class is None:
+                print(f"⚠️ Unknown extraction backend type '{kind}' for '{name}'")
+                continue
+            backends.append(backend_class(name, self.context, options))
+        return self._record_replay(backends)
+
+    def _record_replay(self, backends: List[ExtractionBackend]) -> List[ExtractionBackend]:
+        """Wrap every backend to record or replay its responses (LLM_RECORD_MODE)"""
+        mode = self.config.LLM_RECORD_MODE
+        if mode not in (RECORD, REPLAY):
+            return backends
+
+        log = ResponseLog(self.config.LLM_RECORD_PATH)
+        if mode == REPLAY:
+            print(f"⏪ Replaying {log.load()} recorded responses from {log.path} "
+                  f"(speed {self.config.LLM_REPLAY_SPEED:g}, misses: {self.config.LLM_REPLAY_MISS})")
+        else:
+            print(f"⏺️ Recording backend responses to {log.path}")
+        return [
+            RecordReplayBackend(backend, log, mode, self.config.LLM_REPLAY_SPEED, self.config.LLM_REPLAY_MISS)
+            for backend in backends
+        ]
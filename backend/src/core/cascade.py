@@ -0,0 +1,156 @@
+# backend/src/core/cascade.py
+"""
+Cost-aware model cascade - try a small fast model first, escalate only when needed
+"""
+
+import threading
+from typing import Dict, Any, List, Optional
+
+from src.config.app_config import Config
+from src.core.latency import LatencyHistogram
+
+
+class CascadeRule:
+    """
+    Start a document at a later tier when every given condition matches
+
+        doc_types          - classified type is one of these
+        min_chars          - text is at least this long
+        max_ml_confidence  - classifier is less sure than this
+    """
+
+    def __init__(self, start_tier: str, doc_types: Optional[List[str]] = None,
+                 min_chars: Optional[int] = None, max_ml_confidence: Optional[float] = None):
+        self.start_tier = start_tier
+        self.doc_types = set(doc_types or [])
+        self.min_chars = min_chars
+        self.max_ml_confidence = max_ml_confidence
+
+    def matches(self, doc_type: str, text_length: int, ml_confidence: float) -> bool:
+        if self.doc_types and doc_type not in self.doc_types:
+            return False
+        if self.min_chars is not None and text_length < self.min_chars:
+            return False
+        if self.max_ml_confidence is not None and ml_confidence >= self.max_ml_confidence:
+            return False
+        return bool(self.doc_types) or self.min_chars is not None or self.max_ml_confidence is not None
+
+
+class _TierStats:
+    def __init__(self):
+        self.attempts = 0
+        self.accepted = 0
+        self.escalated = 0
+        self.errors = 0
+        self.skipped = 0
+        self.latency = LatencyHistogram()
+        # End-to-end latency of documents this tier finally answered
+        self.document_seconds = 0.0
+
+
+class CascadeRouter:
+    """
+    Routing plan and bookkeeping for a cascade of extraction backends
+
+    Tiers are backend names ordered from cheapest to most capable. Rules can
+    skip the cheap tiers for documents known to be hard; a tier's answer is
+    accepted when its score reaches the threshold, otherwise the document
+    escalates. The last tier's answer is always accepted.
+    """
+
+    def __init__(self, tiers: List[str], threshold: float, rules: Optional[List[CascadeRule]] = None):
+        self.tiers = tiers
+        self.threshold = threshold
+        self.rules = rules or []
+        self.documents = 0
+        self._stats: Dict[str, _TierStats] = {tier: _TierStats() for tier in tiers}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, spec: Optional[Dict[str, Any]] = None) -> Optional["CascadeRouter"]:
+        """Build from the `cascade:` section of backends.yaml, else CASCADE_* settings (None when disabled)"""
+        config = Config()
+
+        if spec:
+            tiers = list(spec.get("tiers", []))
+            threshold = float(spec.get("threshold", config.CASCADE_THRESHOLD))
+            rules = [CascadeRule(**rule) for rule in spec.get("rules", [])]
+        else:
+            tiers = [t.strip() for t in config.CASCADE_TIERS.split(",") if t.strip()]
+            threshold = config.CASCADE_THRESHOLD
+            rules = []
+            if len(tiers) > 1:
+                # Hard documents skip the smallest tier
+                skip_types = [t.strip() for t in config.CASCADE_SKIP_DOC_TYPES.split(",") if t.strip()]
+                if skip_types:
+                    rules.append(CascadeRule(tiers[1], doc_types=skip_types))
+                rules.append(CascadeRule(tiers[1], min_chars=config.CASCADE_MAX_SMALL_CHARS))
+                rules.append(CascadeRule(tiers[1], max_ml_confidence=config.CASCADE_MIN_ML_CONFIDENCE))
+
+        if len(tiers) < 2:
+            return None
+        return cls(tiers, threshold, rules)
+
+    def plan(self, doc_type: str, text_length: int, ml_confidence: float) -> List[str]:
+        """Tiers to try for this document, in order"""
+        start = 0
+        for rule in self.rules:
+            if rule.start_tier in self.tiers and rule.matches(doc_type, text_length, ml_confidence):
+                start = max(start, self.tiers.index(rule.start_tier))
+        return self.tiers[start:]
+
+    def record_attempt(self, tier: str, seconds: float, accepted: bool) -> None:
+        with self._lock:
+            stats = self._stats[tier]
+            stats.attempts += 1
+            stats.latency.record(seconds)
+            if accepted:
+                stats.accepted += 1
+            else:
+                stats.escalated += 1
+
+    def record_error(self, tier: str) -> None:
+        with self._lock:
+            self._stats[tier].errors += 1
+
+    def record_skip(self, tier: str) -> None:
+        """Tier was unavailable (circuit open)"""
+        with self._lock:
+            self._stats[tier].skipped += 1
+
+    def record_document(self, tier: str, seconds: float) -> None:
+        """A document was answered by `tier` after `seconds` in the cascade"""
+        with self._lock:
+            self.documents += 1
+            self._stats[tier].document_seconds += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            largest = self._stats[self.tiers[-1]].latency.snapshot()["mean"]
+
+            tiers = {}
+            saved = 0.0
+            for tier in self.tiers:
+                stats = self._stats[tier]
+                mean_document = stats.document_seconds / stats.accepted if stats.accepted else None
+                # Documents that escalated count negatively (they paid for the small tier too)
+                if largest is not None and mean_document is not None:
+                    saved += stats.accepted * (largest - mean_document)
+
+                tiers[tier] = {
+                    "attempts": stats.attempts,
+                    "accepted": stats.accepted,
+                    "escalated": stats.escalated,
+                    "errors": stats.errors,
+                    "skipped": stats.skipped,
+                    "hit_rate": round(stats.accepted / self.documents, 3) if self.documents else 0.0,
+                    "latency": stats.latency.snapshot(),
+                }
+
+            return {
+                "tiers": tiers,
+                "threshold": self.threshold,
+                "documents": self.documents,
+                # Versus sending every document straight to the largest tier
+                "estimated_seconds_saved": round(saved, 2) if largest is not None else None,
+            }
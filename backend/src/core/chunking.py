@@ -0,0 +1,143 @@
+# backend/src/core/chunking.py
+"""
+Token-budgeted document chunking and merge rules for map-reduce extraction
+"""
+
+import json
+import math
+from typing import Dict, Any, List
+
+# Rough average for English text with llama-style tokenizers
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (no tokenizer dependency), biased slightly high"""
+    if not text:
+        return 0
+    by_chars = len(text) / CHARS_PER_TOKEN
+    by_words = len(text.split()) * 1.3
+    return int(math.ceil(max(by_chars, by_words)))
+
+
+def size_context(prompt_tokens: int, num_predict: int, max_ctx: int, min_ctx: int = 2048) -> int:
+    """
+    Smallest power-of-two context that fits prompt + generation, capped at max_ctx
+
+    Ollama reloads the model whenever num_ctx changes, so sizes are
+    quantized to a few buckets instead of being exact per request.
+    """
+    needed = prompt_tokens + num_predict
+    size = min_ctx
+    while size < needed and size < max_ctx:
+        size *= 2
+    return min(size, max_ctx)
+
+
+class TokenBudgetSplitter:
+    """Split text into chunks that fit a token budget, on paragraph/line/word boundaries"""
+
+    def __init__(self, max_tokens: int, overlap_tokens: int = 0):
+        self.max_tokens = max(1, max_tokens)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens // 4))
+
+    def split(self, text: str) -> List[str]:
+        if estimate_tokens(text) <= self.max_tokens:
+            return [text]
+
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for unit in self._units(text):
+            unit_tokens = estimate_tokens(unit)
+
+            if current and current_tokens + unit_tokens > self.max_tokens:
+                chunks.append("\n".join(current))
+                current = self._overlap_tail(current)
+                current_tokens = sum(estimate_tokens(u) for u in current)
+
+            current.append(unit)
+            current_tokens += unit_tokens
+
+        if current:
+            chunks.append("\n".join(current))
+
+        return chunks
+
+    def _units(self, text: str) -> List[str]:
+        """Lines, with any line longer than the budget broken into word runs"""
+        units = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if estimate_tokens(line) <= self.max_tokens:
+                units.append(line)
+                continue
+
+            words, run = line.split(), []
+            for word in words:
+                if run and estimate_tokens(" ".join(run + [word])) > self.max_tokens:
+                    units.append(" ".join(run))
+                    run = []
+                run.append(word)
+            if run:
+                units.append(" ".join(run))
+        return units
+
+    def _overlap_tail(self, units: List[str]) -> List[str]:
+        """Trailing lines carried into the next chunk so fields split across a boundary survive"""
+        tail, tokens = [], 0
+        for unit in reversed(units):
+            unit_tokens = estimate_tokens(unit)
+            if tokens + unit_tokens > self.overlap_tokens:
+                break
+            tail.insert(0, unit)
+            tokens += unit_tokens
+        return tail
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _as_list(value: Any) -> List[Any]:
+    # Only real lists are split - a string like "Acme, Inc." is one value
+    return value if isinstance(value, list) else [value]
+
+
+def merge_partial_results(results: List[Dict[str, Any]], rules: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Merge per-chunk extractions with per-field rules (null and empty values
+    are skipped - a chunk that did not contain the field has no say)
+
+        first - first non-empty value wins (default)
+        last  - last non-empty value wins (e.g. totals at the end of a document)
+        union - concatenate list values, de-duplicated in order
+    """
+    merged: Dict[str, Any] = {}
+
+    for result in results:
+        for field, value in result.items():
+            rule = rules.get(field, "first")
+
+            if field not in merged or _is_empty(merged[field]):
+                merged[field] = _as_list(value) if rule == "union" and not _is_empty(value) else value
+                continue
+            if _is_empty(value):
+                continue
+
+            if rule == "union":
+                existing = merged[field] if isinstance(merged[field], list) else _as_list(merged[field])
+                existing = [item for item in existing if not _is_empty(item)]
+                seen = {json.dumps(item, sort_keys=True, default=str) for item in existing}
+                for item in _as_list(value):
+                    key = json.dumps(item, sort_keys=True, default=str)
+                    if key not in seen:
+                        existing.append(item)
+                        seen.add(key)
+                merged[field] = existing
+            elif rule == "last":
+                merged[field] = value
+
+    return merged
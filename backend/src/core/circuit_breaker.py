@@ -0,0 +1,174 @@
+# backend/src/core/circuit_breaker.py
+"""
+Per-backend circuit breaker driven by error rate and latency
+"""
+
+import time
+import threading
+from enum import Enum
+from collections import deque
+from typing import Dict, Any, Optional
+
+from src.config.app_config import Config
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed → open when the failure rate over a rolling window exceeds the
+    threshold (slow calls count as failures). Open → half-open after a
+    cool-down, letting a few trial calls through; a trial success closes the
+    circuit, a trial failure re-opens it. Background health probes can trip
+    the circuit without user traffic, but a probe success only closes a
+    circuit that a probe tripped - a liveness check cannot tell that
+    generation errors or slow calls have stopped, so those circuits still go
+    through the cool-down and a half-open trial.
+    """
+
+    def __init__(self, name: str):
+        config = Config()
+        self.name = name
+        self.failure_rate_threshold = config.CIRCUIT_FAILURE_RATE
+        self.min_calls = config.CIRCUIT_MIN_CALLS
+        self.window_seconds = config.CIRCUIT_WINDOW_SECONDS
+        self.open_seconds = config.CIRCUIT_OPEN_SECONDS
+        self.slow_call_seconds = config.CIRCUIT_SLOW_CALL_SECONDS
+        self.half_open_max_calls = config.CIRCUIT_HALF_OPEN_CALLS
+
+        self.state = CircuitState.CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_reason: Optional[str] = None
+        # Whether the circuit was opened by a health probe (vs. by real calls)
+        self.opened_by_probe = False
+        self._half_open_in_flight = 0
+        self._calls: deque = deque()  # (timestamp, failed)
+        self._lock = threading.Lock()
+
+        self.transitions = 0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """Whether a real request may be sent to this backend right now"""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+
+            if self.state == CircuitState.OPEN:
+                if time.time() - (self.opened_at or 0) >= self.open_seconds:
+                    self._transition(CircuitState.HALF_OPEN, "cool-down elapsed")
+                else:
+                    self.rejected += 1
+                    return False
+
+            if self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def is_available(self) -> bool:
+        """Non-mutating check used for routing decisions and health output"""
+        if self.state == CircuitState.OPEN:
+            return time.time() - (self.opened_at or 0) >= self.open_seconds
+        return True
+
+    def record_success(self, latency: float) -> None:
+        if latency > self.slow_call_seconds:
+            self.record_failure(f"slow call ({latency:.1f}s)")
+            return
+
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._transition(CircuitState.CLOSED, "trial call succeeded")
+                return
+            self._add_call(failed=False)
+
+    def record_failure(self, reason: str = "error") -> None:
+        with self._lock:
+            self.last_reason = reason
+
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._transition(CircuitState.OPEN, f"trial call failed: {reason}")
+                return
+
+            self._add_call(failed=True)
+            total = len(self._calls)
+            failures = sum(1 for _, failed in self._calls if failed)
+            if (
+                self.state == CircuitState.CLOSED
+                and total >= self.min_calls
+                and failures / total >= self.failure_rate_threshold
+            ):
+                self._transition(CircuitState.OPEN, f"failure rate {failures}/{total}: {reason}")
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot that was never used"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def record_probe(self, healthy: bool, reason: str = "health probe failed") -> None:
+        """Apply a background health probe result"""
+        with self._lock:
+            if healthy:
+                if self.state == CircuitState.OPEN and self.opened_by_probe:
+                    self._transition(CircuitState.CLOSED, "health probe succeeded")
+                elif (self.state == CircuitState.OPEN
+                      and time.time() - (self.opened_at or 0) >= self.open_seconds):
+                    self._transition(CircuitState.HALF_OPEN, "cool-down elapsed, health probe succeeded")
+            elif self.state != CircuitState.OPEN:
+                self.last_reason = reason
+                self._transition(CircuitState.OPEN, reason)
+                self.opened_by_probe = True
+
+    def trip(self, reason: str) -> None:
+        """Force the circuit open from a failed startup check (a later successful probe closes it)"""
+        with self._lock:
+            self.last_reason = reason
+            self._transition(CircuitState.OPEN, reason)
+            self.opened_by_probe = True
+
+    def _add_call(self, failed: bool) -> None:
+        now = time.time()
+        self._calls.append((now, failed))
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        if state == self.state:
+            return
+
+        print(f"🔌 Circuit '{self.name}': {self.state.value} → {state.value} ({reason})")
+        self.state = state
+        self.transitions += 1
+        self._half_open_in_flight = 0
+
+        if state == CircuitState.OPEN:
+            self.opened_at = time.time()
+            self.opened_by_probe = False
+        elif state == CircuitState.CLOSED:
+            self.opened_at = None
+            self._calls.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = len(self._calls)
+            failures = sum(1 for _, failed in self._calls if failed)
+            return {
+                "state": self.state.value,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+                "window_calls": total,
+                "opened_at": self.opened_at,
+                "opened_by_probe": self.opened_by_probe,
+                "last_reason": self.last_reason,
+                "transitions": self.transitions,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,414 @@
+# backend/src/core/classifier_registry.py
+"""
+Document classifier artifacts - versioned models trained offline, loaded at
+startup and swapped at runtime when a version is promoted
+
+    cd backend
+    python -m src.core.classifier_registry train corpus.jsonl --promote
+    python -m src.core.classifier_registry evaluate corpus.jsonl --version v3
+    python -m src.core.classifier_registry promote v3
+    python -m src.core.classifier_registry list
+
+A corpus is JSON lines ({"text": ..., "label": ...}) or a CSV with text,label columns.
+"""
+
+import os
+import csv
+import json
+import time
+import argparse
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from src.config.app_config import Config
+from src.core.online_classifier import OnlineClassifier
+
+# Bootstrap corpus - trained as the first version when the registry is empty
+SEED_TEXTS = [
+    # Invoices
+    "Invoice Number INV-001 Total Amount $1500 Due Date 2024-01-15",
+    "INVOICE Company ABC Total: $2300 Date: Jan 15 2024",
+    "Bill Invoice #12345 Amount Due: $890 Payment Terms: Net 30",
+
+    # Contracts
+    "This Agreement between Party A and Party B effective January 1 2024",
+    "CONTRACT for services Term: 12 months Payment: Monthly",
+    "Service Agreement Party obligations Terms and conditions",
+
+    # Forms
+    "Application Form Name: John Doe Address: 123 Main St Phone: 555-0123",
+    "Registration Form Personal Information Company Department",
+    "FORM Submit application Date of birth Emergency contact",
+
+    # Receipts
+    "Receipt Boots UK Total £2.50 Card Payment Thank you for shopping",
+    "RECEIPT Tesco Store 1234 Total: $15.67 Cash Paid",
+    "Thank you for your purchase Receipt Total Amount £25.00 Change £5.00",
+]
+
+SEED_LABELS = [
+    "invoice", "invoice", "invoice",
+    "contract", "contract", "contract",
+    "form", "form", "form",
+    "receipt", "receipt", "receipt",
+]
+
+
+def build_pipeline() -> Pipeline:
+    return Pipeline(
+        [
+            ("tfidf", TfidfVectorizer(max_features=1000, stop_words="english")),
+            ("nb", MultinomialNB()),
+        ]
+    )
+
+
+def load_corpus(path: str) -> Tuple[List[str], List[str]]:
+    """(texts, labels) from JSON lines or a text,label CSV"""
+    texts, labels = [], []
+    with open(path, "r", encoding="utf-8") as file:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(file):
+                texts.append(row["text"])
+                labels.append(row["label"])
+        else:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    texts.append(record["text"])
+                    labels.append(record["label"])
+    return texts, labels
+
+
+class ClassifierRegistry:
+    """
+    Versioned classifier artifacts on disk
+
+    Each version is a directory holding model.joblib (uncompressed, so numpy
+    arrays are memory-mapped on load and shared between workers through the
+    page cache) and meta.json (labels, corpus size, holdout and evaluation
+    accuracy). The ACTIVE file names the promoted version and is replaced
+    atomically.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or Config().CLASSIFIER_REGISTRY_DIR)
+
+    @property
+    def active_path(self) -> Path:
+        return self.directory / "ACTIVE"
+
+    def versions(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        found = [p.name for p in self.directory.iterdir() if (p / "model.joblib").exists()]
+        return sorted(found, key=lambda v: int(v[1:]) if v[1:].isdigit() else 0)
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        with open(self.directory / version / "meta.json", "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_metadata(self, version: str, metadata: Dict[str, Any]) -> None:
+        path = self.directory / version / "meta.json"
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(metadata, indent=2))
+        temp_path.replace(path)
+
+    def active_version(self) -> Optional[str]:
+        try:
+            version = self.active_path.read_text().strip()
+        except OSError:
+            return None
+        return version if version in self.versions() else None
+
+    def active_mtime(self) -> float:
+        try:
+            return self.active_path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def train(self, texts: List[str], labels: List[str], source: str = "corpus", holdout: float = 0.2,
+              seed: int = 0) -> str:
+        """Fit a new version (accuracy measured on a stratified holdout, then refit on everything)"""
+        holdout_accuracy = None
+        counts = {label: labels.count(label) for label in set(labels)}
+        if holdout > 0 and min(counts.values()) >= 2 and len(texts) >= 10:
+            rng = np.random.default_rng(seed)
+            test_index = []
+            for label in counts:
+                members = [i for i, l in enumerate(labels) if l == label]
+                take = max(1, int(len(members) * holdout))
+                test_index.extend(rng.choice(members, size=take, replace=False).tolist())
+            test = set(test_index)
+            train_index = [i for i in range(len(texts)) if i not in test]
+
+            model = build_pipeline().fit([texts[i] for i in train_index], [labels[i] for i in train_index])
+            predicted = model.predict([texts[i] for i in test_index])
+            holdout_accuracy = float(np.mean(predicted == np.array([labels[i] for i in test_index])))
+
+        model = build_pipeline().fit(texts, labels)
+
+        existing = [int(v[1:]) for v in self.versions() if v[1:].isdigit()]
+        version = f"v{max(existing, default=0) + 1}"
+        path = self.directory / version
+        path.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, path / "model.joblib")
+        self._write_metadata(version, {
+            "version": version,
+            "created_at": time.time(),
+            "source": source,
+            "samples": len(texts),
+            "labels": sorted(counts),
+            "label_counts": counts,
+            "holdout_accuracy": holdout_accuracy,
+            "evaluations": [],
+        })
+        print(f"✅ Trained classifier {version} on {len(texts)} samples"
+              + (f" (holdout accuracy {holdout_accuracy:.3f})" if holdout_accuracy is not None else ""))
+        return version
+
+    def load(self, version: str) -> Pipeline:
+        return joblib.load(self.directory / version / "model.joblib", mmap_mode="r")
+
+    def evaluate(self, version: str, texts: List[str], labels: List[str], source: str = "corpus") -> float:
+        """Accuracy of a version on a labeled corpus (recorded in its metadata)"""
+        predicted = self.load(version).predict(texts)
+        accuracy = float(np.mean(predicted == np.array(labels)))
+        metadata = self.metadata(version)
+        metadata.setdefault("evaluations", []).append(
+            {"source": source, "samples": len(texts), "accuracy": accuracy, "at": time.time()}
+        )
+        self._write_metadata(version, metadata)
+        return accuracy
+
+    def promote(self, version: str) -> None:
+        if version not in self.versions():
+            raise ValueError(f"Unknown classifier version: {version}")
+        temp_path = self.active_path.with_suffix(".tmp")
+        temp_path.write_text(version)
+        os.replace(temp_path, self.active_path)
+        print(f"🚀 Promoted classifier {version}")
+
+
+class _VersionStats:
+    def __init__(self):
+        self.predictions = 0
+        self.durations = deque(maxlen=2000)
+
+
+class ClassifierService:
+    """
+    The active classifier of this process
+
+    The model and its version are swapped as one tuple, so a classification
+    in flight keeps the model it started with. Promotions made by another
+    worker are picked up by checking the ACTIVE file every reload_interval.
+    Latency is tracked per version.
+
+    With ONLINE_CLASSIFIER enabled, reviewed labels train an online model that
+    takes over classification once it clearly beats the registry model on
+    held-out reviewed documents.
+    """
+
+    def __init__(self, registry: Optional[ClassifierRegistry] = None):
+        config = Config()
+        self.registry = registry or ClassifierRegistry()
+        self.reload_interval = config.CLASSIFIER_RELOAD_INTERVAL
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _VersionStats] = {}
+        self._checked_at = time.monotonic()
+        self._active_mtime = 0.0
+
+        version = self.registry.active_version()
+        if version is None:
+            version = self.registry.versions()[-1] if self.registry.versions() else None
+            if version is None:
+                version = self.registry.train(SEED_TEXTS, SEED_LABELS, source="seed", holdout=0)
+            self.registry.promote(version)
+        self._active: Tuple[str, Pipeline] = (version, self.registry.load(version))
+        self._active_mtime = self.registry.active_mtime()
+        print(f"✅ Document classifier {version} loaded")
+
+        # Learns from human-review corrections (feedback endpoint)
+        self.online: Optional[OnlineClassifier] = None
+        if config.ONLINE_CLASSIFIER:
+            classes = list(SEED_LABELS) + [str(c) for c in self.model.classes_]
+            self.online = OnlineClassifier(classes, SEED_TEXTS, SEED_LABELS, str(self.registry.directory))
+
+    @property
+    def version(self) -> str:
+        return self._active[0]
+
+    @property
+    def model(self) -> Pipeline:
+        return self._active[1]
+
+    def classify(self, text: str) -> Tuple[str, float, str]:
+        """(label, confidence, version)"""
+        results, version = self._classify([text])
+        label, confidence = results[0]
+        return label, confidence, version
+
+    def classify_many(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """(label, confidence) per text - one vectorizer pass and one predict_proba for the whole batch"""
+        if not texts:
+            return []
+        return self._classify(texts)[0]
+
+    def _classify(self, texts: List[str]) -> Tuple[List[Tuple[str, float]], str]:
+        self._maybe_reload()
+        version, model = self._active
+        started = time.perf_counter()
+
+        if self.online is not None and self.online.serving():
+            version = self.online.version
+            probabilities, classes = self.online.predict_proba(texts)
+        else:
+            probabilities = model.predict_proba(texts)
+            classes = model.classes_
+
+        best = probabilities.argmax(axis=1)
+        labels = classes[best]
+        confidences = probabilities[np.arange(len(texts)), best]
+        # Per-document latency is the batch's amortized cost
+        self._record(version, (time.perf_counter() - started) / len(texts), len(texts))
+
+        return [(str(label), float(confidence)) for label, confidence in zip(labels, confidences)], version
+
+    def _record(self, version: str, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(version, _VersionStats())
+            stats.predictions += count
+            stats.durations.append(seconds)
+
+    def feedback(self, text: str, label: str) -> Dict[str, Any]:
+        """Queue a human-reviewed label (correction or confirmation) for the online model"""
+        if self.online is None:
+            return {"error": "Online classifier is disabled (ONLINE_CLASSIFIER=false)"}
+        # What the registry model says, to compare both models on the same documents
+        registry_label = str(self.model.predict([text])[0])
+        return self.online.feedback(text, label, registry_label)
+
+    async def start(self) -> None:
+        if self.online is not None:
+            await self.online.start()
+
+    async def aclose(self) -> None:
+        if self.online is not None:
+            await self.online.aclose()
+
+    def promote(self, version: str) -> Dict[str, Any]:
+        """Make a version active here and, through the ACTIVE file, in every other worker"""
+        model = self.registry.load(version)
+        self.registry.promote(version)
+        previous = self._active[0]
+        self._active = (version, model)
+        self._active_mtime = self.registry.active_mtime()
+        return {"previous": previous, "active": version}
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        mtime = self.registry.active_mtime()
+        if mtime == self._active_mtime:
+            return
+        self._active_mtime = mtime
+        version = self.registry.active_version()
+        if version is not None and version != self._active[0]:
+            try:
+                self._active = (version, self.registry.load(version))
+                print(f"🔄 Document classifier switched to {version}")
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not load classifier {version}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latency = {}
+            for version, stats in self._stats.items():
+                durations = np.array(stats.durations) * 1000
+                latency[version] = {
+                    "predictions": stats.predictions,
+                    "p50_ms": round(float(np.percentile(durations, 50)), 3) if len(durations) else None,
+                    "p95_ms": round(float(np.percentile(durations, 95)), 3) if len(durations) else None,
+                }
+
+        versions = {}
+        for version in self.registry.versions():
+            try:
+                metadata = self.registry.metadata(version)
+            except (OSError, ValueError):
+                continue
+            evaluations = metadata.get("evaluations") or []
+            versions[version] = {
+                "created_at": metadata.get("created_at"),
+                "source": metadata.get("source"),
+                "samples": metadata.get("samples"),
+                "holdout_accuracy": metadata.get("holdout_accuracy"),
+                "last_evaluation": evaluations[-1] if evaluations else None,
+                **latency.get(version, {}),
+            }
+        if self.online is not None:
+            online = self.online.stats()
+            online.update(latency.get(self.online.version, {}))
+        else:
+            online = None
+        return {"active": self._active[0], "versions": versions, "online": online}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage document classifier versions")
+    parser.add_argument("--dir", help="Registry directory (default CLASSIFIER_REGISTRY_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="Train a new version from a labeled corpus")
+    train.add_argument("corpus")
+    train.add_argument("--holdout", type=float, default=0.2)
+    train.add_argument("--promote", action="store_true")
+
+    evaluate = commands.add_parser("evaluate", help="Measure a version's accuracy on a labeled corpus")
+    evaluate.add_argument("corpus")
+    evaluate.add_argument("--version", help="Default: the active version")
+
+    promote = commands.add_parser("promote", help="Make a version active")
+    promote.add_argument("version")
+
+    commands.add_parser("list", help="Show versions and their accuracy")
+
+    args = parser.parse_args()
+    registry = ClassifierRegistry(args.dir)
+
+    if args.command == "train":
+        texts, labels = load_corpus(args.corpus)
+        version = registry.train(texts, labels, source=Path(args.corpus).name, holdout=args.holdout)
+        if args.promote:
+            registry.promote(version)
+    elif args.command == "evaluate":
+        texts, labels = load_corpus(args.corpus)
+        version = args.version or registry.active_version()
+        accuracy = registry.evaluate(version, texts, labels, source=Path(args.corpus).name)
+        print(f"📊 {version}: accuracy {accuracy:.3f} on {len(texts)} samples")
+    elif args.command == "promote":
+        registry.promote(args.version)
+    else:
+        active = registry.active_version()
+        for version in registry.versions():
+            metadata = registry.metadata(version)
+            marker = "*" if version == active else " "
+            print(f"{marker} {version}  samples={metadata.get('samples')}  "
+                  f"holdout={metadata.get('holdout_accuracy')}  source={metadata.get('source')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# backend/src/core/field_recovery.py
+"""
+Field-level recovery - re-extract only the fields a first pass left empty or
+invalid, from the part of the document where they are likely to be
+"""
+
+import re
+import threading
+from typing import Dict, Any, List
+
+from src.config.app_config import Config
+from src.core.prompt_loader import PromptLoader
+from src.core.structured_output import SchemaValidator
+
+# Values models use for "not found"
+_PLACEHOLDERS = {"", "n/a", "na", "none", "null", "unknown", "not found", "not available", "-"}
+
+
+def is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in _PLACEHOLDERS
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+class _FieldStats:
+    def __init__(self):
+        self.attempted = 0
+        self.recovered = 0
+        self.failed = 0
+
+
+class FieldRecovery:
+    """
+    Second extraction pass for missing fields
+
+    A field needs recovery when it is absent, empty or does not validate
+    against its declared type. The prompt lists only those fields and carries
+    only the lines around their keywords, so it costs a fraction of a full
+    extraction. Documents missing more than max_fields are left to the normal
+    failover / review path - that is a bad extraction, not a few gaps.
+    """
+
+    def __init__(self, prompt_loader: PromptLoader, schema_validator: SchemaValidator):
+        config = Config()
+        self.prompt_loader = prompt_loader
+        self.schema_validator = schema_validator
+        self.window_chars = config.FIELD_RECOVERY_WINDOW_CHARS
+        self.max_fields = config.FIELD_RECOVERY_MAX_FIELDS
+
+        self.runs = 0
+        self.errors = 0
+        self._fields: Dict[str, _FieldStats] = {}
+        self._lock = threading.Lock()
+
+    def missing_fields(self, doc_type: str, extracted_data: Dict[str, Any]) -> List[str]:
+        """Declared fields that are absent, empty or of the wrong type"""
+        schema = self.prompt_loader.get_schema(doc_type)
+        if not schema:
+            return [field for field, value in extracted_data.items() if is_empty(value)]
+
+        missing = []
+        for field in schema.get("properties", {}):
+            value = extracted_data.get(field)
+            if is_empty(value) or not self.schema_validator.coerce_field(doc_type, schema, field, value)[0]:
+                missing.append(field)
+        return missing
+
+    def text_window(self, text: str, fields: List[str]) -> str:
+        """Lines around the fields' keywords (whole text when short, its start when nothing matches)"""
+        if len(text) <= self.window_chars:
+            return text
+
+        lines = text.splitlines()
+        patterns = [
+            re.compile(re.escape(keyword.lower()))
+            for field in fields
+            for keyword in self.prompt_loader.get_field_keywords(field)
+        ]
+        scores = [sum(1 for p in patterns if p.search(line.lower())) for line in lines]
+
+        ranked = sorted((i for i, score in enumerate(scores) if score), key=lambda i: -scores[i])
+        if not ranked:
+            return text[:self.window_chars]
+
+        # Take the best matching lines with two lines of context, in document order
+        selected: set = set()
+        size = 0
+        for index in ranked:
+            block = [i for i in range(index - 2, index + 3) if 0 <= i < len(lines) and i not in selected]
+            block_size = sum(len(lines[i]) + 1 for i in block)
+            if size + block_size > self.window_chars and selected:
+                break
+            selected.update(block)
+            size += block_size
+
+        return "\n".join(lines[i] for i in sorted(selected))[:self.window_chars]
+
+    async def recover(self, backend, text: str, doc_type: str, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill missing fields of extracted_data using the same backend (returns a new dict)"""
+        if "error" in extracted_data or "raw_response" in extracted_data:
+            return extracted_data
+        if not backend.capabilities().field_extraction:
+            return extracted_data
+
+        fields = self.missing_fields(doc_type, extracted_data)
+        if not fields or len(fields) > self.max_fields:
+            return extracted_data
+
+        print(f"🩹 Re-extracting {len(fields)} field(s): {', '.join(fields)}")
+        answer = await backend.extract_fields(self.text_window(text, fields), doc_type, fields)
+
+        with self._lock:
+            self.runs += 1
+            if "error" in answer or "raw_response" in answer:
+                self.errors += 1
+
+        schema = self.prompt_loader.get_schema(doc_type)
+        recovered = dict(extracted_data)
+        for field in fields:
+            value = answer.get(field)
+            valid = not is_empty(value)
+            if valid and schema:
+                valid, value = self.schema_validator.coerce_field(doc_type, schema, field, value)
+            if valid:
+                recovered[field] = value
+            self._record(doc_type, field, valid)
+
+        return recovered
+
+    def _record(self, doc_type: str, field: str, recovered: bool) -> None:
+        with self._lock:
+            stats = self._fields.setdefault(f"{doc_type}.{field}", _FieldStats())
+            stats.attempted += 1
+            if recovered:
+                stats.recovered += 1
+            else:
+                stats.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "errors": self.errors,
+                "fields": {
+                    key: {
+                        "attempted": stats.attempted,
+                        "recovered": stats.recovered,
+                        "failed": stats.failed,
+                        "recovery_rate": round(stats.recovered / stats.attempted, 3) if stats.attempted else 0.0,
+                    }
+                    for key, stats in sorted(self._fields.items())
+                },
+            }
@@ -0,0 +1,65 @@
+# backend/src/core/http_client.py
+"""
+Shared async HTTP client - pooled keep-alive connections to the LLM backends
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from src.config.app_config import Config
+
+
+class AsyncHTTPClient:
+    """Pooled aiohttp session that lives for the lifetime of the service manager"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+    ):
+        config = Config()
+        self.limit = limit if limit is not None else config.HTTP_POOL_LIMIT
+        self.limit_per_host = (
+            limit_per_host if limit_per_host is not None else config.HTTP_POOL_LIMIT_PER_HOST
+        )
+        self.keepalive_timeout = (
+            keepalive_timeout if keepalive_timeout is not None else config.HTTP_KEEPALIVE_TIMEOUT
+        )
+
+        # aiohttp sessions are bound to the event loop they were created in,
+        # so keep one per loop (the server loop plus any sync-wrapper loops)
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+
+        return session
+
+    async def close_current(self) -> None:
+        """Close the session bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def close(self) -> None:
+        """Close all sessions owned by the running event loop and drop stale ones"""
+        loop = asyncio.get_running_loop()
+        for session_loop in list(self._sessions):
+            session = self._sessions.pop(session_loop)
+            if session_loop is loop and not session.closed:
+                await session.close()
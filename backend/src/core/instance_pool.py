@@ -0,0 +1,128 @@
+# backend/src/core/instance_pool.py
+"""
+Pool of equivalent server instances - least-outstanding-requests routing,
+health checks with ejection, and per-instance load/latency metrics
+"""
+
+import time
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
+
+import aiohttp
+
+from src.config.app_config import Config
+from src.core.http_client import AsyncHTTPClient
+from src.core.latency import LatencyHistogram
+
+
+class ServerInstance:
+    """One server in the pool"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.latency = LatencyHistogram()
+
+    def available(self) -> bool:
+        return self.healthy and time.time() >= self.ejected_until
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "ejected": time.time() < self.ejected_until,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class InstancePool:
+    """
+    Route each request to the available instance with the fewest outstanding
+    requests (ties broken randomly). An instance is ejected for a cool-down
+    after repeated consecutive failures or a failed health check, and
+    reinstated by the next successful health check.
+    """
+
+    def __init__(self, urls: List[str], http_client: AsyncHTTPClient, health_path: str = "/api/tags"):
+        config = Config()
+        self.instances = [ServerInstance(url) for url in urls]
+        self.http_client = http_client
+        self.health_path = health_path
+        self.eject_failures = config.POOL_EJECT_FAILURES
+        self.eject_seconds = config.POOL_EJECT_SECONDS
+
+    def pick(self, exclude: Optional[ServerInstance] = None) -> Optional[ServerInstance]:
+        candidates = [i for i in self.instances if i is not exclude and i.available()]
+        if not candidates:
+            # Everything ejected - still try the least loaded rather than failing outright
+            if exclude is not None:
+                return None
+            candidates = list(self.instances)
+        least = min(i.outstanding for i in candidates)
+        return random.choice([i for i in candidates if i.outstanding == least])
+
+    def available_count(self) -> int:
+        return sum(1 for i in self.instances if i.available())
+
+    @asynccontextmanager
+    async def track(self, instance: ServerInstance):
+        """Count an in-flight request against an instance"""
+        instance.outstanding += 1
+        instance.requests += 1
+        try:
+            yield instance
+        finally:
+            instance.outstanding -= 1
+
+    def record_success(self, instance: ServerInstance, seconds: float) -> None:
+        instance.consecutive_failures = 0
+        instance.latency.record(seconds)
+
+    def record_failure(self, instance: ServerInstance, reason: str) -> None:
+        instance.failures += 1
+        instance.consecutive_failures += 1
+        if instance.consecutive_failures >= self.eject_failures:
+            self._eject(instance, f"{instance.consecutive_failures} consecutive failures: {reason}")
+
+    def _eject(self, instance: ServerInstance, reason: str) -> None:
+        if time.time() >= instance.ejected_until:
+            instance.ejections += 1
+            print(f"🚷 Ejecting {instance.url} for {self.eject_seconds:.0f}s ({reason})")
+        instance.ejected_until = time.time() + self.eject_seconds
+
+    async def check_all(self) -> bool:
+        """Probe every instance; returns whether any instance is available"""
+        results = await asyncio.gather(*[self._check(i) for i in self.instances], return_exceptions=True)
+        for instance, healthy in zip(self.instances, results):
+            healthy = healthy is True
+            if healthy and not instance.available():
+                print(f"✅ {instance.url} is healthy again")
+                instance.ejected_until = 0.0
+                instance.consecutive_failures = 0
+            elif not healthy and instance.healthy:
+                self._eject(instance, "health check failed")
+            instance.healthy = healthy
+        return self.available_count() > 0
+
+    async def _check(self, instance: ServerInstance) -> bool:
+        session = self.http_client.get_session()
+        async with session.get(
+            f"{instance.url}{self.health_path}",
+            timeout=aiohttp.ClientTimeout(total=5),
+        ) as response:
+            return response.status == 200
+
+    def stats(self) -> Dict[str, Any]:
+        return {instance.url: instance.stats() for instance in self.instances}
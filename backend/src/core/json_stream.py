@@ -0,0 +1,81 @@
+# backend/src/core/json_stream.py
+"""
+Incremental JSON boundary detection for streamed LLM output
+"""
+
+from typing import List, Optional
+
+
+class IncrementalJSONParser:
+    """
+    Feed generated tokens as they arrive and detect when the first
+    top-level JSON object closes, so generation can be aborted early.
+
+        parser = IncrementalJSONParser()
+        for token in stream:
+            if parser.feed(token):
+                break
+        json_text = parser.json_text
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._offset = 0
+        self.complete = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of generated text; returns True once the object is closed"""
+        if self.complete or not chunk:
+            return self.complete
+
+        self._chunks.append(chunk)
+
+        for i, ch in enumerate(chunk):
+            position = self._offset + i
+
+            # Skip any preamble ("Here is the JSON: ...") until the object opens
+            if self._start is None:
+                if ch == "{":
+                    self._start = position
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end = position + 1
+                    self.complete = True
+                    break
+
+        self._offset += len(chunk)
+        return self.complete
+
+    @property
+    def text(self) -> str:
+        """Everything received so far"""
+        return "".join(self._chunks)
+
+    @property
+    def json_text(self) -> str:
+        """The top-level JSON object if closed, otherwise everything received so far"""
+        if self._start is not None and self._end is not None:
+            return self.text[self._start:self._end]
+        return self.text
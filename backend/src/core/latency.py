@@ -0,0 +1,218 @@
+# backend/src/core/latency.py
+"""
+Latency histograms, adaptive timeouts and retry budgets for LLM calls
+"""
+
+import time
+import random
+import bisect
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.config.app_config import Config
+
+
+def _log_buckets(low: float, high: float, factor: float) -> List[float]:
+    bounds = []
+    value = low
+    while value < high:
+        bounds.append(round(value, 4))
+        value *= factor
+    bounds.append(high)
+    return bounds
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with exponential decay
+
+    Once max_samples is exceeded all bucket counts are halved, so the
+    quantiles follow recent behaviour instead of the whole process lifetime.
+    """
+
+    BUCKETS = _log_buckets(0.05, 600.0, 1.2)
+
+    def __init__(self, max_samples: int = 2000):
+        self.max_samples = max_samples
+        self.counts = [0.0] * (len(self.BUCKETS) + 1)
+        self.total = 0.0
+        self.sum = 0.0
+        self.max_seen = 0.0
+
+    def record(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += seconds
+        self.max_seen = max(self.max_seen, seconds)
+
+        if self.total > self.max_samples:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+            self.sum /= 2
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th sample (None when empty)"""
+        if self.total <= 0:
+            return None
+
+        target = q * self.total
+        cumulative = 0.0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count > 0:
+                return self.BUCKETS[index] if index < len(self.BUCKETS) else self.max_seen
+        return self.max_seen
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "samples": round(self.total, 1),
+            "mean": round(self.sum / self.total, 3) if self.total else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class LatencyTracker:
+    """Latency histograms keyed by (model, doc_type)"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, doc_type: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((model, doc_type))
+            if histogram is None:
+                histogram = self._histograms[(model, doc_type)] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def get(self, model: str, doc_type: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get((model, doc_type))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                f"{model}/{doc_type}": histogram.snapshot()
+                for (model, doc_type), histogram in self._histograms.items()
+            }
+
+
+class AdaptiveTimeoutPolicy:
+    """
+    Derive per-attempt timeouts from live latency: p99 × factor, clamped to
+    [min, max] and never beyond what is left of the request deadline.
+    """
+
+    def __init__(self, tracker: LatencyTracker):
+        config = Config()
+        self.tracker = tracker
+        self.factor = config.ADAPTIVE_TIMEOUT_FACTOR
+        self.min_timeout = config.ADAPTIVE_TIMEOUT_MIN
+        self.max_timeout = config.ADAPTIVE_TIMEOUT_MAX
+        self.default_timeout = config.ADAPTIVE_TIMEOUT_DEFAULT
+        self.min_samples = config.ADAPTIVE_TIMEOUT_MIN_SAMPLES
+
+        self.recent_timeouts: deque = deque(maxlen=20)
+
+    def timeout_for(self, model: str, doc_type: str, remaining: float) -> Tuple[float, Dict[str, Any]]:
+        """Return the timeout for the next attempt and the basis it was derived from"""
+        histogram = self.tracker.get(model, doc_type)
+        p99 = histogram.quantile(0.99) if histogram else None
+        samples = histogram.total if histogram else 0
+
+        if p99 is not None and samples >= self.min_samples:
+            timeout = min(max(p99 * self.factor, self.min_timeout), self.max_timeout)
+            source = "p99"
+        else:
+            timeout = self.default_timeout
+            source = "default"
+
+        capped_by_deadline = remaining < timeout
+        timeout = max(0.0, min(timeout, remaining))
+
+        basis = {
+            "model": model,
+            "doc_type": doc_type,
+            "source": source,
+            "p99": p99,
+            "factor": self.factor,
+            "samples": round(samples, 1),
+            "deadline_remaining": round(remaining, 2),
+            "capped_by_deadline": capped_by_deadline,
+            "timeout": round(timeout, 2),
+        }
+        return timeout, basis
+
+    def record_timeout(self, basis: Dict[str, Any]) -> None:
+        """Remember why a timeout fired so operators can inspect it"""
+        self.recent_timeouts.append({**basis, "at": time.time()})
+
+    @staticmethod
+    def describe(basis: Dict[str, Any]) -> str:
+        if basis["source"] == "p99":
+            text = f"p99 {basis['p99']:.1f}s × {basis['factor']} over {basis['samples']} samples"
+        else:
+            text = "default (not enough samples)"
+        if basis["capped_by_deadline"]:
+            text += ", capped by request deadline"
+        return text
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "factor": self.factor,
+            "min_timeout": self.min_timeout,
+            "max_timeout": self.max_timeout,
+            "default_timeout": self.default_timeout,
+            "min_samples": self.min_samples,
+            "recent_timeouts": list(self.recent_timeouts),
+        }
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget: every request deposits `ratio` tokens and
+    every retry spends one, so retries stay a bounded share of traffic and
+    cannot amplify an overload. The bucket starts full so a few retries are
+    possible at low volume.
+    """
+
+    def __init__(self, ratio: Optional[float] = None, max_tokens: Optional[float] = None):
+        config = Config()
+        self.ratio = ratio if ratio is not None else config.RETRY_BUDGET_RATIO
+        self.max_tokens = max_tokens if max_tokens is not None else config.RETRY_BUDGET_MAX_TOKENS
+        self.tokens = self.max_tokens
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.retries += 1
+                return True
+            self.denied += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "tokens": round(self.tokens, 2),
+            "requests": self.requests,
+            "retries": self.retries,
+            "denied": self.denied,
+        }
+
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
@@ -0,0 +1,125 @@
+# backend/src/core/micro_batcher.py
+"""
+Dynamic micro-batching - collect concurrent requests into one model call
+"""
+
+import time
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.core.latency import LatencyHistogram
+
+
+class MicroBatcher:
+    """
+    Queue items for up to max_wait_ms or max_batch_size items, then run them
+    through process_batch as a single call and resolve each caller's future
+
+    process_batch is blocking (e.g. a transformers pipeline) and runs on a
+    single worker thread, so batches execute one at a time instead of
+    competing for the same CPU cores.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        name: str = "batcher",
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Batches in flight - the loop only holds tasks weakly
+        self._tasks: Set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+        self.batch_sizes: Counter = Counter()
+        self.queue_wait = LatencyHistogram()
+        self.batch_latency = LatencyHistogram()
+        self.items = 0
+        self.failed_batches = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Add an item to the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.monotonic()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush, loop)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if batch:
+            task = loop.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # Leftovers start a new wait window
+        if self._pending:
+            self._timer = loop.call_later(self.max_wait, self._flush, loop)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        started = time.monotonic()
+        for _, _, queued_at in batch:
+            self.queue_wait.record(started - queued_at)
+        self.batch_sizes[len(batch)] += 1
+        self.items += len(batch)
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.process_batch, items
+            )
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name} returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            self.failed_batches += 1
+            print(f"⚠️ {self.name} batch of {len(items)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batch_latency.record(time.monotonic() - started)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = sum(self.batch_sizes.values())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "batches": batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / batches, 2) if batches else None,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "queue_wait": self.queue_wait.snapshot(),
+            "batch_latency": self.batch_latency.snapshot(),
+            "failed_batches": self.failed_batches,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,218 @@
+# backend/src/core/model_residency.py
+"""
+Ollama model residency - startup warm-up, keep_alive pinning and LRU eviction
+"""
+
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set
+
+import aiohttp
+
+from src.config.app_config import Config
+from src.core.http_client import AsyncHTTPClient
+from src.core.latency import LatencyHistogram
+
+
+class ModelResidencyManager:
+    """
+    Keep the models we actually use loaded in Ollama
+
+    - warmup() loads a model with a one-token generation before real traffic
+    - touch() marks a model as used; beyond max_resident models the least
+      recently used one is unloaded (keep_alive=0)
+    - a background keeper re-pings resident models and reloads any that
+      Ollama dropped, so idle periods do not cause cold starts
+    - load_duration reported by Ollama feeds a cold-start latency metric;
+      streams cut short when the JSON closes never see it, so for those the
+      time to first token beyond the model's usual (median) is taken as load time
+
+    One manager per Ollama server is shared by every backend that uses it
+    (see shared_residency), so the LRU and the residency limit span all the
+    models loaded there and a single keeper loop pings them.
+    """
+
+    def __init__(self, http_client: AsyncHTTPClient, base_url: str):
+        config = Config()
+        self.http_client = http_client
+        self.base_url = base_url
+        self.keep_alive = config.OLLAMA_KEEP_ALIVE
+        self.max_resident = max(1, config.OLLAMA_MAX_RESIDENT_MODELS)
+        self.keeper_interval = config.OLLAMA_KEEPER_INTERVAL
+        self.warmup_timeout = config.OLLAMA_WARMUP_TIMEOUT
+        self.cold_start_threshold = config.COLD_START_THRESHOLD
+
+        # model -> last used timestamp, least recently used first
+        self.resident: "OrderedDict[str, float]" = OrderedDict()
+        self.cold_start_latency = LatencyHistogram()
+        # model -> time to first token of warm streamed generations
+        self.first_token_latency: Dict[str, LatencyHistogram] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Evictions started from touch(); the loop only holds tasks weakly
+        self._evictions: Set[asyncio.Task] = set()
+        # Backends that started the keeper; it stops when the last one stops
+        self._users = 0
+
+        self.warmups = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.cold_starts = 0
+        self.loaded_models: list = []
+
+    async def warmup(self, model: str) -> bool:
+        """Load a model with a tiny generation so the first real document is warm"""
+        started = time.monotonic()
+        try:
+            result = await self._generate(
+                model,
+                {"prompt": "OK", "options": {"num_predict": 1}, "keep_alive": self.keep_alive},
+                timeout=self.warmup_timeout,
+            )
+        except Exception as e:
+            print(f"⚠️ Warm-up of {model} failed: {e}")
+            return False
+
+        self.warmups += 1
+        self.observe(model, result)
+        self._mark_resident(model)
+        print(f"🔥 Model {model} warmed up in {time.monotonic() - started:.1f}s")
+        await self._enforce_limit()
+        return True
+
+    def touch(self, model: str) -> None:
+        """Record that a request is about to use this model"""
+        is_new = model not in self.resident
+        self._mark_resident(model)
+        if is_new and len(self.resident) > self.max_resident:
+            task = asyncio.create_task(self._enforce_limit())
+            self._evictions.add(task)
+            task.add_done_callback(self._eviction_done)
+
+    def _eviction_done(self, task: asyncio.Task) -> None:
+        self._evictions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"⚠️ Evicting least recently used models failed: {task.exception()}")
+
+    def observe(self, model: str, response: Dict[str, Any]) -> None:
+        """Record load time from an Ollama response (load_duration is in nanoseconds)"""
+        if "load_duration" in response:
+            load_seconds = response["load_duration"] / 1e9
+        elif "first_token_seconds" in response:
+            first_token = response["first_token_seconds"]
+            history = self.first_token_latency.setdefault(model, LatencyHistogram())
+            usual = history.quantile(0.5)
+            load_seconds = first_token - usual if usual is not None else 0.0
+            if load_seconds < self.cold_start_threshold:
+                history.record(first_token)
+        else:
+            return
+
+        if load_seconds >= self.cold_start_threshold:
+            self.cold_starts += 1
+            self.cold_start_latency.record(load_seconds)
+            print(f"🧊 Cold start for {model}: {load_seconds:.1f}s model load")
+
+    def _mark_resident(self, model: str) -> None:
+        self.resident[model] = time.time()
+        self.resident.move_to_end(model)
+
+    async def _enforce_limit(self) -> None:
+        """Unload least recently used models beyond the residency limit"""
+        while len(self.resident) > self.max_resident:
+            model, _ = self.resident.popitem(last=False)
+            try:
+                await self._generate(model, {"keep_alive": 0}, timeout=30)
+                self.evictions += 1
+                print(f"📤 Unloaded least recently used model {model}")
+            except Exception as e:
+                print(f"⚠️ Failed to unload {model}: {e}")
+
+    async def start(self) -> None:
+        self._users += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._keeper_loop())
+
+    async def stop(self) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _keeper_loop(self) -> None:
+        """Re-ping resident models and reload any that Ollama has unloaded"""
+        while True:
+            await asyncio.sleep(self.keeper_interval)
+            try:
+                self.loaded_models = await self._list_loaded()
+            except Exception as e:
+                print(f"⚠️ Residency check failed: {e}")
+                continue
+
+            for model in list(self.resident):
+                loaded = any(name.split(":")[0] == model.split(":")[0] for name in self.loaded_models)
+                try:
+                    if loaded:
+                        # Empty prompt refreshes keep_alive without generating
+                        await self._generate(model, {"keep_alive": self.keep_alive}, timeout=30)
+                    else:
+                        self.reloads += 1
+                        print(f"♻️ Model {model} was unloaded - reloading")
+                        await self.warmup(model)
+                except Exception as e:
+                    print(f"⚠️ Keep-alive for {model} failed: {e}")
+
+    async def _list_loaded(self) -> list:
+        session = self.http_client.get_session()
+        async with session.get(
+            f"{self.base_url}/api/ps",
+            timeout=aiohttp.ClientTimeout(total=5),
+        ) as response:
+            data = await response.json()
+            return [m.get("name", "") for m in data.get("models", [])]
+
+    async def _generate(self, model: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        session = self.http_client.get_session()
+        async with session.post(
+            f"{self.base_url}/api/generate",
+            json={"model": model, "stream": False, **payload},
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keep_alive": self.keep_alive,
+            "max_resident": self.max_resident,
+            "resident": list(self.resident),
+            "loaded_in_ollama": self.loaded_models,
+            "warmups": self.warmups,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+            "cold_starts": self.cold_starts,
+            "cold_start_latency": self.cold_start_latency.snapshot(),
+            "first_token_latency": {
+                model: histogram.snapshot() for model, histogram in self.first_token_latency.items()
+            },
+        }
+
+
+# base URL -> the residency manager shared by every backend on that server
+_managers: Dict[str, ModelResidencyManager] = {}
+
+
+def shared_residency(http_client: AsyncHTTPClient, base_url: str) -> ModelResidencyManager:
+    """The residency manager of an Ollama server (created on first use)"""
+    base_url = base_url.rstrip("/")
+    manager = _managers.get(base_url)
+    if manager is None:
+        manager = _managers[base_url] = ModelResidencyManager(http_client, base_url)
+    else:
+        # A new processor brings a new client session
+        manager.http_client = http_client
+    return manager
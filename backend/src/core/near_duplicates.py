@@ -0,0 +1,261 @@
+# backend/src/core/near_duplicates.py
+"""
+Near-duplicate document detection - MinHash signatures of OCR text with an LSH
+band index in memory (persisted as a snapshot) so re-scans of the same paper
+document reuse the earlier extraction
+"""
+
+import re
+import time
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.app_config import Config
+
+NUM_HASHES = 64
+BANDS = 16
+ROWS = NUM_HASHES // BANDS
+SHINGLE = 4
+# Bump when the signature changes - snapshots of another version are discarded
+SNAPSHOT_VERSION = 2
+
+_AMOUNT = re.compile(r"\d+[.,]\d{2}\b")
+_DATE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}[/.\-]\d{1,2}[/.\-]\d{2,4}\b"
+    r"|\b\d{1,2}\s+[a-z]{3,9}\.?\s+\d{4}\b|\b[a-z]{3,9}\.?\s+\d{1,2},?\s+\d{4}\b"
+)
+# Document numbers: a labelled value (invoice no, receipt #, ref: ...) or an INV-123 style token
+_IDENTIFIER = re.compile(
+    r"\b(?:invoice|inv|receipt|order|ref|reference|transaction|trans|txn|document|doc|account|acct|policy)"
+    r"\s*(?:no\.?|number|num|#|id)?\s*[:#]?\s*([a-z0-9][a-z0-9\-/]{2,})"
+    r"|\b(inv[\-/]?\d{2,}[a-z0-9\-]*)"
+)
+# Characters OCR engines commonly confuse map to one representative
+_OCR_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "i": "l", "|": "l", "5": "s", "8": "b"})
+
+_rng = np.random.default_rng(20240315)
+_HASH_A = _rng.integers(1, 2**63, size=NUM_HASHES, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.integers(0, 2**63, size=NUM_HASHES, dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2**63, size=ROWS, dtype=np.uint64) | np.uint64(1)
+
+
+class DocumentSignature:
+    """
+    MinHash of the text's character shingles plus an exact key of its amounts,
+    dates and document numbers
+
+    Shingles are taken after lower-casing, dropping spacing/punctuation and
+    folding OCR-confusable characters, so a re-scan changes only the few
+    shingles around each misread character. The exact key makes documents
+    that share a layout but not their data distinct: two receipts from the
+    same store with different totals, or two monthly invoices with the same
+    amount but different invoice numbers and dates.
+    """
+
+    def __init__(self, text: str):
+        normalized = unicodedata.normalize("NFKC", text).lower()
+        compact = re.sub(r"[\W_]+", "", normalized).translate(_OCR_CONFUSIONS)
+        shingles = {compact[i:i + SHINGLE] for i in range(max(len(compact) - SHINGLE + 1, 1))}
+
+        digests = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in sorted(shingles))
+        hashes = np.frombuffer(digests, dtype=np.uint64)
+        # Universal hashing mod 2^64 (uint64 arithmetic wraps) - one permutation per column
+        minhash = (hashes[:, None] * _HASH_A + _HASH_B).min(axis=0)
+
+        self.band_keys = [int((minhash[b * ROWS:(b + 1) * ROWS] * _BAND_MIX).sum()) for b in range(BANDS)]
+        # One byte per hash is enough to estimate similarity (b-bit MinHash)
+        self.sketch = (minhash >> np.uint64(56)).astype(np.uint8)
+
+        amounts = sorted(set(a.replace(",", ".") for a in _AMOUNT.findall(normalized)))
+        dates = sorted(set(re.sub(r"\s+", " ", d) for d in _DATE.findall(normalized)))
+        identifiers = sorted(set(
+            value for groups in _IDENTIFIER.findall(normalized)
+            for value in groups if value and any(c.isdigit() for c in value)
+        ))
+        exact = "|".join(amounts) + "#" + "|".join(dates) + "#" + "|".join(identifiers)
+        self.exact_key = int.from_bytes(hashlib.blake2b(exact.encode(), digest_size=8).digest(), "little")
+
+
+def estimate_similarity(matches: np.ndarray) -> np.ndarray:
+    """Jaccard estimate from the share of equal 8-bit MinHash values (corrected for chance collisions)"""
+    share = matches / NUM_HASHES
+    return np.clip((share - 1 / 256) / (1 - 1 / 256), 0.0, 1.0)
+
+
+class NearDuplicateIndex:
+    """
+    Find a recent document whose text is at least min_similarity (Jaccard) alike
+
+    LSH: the 64 MinHash values form 16 bands of 4; documents sharing any band
+    are candidates (near-certain above ~0.8 similarity, rare below ~0.3), and
+    candidates with the same exact key (amounts, dates, document numbers) are
+    verified against their stored 8-bit sketches in one numpy comparison. A lookup is 16 dict probes plus a small vector compare, even
+    at millions of entries. Entries live in a fixed-size ring (oldest evicted
+    first) and are snapshotted to disk with numpy so a restart keeps the index.
+    """
+
+    def __init__(
+        self,
+        min_similarity: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        config = Config()
+        self.min_similarity = min_similarity if min_similarity is not None else config.NEAR_DUP_MIN_SIMILARITY
+        self.max_entries = max_entries if max_entries is not None else config.NEAR_DUP_MAX_ENTRIES
+        self.snapshot_path = Path(snapshot_path or config.NEAR_DUP_SNAPSHOT_PATH)
+        self.snapshot_every = config.NEAR_DUP_SNAPSHOT_EVERY
+
+        # Column storage, grown in blocks up to max_entries
+        self._capacity = 0
+        self._size = 0
+        self._next = 0
+        self._sketches = np.zeros((0, NUM_HASHES), dtype=np.uint8)
+        self._band_keys = np.zeros((0, BANDS), dtype=np.uint64)
+        self._exact = np.zeros(0, dtype=np.uint64)
+        self._added_at = np.zeros(0, dtype=np.float64)
+        self._keys: List[str] = []
+
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+        self.adds = 0
+        self._unsaved = 0
+        self._lookup_seconds = 0.0
+
+        self.load()
+
+    def find(self, signature: DocumentSignature) -> Optional[Tuple[str, float]]:
+        """(result key, estimated similarity) of the most similar entry above the threshold, else None"""
+        started = time.perf_counter()
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(signature.band_keys):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best = None
+            if candidates:
+                slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                slots = slots[self._exact[slots] == np.uint64(signature.exact_key)]
+                if len(slots):
+                    matches = (self._sketches[slots] == signature.sketch).sum(axis=1)
+                    similarity = estimate_similarity(matches)
+                    index = int(similarity.argmax())
+                    if similarity[index] >= self.min_similarity:
+                        best = (self._keys[slots[index]], round(float(similarity[index]), 3))
+
+            self.lookups += 1
+            if best is not None:
+                self.hits += 1
+            self._lookup_seconds += time.perf_counter() - started
+            return best
+
+    def add(self, signature: DocumentSignature, key: str, added_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._insert(signature.sketch, np.array(signature.band_keys, dtype=np.uint64),
+                         signature.exact_key, key, added_at or time.time())
+            self.adds += 1
+            self._unsaved += 1
+
+    def _insert(self, sketch: np.ndarray, band_keys: np.ndarray, exact_key: int, key: str, added_at: float) -> None:
+        if self._size < self.max_entries:
+            if self._size == self._capacity:
+                self._grow()
+            slot = self._size
+            self._size += 1
+            self._keys.append(key)
+        else:
+            # Ring is full - overwrite the oldest entry
+            slot = self._next
+            self._next = (slot + 1) % self.max_entries
+            for band, old_key in enumerate(self._band_keys[slot].tolist()):
+                bucket = self._buckets[band].get(old_key)
+                if bucket is not None:
+                    bucket.remove(slot)
+                    if not bucket:
+                        del self._buckets[band][old_key]
+            self._keys[slot] = key
+
+        self._sketches[slot] = sketch
+        self._band_keys[slot] = band_keys
+        self._exact[slot] = exact_key
+        self._added_at[slot] = added_at
+        for band, band_key in enumerate(band_keys.tolist()):
+            self._buckets[band].setdefault(band_key, []).append(slot)
+
+    def _grow(self) -> None:
+        capacity = min(max(1024, self._capacity * 2), self.max_entries)
+        extra = capacity - self._capacity
+        self._sketches = np.vstack([self._sketches, np.zeros((extra, NUM_HASHES), dtype=np.uint8)])
+        self._band_keys = np.vstack([self._band_keys, np.zeros((extra, BANDS), dtype=np.uint64)])
+        self._exact = np.concatenate([self._exact, np.zeros(extra, dtype=np.uint64)])
+        self._added_at = np.concatenate([self._added_at, np.zeros(extra, dtype=np.float64)])
+        self._capacity = capacity
+
+    def should_snapshot(self) -> bool:
+        return self._unsaved >= self.snapshot_every
+
+    def save(self) -> None:
+        """Write the index to the snapshot file (oldest entry first)"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            order = np.r_[self._next:self._size, 0:self._next]
+            columns = {
+                "version": np.array(SNAPSHOT_VERSION),
+                "sketches": self._sketches[order],
+                "band_keys": self._band_keys[order],
+                "exact_keys": self._exact[order],
+                "added_at": self._added_at[order],
+                "keys": np.array([self._keys[i] for i in order], dtype="S32"),
+            }
+            self._unsaved = 0
+
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.snapshot_path.with_name(self.snapshot_path.stem + ".tmp.npz")
+            np.savez(temp_path, **columns)
+            temp_path.replace(self.snapshot_path)
+            print(f"💾 Near-duplicate index saved ({len(order)} entries)")
+        except OSError as e:
+            print(f"⚠️ Could not save near-duplicate index: {e}")
+
+    def load(self) -> None:
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with np.load(self.snapshot_path) as snapshot:
+                version = int(snapshot["version"]) if "version" in snapshot.files else 1
+                if version != SNAPSHOT_VERSION:
+                    print(f"⚠️ Near-duplicate snapshot is version {version}, expected {SNAPSHOT_VERSION} - starting empty")
+                    return
+                sketches, band_keys = snapshot["sketches"], snapshot["band_keys"]
+                exact, added_at, keys = snapshot["exact_keys"], snapshot["added_at"], snapshot["keys"]
+                if sketches.shape[1:] != (NUM_HASHES,) or band_keys.shape[1:] != (BANDS,):
+                    print("⚠️ Near-duplicate snapshot has a different layout - starting empty")
+                    return
+                with self._lock:
+                    for i in range(len(keys)):
+                        self._insert(sketches[i], band_keys[i], int(exact[i]), keys[i].decode("ascii"), float(added_at[i]))
+            print(f"✅ Near-duplicate index loaded ({self._size} entries)")
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Could not load near-duplicate index: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": self._size,
+                "min_similarity": self.min_similarity,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "mean_lookup_us": round(self._lookup_seconds / self.lookups * 1e6, 1) if self.lookups else None,
+                "unsaved": self._unsaved,
+            }
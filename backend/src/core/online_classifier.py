@@ -0,0 +1,243 @@
+# backend/src/core/online_classifier.py
+"""
+Online document classifier - a hashing-vectorized linear model updated
+incrementally from human-review corrections
+"""
+
+import copy
+import json
+import hashlib
+import time
+import asyncio
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from src.config.app_config import Config
+
+
+class OnlineClassifier:
+    """
+    HashingVectorizer + SGDClassifier (logistic loss) trained with partial_fit
+
+    The vectorizer is stateless, so a correction is learned without refitting
+    a vocabulary. Corrections are queued by feedback() and learned by a
+    background task in batches: a copy of the model is trained in a worker
+    thread and swapped in, so classification never waits for training.
+
+    Feedback is any human-reviewed label - a correction or a confirmation of
+    the predicted type. A fixed share of it (chosen by a hash of the text, so
+    a resubmitted document stays on the same side) is held out: never
+    learned, only used to compare the online model with the registry model.
+    Reviewed documents are mostly ones the registry got wrong, so the
+    registry's accuracy there is low by construction; the online model
+    therefore has to beat it by a margin and also reach an absolute accuracy
+    floor on at least min_feedback held-out documents before it classifies.
+    It is checkpointed every checkpoint_every updates and on shutdown, and
+    all feedback is appended to a JSON lines corpus for offline retraining.
+    """
+
+    def __init__(self, classes: List[str], seed_texts: List[str], seed_labels: List[str],
+                 directory: Optional[str] = None):
+        config = Config()
+        self.directory = Path(directory or config.CLASSIFIER_REGISTRY_DIR)
+        self.checkpoint_path = self.directory / "online.joblib"
+        self.feedback_path = self.directory / "feedback.jsonl"
+        self.min_feedback = config.ONLINE_CLASSIFIER_MIN_FEEDBACK
+        self.holdout_share = config.ONLINE_CLASSIFIER_HOLDOUT
+        self.margin = config.ONLINE_CLASSIFIER_MARGIN
+        self.min_accuracy = config.ONLINE_CLASSIFIER_MIN_ACCURACY
+        self.checkpoint_every = config.ONLINE_CLASSIFIER_CHECKPOINT_EVERY
+        self.batch_size = config.ONLINE_CLASSIFIER_BATCH_SIZE
+
+        self.classes = sorted(set(classes))
+        self.vectorizer = HashingVectorizer(
+            n_features=2 ** 18, alternate_sign=False, ngram_range=(1, 2), stop_words="english"
+        )
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=config.ONLINE_CLASSIFIER_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+
+        # Held-out feedback: (text, label, registry label), most recent kept
+        self._holdout: deque = deque(maxlen=1000)
+        self.online_accuracy: Optional[float] = None
+        self.registry_accuracy: Optional[float] = None
+        self.updates = 0
+        self.feedback_received = 0
+        self.confirmations = 0
+        self.dropped = 0
+        self._since_checkpoint = 0
+
+        if not self._load():
+            model = SGDClassifier(loss="log_loss", alpha=1e-4, random_state=0)
+            features = self.vectorizer.transform(seed_texts)
+            for _ in range(5):
+                model.partial_fit(features, seed_labels, classes=self.classes)
+            self.model = model
+            print(f"✅ Online classifier bootstrapped on {len(seed_texts)} seed samples")
+
+    # Inference
+
+    def serving(self) -> bool:
+        """Whether the online model has earned replacing the registry model"""
+        if len(self._holdout) < self.min_feedback or self.online_accuracy is None:
+            return False
+        return (self.online_accuracy >= self.min_accuracy
+                and self.online_accuracy >= self.registry_accuracy + self.margin)
+
+    def predict_proba(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(probabilities, classes) from the current model"""
+        model = self.model
+        return model.predict_proba(self.vectorizer.transform(texts)), model.classes_
+
+    @property
+    def version(self) -> str:
+        return f"online-{self.updates}"
+
+    # Learning
+
+    def feedback(self, text: str, label: str, registry_label: Optional[str]) -> Dict[str, Any]:
+        """Queue a reviewed label - correction or confirmation (label outside the known classes is rejected)"""
+        if label not in self.classes:
+            return {"error": f"Unknown label '{label}' (expected one of {self.classes})"}
+        try:
+            self._queue.put_nowait((text, label, registry_label))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return {"error": "Feedback queue is full, retry later", "retryable": True}
+        self.feedback_received += 1
+        if registry_label == label:
+            self.confirmations += 1
+        return {"accepted": True, "queued": self._queue.qsize()}
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._learn_loop())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Learn whatever is still queued before the final checkpoint
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await asyncio.to_thread(self._learn, batch)
+        if self._since_checkpoint:
+            await asyncio.to_thread(self.checkpoint)
+
+    async def _learn_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._learn, batch)
+                if self._since_checkpoint >= self.checkpoint_every:
+                    await asyncio.to_thread(self.checkpoint)
+            except Exception as e:
+                print(f"⚠️ Online classifier update failed: {e}")
+
+    def _is_holdout(self, text: str) -> bool:
+        digest = hashlib.sha1(text.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 < self.holdout_share
+
+    def _learn(self, batch: List[Tuple[str, str, Optional[str]]]) -> None:
+        train = [item for item in batch if not self._is_holdout(item[0])]
+        self._holdout.extend(item for item in batch if self._is_holdout(item[0]))
+
+        if train:
+            model = copy.deepcopy(self.model)
+            model.partial_fit(self.vectorizer.transform([text for text, _, _ in train]),
+                              [label for _, label, _ in train])
+            self.model = model
+            self.updates += len(train)
+            self._since_checkpoint += len(train)
+
+        self._evaluate()
+        self._append_feedback(batch)
+
+    def _evaluate(self) -> None:
+        """Accuracy of both models on the held-out feedback"""
+        if not self._holdout:
+            return
+        holdout = list(self._holdout)
+        predicted = self.model.predict(self.vectorizer.transform([text for text, _, _ in holdout]))
+        self.online_accuracy = float(np.mean([guess == label for guess, (_, label, _) in zip(predicted, holdout)]))
+        self.registry_accuracy = float(np.mean([registry == label for _, label, registry in holdout]))
+
+    def _append_feedback(self, batch: List[Tuple[str, str, Optional[str]]]) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.feedback_path, "a", encoding="utf-8") as file:
+                for text, label, registry_label in batch:
+                    file.write(json.dumps({
+                        "text": text, "label": label, "registry_label": registry_label,
+                        "holdout": self._is_holdout(text), "at": time.time(),
+                    }) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not record classifier feedback: {e}")
+
+    # Persistence
+
+    def checkpoint(self) -> None:
+        state = {
+            "model": self.model,
+            "classes": self.classes,
+            "updates": self.updates,
+            "holdout": list(self._holdout),
+            "saved_at": time.time(),
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path = self.checkpoint_path.with_suffix(".tmp")
+            joblib.dump(state, temp_path)
+            temp_path.replace(self.checkpoint_path)
+            self._since_checkpoint = 0
+            print(f"💾 Online classifier checkpoint ({self.updates} updates)")
+        except OSError as e:
+            print(f"⚠️ Could not checkpoint online classifier: {e}")
+
+    def _load(self) -> bool:
+        if not self.checkpoint_path.exists():
+            return False
+        try:
+            state = joblib.load(self.checkpoint_path)
+        except (OSError, ValueError, EOFError) as e:
+            print(f"⚠️ Could not load online classifier checkpoint: {e}")
+            return False
+        if sorted(state.get("classes", [])) != self.classes:
+            print("⚠️ Online classifier checkpoint has different classes - starting over")
+            return False
+        self.model = state["model"]
+        self.updates = state.get("updates", 0)
+        self._holdout.extend(tuple(item) for item in state.get("holdout", []))
+        self._evaluate()
+        print(f"✅ Online classifier loaded ({self.updates} updates)")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "serving": self.serving(),
+            "updates": self.updates,
+            "feedback_received": self.feedback_received,
+            "confirmations": self.confirmations,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "holdout_size": len(self._holdout),
+            "min_feedback": self.min_feedback,
+            "online_accuracy": round(self.online_accuracy, 3) if self.online_accuracy is not None else None,
+            "registry_accuracy": round(self.registry_accuracy, 3) if self.registry_accuracy is not None else None,
+            "margin": self.margin,
+            "min_accuracy": self.min_accuracy,
+        }
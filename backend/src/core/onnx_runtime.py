@@ -0,0 +1,78 @@
+# backend/src/core/onnx_runtime.py
+"""
+Int8-quantized ONNX Runtime text generation for the Hugging Face extraction model
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+# ONNX Runtime is optional - install with `pip install optimum[onnxruntime]`
+try:
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+QUANTIZED_FILE = "model_quantized.onnx"
+
+# Dynamic int8 quantization presets per CPU instruction set
+_QUANTIZATION_PRESETS = {
+    "avx2": lambda: AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+    "avx512": lambda: AutoQuantizationConfig.avx512(is_static=False, per_channel=False),
+    "avx512_vnni": lambda: AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+    "arm64": lambda: AutoQuantizationConfig.arm64(is_static=False, per_channel=False),
+}
+
+
+def quantized_model_dir(model_name: str, base_dir: str) -> Path:
+    """Where the exported and quantized graph for a model is kept"""
+    return Path(base_dir) / model_name.replace("/", "--")
+
+
+def export_quantized_model(model_name: str, base_dir: str, quantization: str = "avx2") -> Path:
+    """
+    Export a transformers causal LM to ONNX and quantize it to int8 (once)
+
+    Returns the directory holding the quantized graph and tokenizer files.
+    """
+    if not ONNX_AVAILABLE:
+        raise RuntimeError("optimum[onnxruntime] is not installed")
+    if quantization not in _QUANTIZATION_PRESETS:
+        raise ValueError(f"Unknown ONNX quantization preset: {quantization}")
+
+    target = quantized_model_dir(model_name, base_dir)
+    if (target / QUANTIZED_FILE).exists():
+        return target
+
+    started = time.monotonic()
+    print(f"📦 Exporting {model_name} to ONNX (first run only)...")
+    model = ORTModelForCausalLM.from_pretrained(model_name, export=True, use_cache=True)
+    model.save_pretrained(target)
+
+    from transformers import AutoTokenizer
+
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(target)
+
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(save_dir=target, quantization_config=_QUANTIZATION_PRESETS[quantization]())
+    print(f"✅ Quantized ONNX model saved to {target} in {time.monotonic() - started:.1f}s")
+    return target
+
+
+def load_quantized_pipeline(model_name: str, base_dir: str, quantization: str = "avx2", **generation_kwargs: Any):
+    """A transformers text-generation pipeline backed by the int8 ONNX graph"""
+    from transformers import AutoTokenizer, pipeline
+
+    target = export_quantized_model(model_name, base_dir, quantization)
+    model = ORTModelForCausalLM.from_pretrained(target, file_name=QUANTIZED_FILE, use_cache=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(target)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+
+    return pipeline("text-generation", model=model, tokenizer=tokenizer, **generation_kwargs)
+
@@ -6,167 +6,169 @@ Combines OCR + Traditional ML + Local AI for document understanding
 
 import json
 import time
-import requests
-from typing import Dict, Any, Tuple
+import hashlib
+import asyncio
+from typing import Dict, Any, List, Tuple, Optional
 from enum import Enum
 
 from src.core.prompt_loader import PromptLoader
+from src.core.http_client import AsyncHTTPClient
+from src.core.result_cache import ExtractionCache
+from src.core.scheduler import ExtractionScheduler
+from src.exceptions.document_exceptions import ExtractionQueueFullError
+from src.core.request_context import current_client_id
+from src.core.latency import LatencyTracker, AdaptiveTimeoutPolicy, RetryBudget
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+from src.core.structured_output import SchemaValidator
+from src.core.cascade import CascadeRouter
+from src.core.field_recovery import FieldRecovery
+from src.core.rules_engine import RulesEngine, RULES_TIER
+from src.core.near_duplicates import NearDuplicateIndex, DocumentSignature
+from src.core.vendor_templates import VendorTemplates, TEMPLATE_TIER
+from src.core.classifier_registry import ClassifierService
+from src.core.backends import ExtractionBackend, BackendContext, BackendRegistry
 from src.config.app_config import Config
 from ..models.document_model import DocumentType, ConfidenceLevel, ExtractionMethod
 
-# Traditional ML
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
-
-# Keep LangChain as optional fallback
-try:
-    from langchain.llms import OpenAI
-    from langchain.prompts import PromptTemplate
-    from langchain.chains import LLMChain
-
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
 
 class Processor:
     """Main Document AI processor combining traditional ML + Local AI"""
 
-    def __init__(self):
+    def __init__(self, http_client: Optional[AsyncHTTPClient] = None):
         self.config = Config()
 
+        # Shared pooled HTTP client (owned by the service manager when provided)
+        self.http_client = http_client or AsyncHTTPClient()
+
         # Initialize prompt loader
         self.prompt_loader = PromptLoader("prompts.yaml")
         print(f"✅ Loaded prompts for document types: {self.prompt_loader.get_available_document_types()}")
         
 
-        # Initialize traditional ML classifier
-        self.classifier = self._setup_classifier()
+        # Traditional ML classifier - the promoted version from the artifact registry
+        self.classifier = ClassifierService()
 
-        # Try to initialize AI extractors in order of preference
-        self.extraction_method = "none"
+        # Content-addressed cache in front of the LLM extraction
+        self.cache = ExtractionCache()
 
-        # 1. Try Ollama first
-        if self._init_ollama():
-            self.extraction_method = "ollama"
-            print("🦙 Using Ollama for extraction")
+        # Re-scans of recent documents reuse their result (payloads live in the cache)
+        self.near_duplicates = (
+            NearDuplicateIndex() if self.config.NEAR_DUP_ENABLED and self.cache.enabled else None
+        )
 
-        # 2. Try Hugging Face if Ollama fails
-        elif self._init_huggingface():
-            self.extraction_method = "huggingface"
-            print("🤗 Using Hugging Face for extraction")
+        # Bounded, fair admission control per backend
+        self.scheduler = ExtractionScheduler()
 
-        # 3. Try OpenAI if both fail
-        elif self._init_openai():
-            self.extraction_method = "openai"
-            print("🤖 Using OpenAI for extraction")
+        # Latency-driven timeouts and a global retry budget
+        self.latency_tracker = LatencyTracker()
+        self.timeout_policy = AdaptiveTimeoutPolicy(self.latency_tracker)
+        self.retry_budget = RetryBudget()
 
-        else:
-            raise RuntimeError("❌ No AI extraction method available!")
+        # Compiled per-document-type output schemas
+        self.schema_validator = SchemaValidator()
 
-        print("✅ Document AI processor initialized")
+        # Deterministic tier that answers regular documents before any LLM
+        self.rules_engine = (
+            RulesEngine(self.prompt_loader, self.schema_validator) if self.config.RULES_ENGINE else None
+        )
 
-    def _init_ollama(self) -> bool:
-        """Try to initialize Ollama"""
-        try:
-            self.ollama_url = getattr(
-                self.config, "OLLAMA_URL", "http://localhost:11434"
-            )
-            self.ollama_model = getattr(self.config, "OLLAMA_MODEL", "llama2")
+        # Per-vendor layouts learned from confirmed LLM results
+        self.vendor_templates = (
+            VendorTemplates(self.prompt_loader, self.schema_validator) if self.config.VENDOR_TEMPLATES else None
+        )
 
-            # Test connection
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+        # Targeted second pass for fields the extraction left empty or invalid
+        self.field_recovery = (
+            FieldRecovery(self.prompt_loader, self.schema_validator) if self.config.FIELD_RECOVERY else None
+        )
 
-    def _init_huggingface(self) -> bool:
-        """Try to initialize Hugging Face"""
-        try:
-            from transformers import pipeline
-
-            self.hf_generator = pipeline(
-                "text-generation",
-                model=getattr(self.config, "HF_MODEL", "microsoft/DialoGPT-small"),
-                max_length=256,
-                do_sample=True,
-                temperature=0.7,
-                pad_token_id=50256,
-            )
-            return True
-        except:
-            return False
+        # Shared services handed to every extraction backend
+        self.backend_context = BackendContext(
+            self.http_client,
+            self.prompt_loader,
+            self.schema_validator,
+            self.latency_tracker,
+            self.timeout_policy,
+            self.retry_budget,
+        )
 
-    def _init_openai(self) -> bool:
-        """Try to initialize OpenAI (your original code)"""
-        try:
-            if (
-                LANGCHAIN_AVAILABLE
-                and hasattr(self.config, "OPENAI_API_KEY")
-                and self.config.OPENAI_API_KEY
-            ):
-                self.llm = OpenAI(
-                    openai_api_key=self.config.OPENAI_API_KEY,
-                    model_name=self.config.MODEL_NAME,
-                    temperature=0.0,
-                )
-                return True
-        except:
-            pass
-        return False
-
-    def _setup_classifier(self) -> Pipeline:
-        """Setup traditional ML classifier"""
-
-        # Enhanced training data with receipts
-        training_texts = [
-            # Invoices
-            "Invoice Number INV-001 Total Amount $1500 Due Date 2024-01-15",
-            "INVOICE Company ABC Total: $2300 Date: Jan 15 2024",
-            "Bill Invoice #12345 Amount Due: $890 Payment Terms: Net 30",
-            
-            # Contracts  
-            "This Agreement between Party A and Party B effective January 1 2024",
-            "CONTRACT for services Term: 12 months Payment: Monthly",
-            "Service Agreement Party obligations Terms and conditions",
-            
-            # Forms
-            "Application Form Name: John Doe Address: 123 Main St Phone: 555-0123",
-            "Registration Form Personal Information Company Department",
-            "FORM Submit application Date of birth Emergency contact",
-            
-            # Receipts
-            "Receipt Boots UK Total £2.50 Card Payment Thank you for shopping",
-            "RECEIPT Tesco Store 1234 Total: $15.67 Cash Paid",
-            "Thank you for your purchase Receipt Total Amount £25.00 Change £5.00",
-        ]
+        # Initialize every backend in the failover chain (backends.yaml or FAILOVER_CHAIN);
+        # each gets a circuit breaker and requests fail over at runtime
+        self.extraction_method = "none"
+        self.backend_chain = []
+        self.backends: Dict[str, ExtractionBackend] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._health_task: Optional[asyncio.Task] = None
+
+        registry = BackendRegistry(self.backend_context)
+
+        # Small-to-large model cascade in front of the failover chain (optional)
+        self.cascade = CascadeRouter.from_config(registry.cascade_spec)
+        cascade_only = [t for t in self.cascade.tiers if t not in registry.chain] if self.cascade else []
+
+        for backend in registry.build(registry.chain + cascade_only):
+            healthy = backend.setup()
+
+            # A remote server may come back later - keep it in the chain
+            # with an open circuit so the health probes can close it again
+            if not healthy and not backend.remote_server:
+                continue
+
+            breaker = CircuitBreaker(backend.name)
+            if not healthy:
+                breaker.trip("startup probe failed")
+            self.backends[backend.name] = backend
+            self.breakers[backend.name] = breaker
+
+            # Cascade tiers outside the failover chain are only used by the cascade
+            if backend.name in cascade_only:
+                print(f"{backend.label} available as a cascade tier")
+                continue
+            self.backend_chain.append(backend.name)
+
+            if healthy and self.extraction_method == "none":
+                self.extraction_method = backend.name
+                print(f"{backend.label} is the primary extraction method")
+            elif healthy:
+                print(f"{backend.label} available for failover")
+
+        if self.extraction_method == "none":
+            raise RuntimeError("❌ No AI extraction method available!")
 
-        training_labels = [
-            "invoice", "invoice", "invoice",     # Invoices
-            "contract", "contract", "contract",  # Contracts  
-            "form", "form", "form",             # Forms
-            "receipt", "receipt", "receipt",     # Receipts
-        ]
+        if self.cascade is not None:
+            missing = [t for t in self.cascade.tiers if t not in self.backends]
+            if missing:
+                print(f"⚠️ Cascade disabled - tiers unavailable: {missing}")
+                self.cascade = None
+            else:
+                print(f"🪜 Model cascade: {' → '.join(self.cascade.tiers)} (threshold {self.cascade.threshold})")
 
-        # Create and train classifier
-        classifier = Pipeline(
-            [
-                ("tfidf", TfidfVectorizer(max_features=1000, stop_words="english")),
-                ("nb", MultinomialNB()),
-            ]
-        )
+        print("✅ Document AI processor initialized")
 
-        classifier.fit(training_texts, training_labels)
-        print("✅ Traditional ML classifier trained")
+    def process_document(self, text: str) -> Dict[str, Any]:
+        """
+        Synchronous entry point - thin wrapper around aprocess_document
 
-        return classifier
+        Only for callers without a running event loop (scripts, CLI).
+        Async handlers must await aprocess_document instead.
+        """
 
-    def process_document(self, text: str) -> Dict[str, Any]:
+        async def _run() -> Dict[str, Any]:
+            try:
+                return await self.aprocess_document(text)
+            finally:
+                # The pooled session is bound to this temporary loop
+                await self.http_client.close_current()
+
+        return asyncio.run(_run())
+
+    async def aprocess_document(self, text: str, classification: Optional[Tuple[str, float]] = None) -> Dict[str, Any]:
         """
         Main processing pipeline
 
         Args:
             text: Document text (from OCR)
+            classification: (doc_type, confidence) already computed by classify_many
 
         Returns:
             Complete processing results
@@ -176,21 +178,40 @@ class Processor:
         print(f"\n🔄 Processing document...")
         print(f"📄 Text preview: {text[:100]}...")
 
+        # Step 0: Near-duplicate of a recently processed document (e.g. a re-scan)
+        signature = None
+        if self.near_duplicates is not None and len(text.strip()) >= self.config.NEAR_DUP_MIN_CHARS:
+            signature = DocumentSignature(text)
+            reused = await self._reuse_near_duplicate(signature, text, start_time)
+            if reused is not None:
+                return reused
+
         # Step 1: Traditional ML Classification
-        doc_type, ml_confidence = self._classify_document(text)
+        doc_type, ml_confidence = classification or self._classify_document(text)
         print(f"📊 Classification: {doc_type} (confidence: {ml_confidence:.2f})")
 
-        # Step 2: AI Extraction (updated to use different methods)
-        if self.extraction_method == "ollama":
-            extracted_data = self._extract_with_ollama(text, doc_type)
-        elif self.extraction_method == "huggingface":
-            extracted_data = self._extract_with_huggingface(text, doc_type)
-        elif self.extraction_method == "openai":
-            extracted_data = self._extract_with_gpt4(text, doc_type)
-        else:
-            extracted_data = {"error": "No extraction method available"}
-
-        print(f"🤖 {self.extraction_method.title()} extraction completed")
+        # Step 2: Extraction - a learned vendor template, the rules tier, then the model
+        # cascade (if configured), then runtime failover across healthy backends
+        outcome = None
+        vendor = None
+        if self.vendor_templates is not None:
+            vendor = self.vendor_templates.match(text, doc_type)
+            if vendor is not None and vendor.data is not None and not vendor.shadow:
+                print(f"🏷️ Vendor template v{vendor.version} answered {doc_type}")
+                outcome = (vendor.data, TEMPLATE_TIER, False)
+        if outcome is None and self.rules_engine is not None:
+            rules = self.rules_engine.extract(text, doc_type)
+            if rules is not None and rules.complete:
+                outcome = (rules.data, RULES_TIER, False)
+            elif rules is not None and self.field_recovery is not None:
+                outcome = await self._acomplete_rules(text, doc_type, rules.data)
+        if outcome is None and self.cascade is not None:
+            outcome = await self._aextract_with_cascade(text, doc_type, ml_confidence)
+        if outcome is None:
+            outcome = await self._aextract_with_failover(text, doc_type)
+        extracted_data, method, cache_hit = outcome
+        # Post-processing rewrites list fields in place; templates learn from the model's shape
+        model_data = dict(extracted_data)
 
         # Step 2.5: Post-process extracted data
         extracted_data = self._post_process_extracted_data(extracted_data)
@@ -205,7 +226,7 @@ class Processor:
         processing_time = time.time() - start_time
 
         # Get the actual model name being used
-        model_display_name = self._get_model_display_name()
+        model_display_name = self._get_model_display_name(method)
         
         result = {
             "document_type": doc_type,
@@ -215,191 +236,282 @@ class Processor:
             "needs_human_review": needs_review,
             "extracted_data": extracted_data,
             "processing_time": f"{processing_time:.2f}s",
-            "extraction_method": self.extraction_method,
+            "extraction_method": self.backends[method].kind if method in self.backends else method,
+            "extraction_backend": method,
             "model_display_name": model_display_name,
+            "cache_hit": cache_hit,
             "raw_text": text,
         }
 
+        # Confident, freshly extracted LLM results validate or teach the vendor's template
+        if (vendor is not None and method not in (TEMPLATE_TIER, RULES_TIER) and not cache_hit
+                and not needs_review and "error" not in model_data and "raw_response" not in model_data):
+            self.vendor_templates.observe(vendor, text, doc_type, model_data)
+
+        # Only confident results are offered to later near-duplicates
+        if signature is not None and not needs_review and "error" not in extracted_data:
+            await self._remember_near_duplicate(signature, text, result)
+
         print(f"✅ Processing completed in {processing_time:.2f}s")
         return result
 
-    def _classify_document(self, text: str) -> Tuple[str, float]:
-        """Traditional ML classification"""
+    async def _reuse_near_duplicate(
+        self, signature: DocumentSignature, text: str, start_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """The stored result of a near-duplicate document, marked as such (None when there is none)"""
+        match = self.near_duplicates.find(signature)
+        if match is None:
+            return None
+        key, similarity = match
+
+        prior = await self.cache.aget(f"near-dup:{key}")
+        if prior is None:
+            return None
+
+        # A result from another prompt, model or classifier version is stale
+        version = self._result_version(prior.get("document_type"), prior.get("extraction_backend"))
+        if prior.pop("result_version", None) != version:
+            print("♻️ Near-duplicate found, but its result predates the current prompts/models - re-extracting")
+            return None
 
-        # Get prediction and probabilities
-        prediction = self.classifier.predict([text])[0]
-        probabilities = self.classifier.predict_proba([text])[0]
-        confidence = max(probabilities)
+        processing_time = time.time() - start_time
+        print(f"♻️ Near-duplicate of a recent document (similarity {similarity:.2f}) - reusing its extraction")
+        return {
+            **prior,
+            "processing_time": f"{processing_time:.2f}s",
+            "cache_hit": True,
+            "near_duplicate": {"similarity": similarity},
+            "raw_text": text,
+        }
 
-        return prediction, confidence
+    async def _remember_near_duplicate(self, signature: DocumentSignature, text: str, result: Dict[str, Any]) -> None:
+        key = hashlib.sha256(ExtractionCache.normalize_text(text).encode("utf-8")).hexdigest()[:32]
+        stored = {k: v for k, v in result.items() if k not in ("raw_text", "processing_time", "cache_hit")}
+        stored["result_version"] = self._result_version(result["document_type"], result["extraction_backend"])
+        await self.cache.aput(f"near-dup:{key}", stored)
+        self.near_duplicates.add(signature, key)
+
+        if self.near_duplicates.should_snapshot():
+            await asyncio.to_thread(self.near_duplicates.save)
+
+    def _result_version(self, doc_type: Optional[str], method: Optional[str]) -> str:
+        """The cache key parts besides the text (prompt version, model) plus the classifier version"""
+        backend = self.backends.get(method)
+        prompt_method = backend.prompt_method if backend is not None else str(method)
+        parts = [
+            self.prompt_loader.get_prompt_version(str(doc_type), prompt_method),
+            str(method),
+            self._get_model_name(method),
+            "online" if self.classifier.online is not None and self.classifier.online.serving() else self.classifier.version,
+        ]
+        if method == RULES_TIER:
+            parts.append(json.dumps(self.prompt_loader.get_extraction_rules(str(doc_type)), sort_keys=True, default=str))
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
 
-    def _extract_with_ollama(self, text: str, doc_type: str) -> Dict[str, Any]:
-        """Extract using Ollama with centralized prompts"""
+    async def _aextract_with_failover(self, text: str, doc_type: str) -> Tuple[Dict[str, Any], str, bool]:
+        """
+        Try each backend in chain order, skipping open circuits
 
-        # Get formatted prompt from prompt loader
-        prompt = self.prompt_loader.format_prompt(doc_type, "ollama", text)
+        Returns:
+            (extracted_data, method used, served from cache)
+        """
+        extracted_data: Dict[str, Any] = {"error": "All extraction backends unavailable (circuits open)"}
+        used_method = self.extraction_method
+        saturated: Optional[ExtractionQueueFullError] = None
+        answered = False
 
-        # Progressive timeouts: 60s → 90s → 120s
-        timeouts = [60, 90, 120]
-        
-        for attempt, timeout in enumerate(timeouts, 1):
+        for method in self.backend_chain:
             try:
-                print(f"🦙 Ollama attempt {attempt}/3 with {timeout}s timeout")
-                
-                response = requests.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.ollama_model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.1,
-                            "top_p": 0.9,
-                            "num_predict": 1024,        # Max tokens to generate
-                            "num_ctx": 4096,            # Context window
-                            "repeat_penalty": 1.1,      # Reduce repetition
-                            "stop": ["\n\n\n"]          # Stop sequences
-                        },
-                    },
-                    timeout=timeout,
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    ollama_response = result.get("response", "")
-                    
-                    # Check if response is complete (not truncated)
-                    if len(ollama_response.strip()) > 20 and not ollama_response.strip().endswith(("Sure, here is", "Here is the")):
-                        print(f"✅ Ollama success on attempt {attempt}")
-                        return self._parse_json_response(ollama_response)
-                    else:
-                        print(f"⚠️ Incomplete response on attempt {attempt}")
-                        if attempt == 3:  # Last attempt, return what we got
-                            return self._parse_json_response(ollama_response)
-                else:
-                    print(f"❌ HTTP {response.status_code} on attempt {attempt}")
-                    if attempt == 3:  # Last attempt
-                        return {"error": f"Ollama API error: {response.status_code}"}
-
-            except requests.exceptions.Timeout:
-                print(f"⏳ Timeout after {timeout}s on attempt {attempt}")
-                if attempt == 3:  # Last attempt
-                    return {"error": f"Ollama timeout after all attempts (max: {timeout}s)"}
-            except Exception as e:
-                print(f"💥 Error on attempt {attempt}: {e}")
-                if attempt == 3:  # Last attempt
-                    return {"error": str(e), "raw_response": ""}
-        
-        # Fallback (should not reach here)
-        return {"error": "Max retries exceeded", "raw_response": ""}
-
-    def _extract_with_ollama1(self, text: str, doc_type: str) -> Dict[str, Any]:
-        """Extract using Ollama with centralized prompts"""
-
-        # Get formatted prompt from prompt loader
-        prompt = self.prompt_loader.format_prompt(doc_type, "ollama", text)
-
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.ollama_model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.1, "top_p": 0.9},
-                },
-                timeout=60,
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                return self._parse_json_response(result.get("response", ""))
-            else:
-                return {"error": f"Ollama API error: {response.status_code}"}
-
-        except Exception as e:
-            return {"error": str(e), "raw_response": ""}
-
-    def _extract_with_huggingface(self, text: str, doc_type: str) -> Dict[str, Any]:
-        """Extract using Hugging Face with centralized prompts"""
-
-        # Get formatted prompt from prompt loader
-        prompt = self.prompt_loader.format_prompt(doc_type, "huggingface", text)
-
-        try:
-            result = self.hf_generator(
-                prompt, max_length=200, num_return_sequences=1, truncation=True
-            )
-
-            response = result[0]["generated_text"]
-            return self._parse_json_response(response)
-
-        except Exception as e:
-            return {"error": str(e), "raw_response": ""}
-
-    def _extract_with_gpt4(self, text: str, doc_type: str) -> Dict[str, Any]:
-        """GPT-4 intelligent extraction using LangChain with centralized prompts"""
-
-        # Get prompt template from prompt loader
-        prompt_template_str = self.prompt_loader.get_prompt(doc_type, "openai")
-
-        # Create LangChain prompt and chain
-        prompt = PromptTemplate(template=prompt_template_str, input_variables=["text"])
-        chain = LLMChain(llm=self.llm, prompt=prompt)
+                outcome = await self._aextract_on_backend(method, text, doc_type)
+            except ExtractionQueueFullError as e:
+                # A saturated backend is skipped like an open circuit
+                print(f"↪️ {method.title()} queue full, failing over")
+                saturated = e
+                continue
+            if outcome is None:
+                continue
+            answered = True
+            extracted_data, cache_hit = outcome
+            used_method = method
+
+            if "error" in extracted_data:
+                print(f"↪️ {method.title()} extraction failed, failing over: {extracted_data['error']}")
+                continue
+
+            if not cache_hit:
+                self.extraction_method = method
+            return extracted_data, method, cache_hit
+
+        # Nothing could take the request - let the caller answer 429 with a retry hint
+        if saturated is not None and not answered:
+            raise saturated
+        return extracted_data, used_method, False
+
+    async def _aextract_with_cascade(
+        self, text: str, doc_type: str, ml_confidence: float
+    ) -> Optional[Tuple[Dict[str, Any], str, bool]]:
+        """
+        Try cascade tiers from small to large, escalating while the result scores
+        below the threshold (None when no tier produced a result)
+        """
+        plan = self.cascade.plan(doc_type, len(text), ml_confidence)
+        started = time.monotonic()
+        best: Optional[Tuple[float, Tuple[Dict[str, Any], str, bool]]] = None
 
-        try:
-            # Run extraction
-            response = chain.run(text=text)
+        for index, tier in enumerate(plan):
+            tier_start = time.monotonic()
+            try:
+                outcome = await self._aextract_on_backend(tier, text, doc_type)
+            except ExtractionQueueFullError:
+                outcome = None
+            if outcome is None:
+                self.cascade.record_skip(tier)
+                continue
+
+            extracted_data, cache_hit = outcome
+            if "error" in extracted_data:
+                self.cascade.record_error(tier)
+                continue
+
+            score = self._cascade_score(ml_confidence, extracted_data, doc_type)
+            accepted = score >= self.cascade.threshold or index == len(plan) - 1
+            self.cascade.record_attempt(tier, time.monotonic() - tier_start, accepted)
+
+            if accepted:
+                best = (score, (extracted_data, tier, cache_hit))
+                break
+            if best is None or score > best[0]:
+                best = (score, (extracted_data, tier, cache_hit))
+            print(f"⬆️ {tier} scored {score:.2f} < {self.cascade.threshold} - escalating")
+
+        if best is None:
+            return None
+
+        self.cascade.record_document(best[1][1], time.monotonic() - started)
+        return best[1]
+
+    def _cascade_score(self, ml_confidence: float, extracted_data: Dict[str, Any], doc_type: str) -> float:
+        """Completeness-based confidence, zero when the output does not match the declared schema"""
+        schema = self.prompt_loader.get_schema(doc_type) if self.config.STRUCTURED_OUTPUT else None
+        if "raw_response" in extracted_data:
+            return 0.0
+        if schema and not self.schema_validator.conforms(doc_type, schema, extracted_data):
+            return 0.0
+        return self._calculate_confidence(ml_confidence, extracted_data)
+
+    async def _acomplete_rules(
+        self, text: str, doc_type: str, partial: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, Any], str, bool]]:
+        """
+        Ask the first healthy backend for only the fields the rules did not find
+        (None when there are too many, or a required field is still missing)
+        """
+        missing = self.field_recovery.missing_fields(doc_type, partial)
+        if len(missing) > self.field_recovery.max_fields:
+            return None
 
-            # Parse JSON from response
-            return self._parse_json_response(response)
+        for method in self.backend_chain:
+            if not self.backends[method].capabilities().field_extraction:
+                continue
+            try:
+                outcome = await self._aextract_on_backend(method, text, doc_type, prefill=partial)
+            except ExtractionQueueFullError:
+                continue
+            if outcome is None:
+                continue
+
+            extracted_data, _ = outcome
+            still_missing = set(self.field_recovery.missing_fields(doc_type, extracted_data))
+            if "error" in extracted_data or still_missing & set(self.rules_engine.required_fields(doc_type)):
+                return None
+
+            self.rules_engine.record_completed()
+            print(f"📐 Rules found {len(partial) - len(missing)} field(s), {method} filled {len(missing)}")
+            return extracted_data, method, False
+        return None
+
+    async def _aextract_on_backend(
+        self, method: str, text: str, doc_type: str, prefill: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """
+        Run one backend behind its cache, circuit breaker and scheduler lane
 
-        except Exception as e:
-            print(f"⚠️ GPT-4 extraction error: {e}")
-            return {"error": str(e), "raw_response": ""}
+        Args:
+            prefill: fields already found (by the rules) - only the missing ones
+                are asked for, and the result is not cached
 
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """Parse JSON from AI response"""
-        try:
-            # Handle code block wrapper
-            if "```json" in response:
-                start_marker = response.find("```json") + 7
-                end_marker = response.find("```", start_marker)
-                if end_marker != -1:
-                    response = response[start_marker:end_marker].strip()
-                    print(f"🔍 Extracted from code block: {len(response)} chars")
-            
-            # Find JSON in response  
-            start = response.find("{")
-            end = response.rfind("}") + 1
-
-            if start != -1 and end != 0:
-                json_str = response[start:end]
-                parsed = json.loads(json_str)
-                return parsed
-            else:
-                print("❌ No JSON boundaries found")
-                return {"raw_response": response}
+        Returns:
+            (extracted_data, served from cache), or None when the circuit is open
+        """
+        breaker = self.breakers[method]
+        if not breaker.is_available():
+            return None
+
+        # Served from cache when the same content was seen before
+        cache_key = self.cache.make_key(
+            text,
+            doc_type,
+            self.prompt_loader.get_prompt_version(doc_type, self.backends[method].prompt_method),
+            method,
+            self._get_model_name(method),
+        )
+        cached = await self.cache.aget(cache_key) if prefill is None else None
+        if cached is not None:
+            print("⚡ Extraction served from cache")
+            return cached, True
 
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON decode error: {e}")
-            return {"raw_response": response}
+        if not breaker.allow_request():
+            return None
 
-    def _parse_json_response1(self, response: str) -> Dict[str, Any]:
-        """Parse JSON from AI response"""
+        # Raises ExtractionQueueFullError when the backend is saturated
         try:
-            # Find JSON in response
-            start = response.find("{")
-            end = response.rfind("}") + 1
+            async with self.scheduler.slot(method, current_client_id.get()):
+                started = time.monotonic()
+                if prefill is not None:
+                    extracted_data = await self.field_recovery.recover(
+                        self.backends[method], text, doc_type, prefill
+                    )
+                else:
+                    extracted_data = await self._aextract(method, text, doc_type)
+                latency = time.monotonic() - started
+
+                # Fill the few fields the model missed before the result is scored and cached
+                if self.field_recovery is not None and prefill is None:
+                    extracted_data = await self.field_recovery.recover(
+                        self.backends[method], text, doc_type, extracted_data
+                    )
+        except BaseException:
+            breaker.release_trial()
+            raise
+
+        if "error" in extracted_data:
+            breaker.record_failure(str(extracted_data["error"])[:200])
+            return extracted_data, False
+
+        breaker.record_success(latency)
+        print(f"🤖 {method.title()} extraction completed")
+
+        # Only cache usable structured results
+        if "raw_response" not in extracted_data and prefill is None:
+            await self.cache.aput(cache_key, extracted_data)
+        return extracted_data, False
+
+    async def _aextract(self, method: str, text: str, doc_type: str) -> Dict[str, Any]:
+        """Dispatch to an extraction backend by name"""
+        backend = self.backends.get(method)
+        if backend is None:
+            return {"error": "No extraction method available"}
+        return await backend.extract(text, doc_type)
+
+    def classify_many(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Classify a batch of documents in one vectorizer pass: (doc_type, confidence) per text"""
+        return self.classifier.classify_many(texts)
 
-            if start != -1 and end != 0:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            else:
-                return {"raw_response": response}
+    def _classify_document(self, text: str) -> Tuple[str, float]:
+        """Traditional ML classification"""
 
-        except json.JSONDecodeError:
-            return {"raw_response": response}
+        prediction, confidence, _ = self.classifier.classify(text)
+        return prediction, confidence
 
     def _calculate_confidence(
         self, ml_confidence: float, extracted_data: Dict
@@ -429,40 +541,21 @@ class Processor:
         else:
             return ConfidenceLevel.LOW
 
-    def _get_model_display_name(self) -> str:
+    def _get_model_name(self, method: Optional[str] = None) -> str:
+        """Get the raw model identifier for an extraction backend (default: active)"""
+        if method in (RULES_TIER, TEMPLATE_TIER):
+            return method
+        backend = self.backends.get(method or self.extraction_method)
+        return backend.model_name if backend else "none"
+
+    def _get_model_display_name(self, method: Optional[str] = None) -> str:
         """Get display name for the AI model being used"""
-        if self.extraction_method == "ollama":
-            # Handle different Ollama models
-            model_mapping = {
-                "tinyllama": "Tiny Llama",
-                "llama2": "Llama 2",
-                "mistral": "Mistral", 
-                "codellama": "Code Llama",
-                "llama3": "Llama 3"
-            }
-            return model_mapping.get(self.ollama_model, self.ollama_model.title())
-            
-        elif self.extraction_method == "huggingface":
-            # Handle different HF models
-            model_name = self.config.HF_MODEL.split('/')[-1]
-            model_mapping = {
-                "DialoGPT-small": "DialoGPT Small",
-                "DialoGPT-medium": "DialoGPT Medium",
-                "distilbert-base-uncased": "DistilBERT"
-            }
-            return model_mapping.get(model_name, model_name)
-            
-        elif self.extraction_method == "openai":
-            # Handle different OpenAI models
-            model_mapping = {
-                "gpt-4": "GPT-4",
-                "gpt-3.5-turbo": "GPT-3.5 Turbo",
-                "gpt-4-turbo": "GPT-4 Turbo"
-            }
-            return model_mapping.get(self.config.MODEL_NAME, self.config.MODEL_NAME)
-            
-        else:
-            return "Unknown Model"
+        if method == RULES_TIER:
+            return "Rules Engine"
+        if method == TEMPLATE_TIER:
+            return "Vendor Template"
+        backend = self.backends.get(method or self.extraction_method)
+        return backend.display_name if backend else "Unknown Model"
         
     def _post_process_extracted_data(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Post-process extracted data to format complex fields better"""
@@ -473,6 +566,12 @@ class Processor:
         for field in item_fields:
             if field in extracted_data:
                 raw_value = extracted_data[field]
+
+                # Schema-validated output already returns a list of strings
+                if isinstance(raw_value, list) and raw_value and all(isinstance(i, str) for i in raw_value):
+                    extracted_data[field] = "\n".join([f"• {item}" for item in raw_value])
+                    extracted_data[f"{field}_raw"] = raw_value
+                    continue
                 
                 # Try to parse JSON string to structured data
                 if isinstance(raw_value, str):
@@ -522,6 +621,90 @@ class Processor:
         
         return extracted_data
 
+    async def start(self) -> None:
+        """Start background work (model warm-up, backend keepers, health probes, classifier learning)"""
+        for method, backend in self.backends.items():
+            if self.breakers[method].state == CircuitState.CLOSED:
+                await backend.warmup()
+            await backend.start()
+        await self.classifier.start()
+
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_probe_loop())
+
+    async def aclose(self) -> None:
+        """Release resources held by the processor"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        await self.classifier.aclose()
+        for backend in self.backends.values():
+            await backend.aclose()
+        if self.near_duplicates is not None:
+            self.near_duplicates.save()
+        if self.vendor_templates is not None:
+            self.vendor_templates.flush()
+        self.cache.close()
+
+    async def _health_probe_loop(self) -> None:
+        """Periodically probe every backend and open/close circuits accordingly"""
+        while True:
+            await asyncio.sleep(self.config.HEALTH_PROBE_INTERVAL)
+            for method in self.backends:
+                try:
+                    healthy = await self._probe_backend(method)
+                except Exception as e:
+                    print(f"⚠️ Health probe error for {method}: {e}")
+                    healthy = False
+                self.breakers[method].record_probe(healthy)
+
+            # Prefer the first healthy backend in chain order
+            for method in self.backend_chain:
+                if self.breakers[method].state == CircuitState.CLOSED:
+                    self.extraction_method = method
+                    break
+
+    async def _probe_backend(self, method: str) -> bool:
+        """Cheap liveness check for one backend"""
+        return await self.backends[method].health()
+
+    def get_backend_health(self) -> Dict[str, Any]:
+        """Circuit state per backend in failover order (cascade-only tiers last)"""
+        return {
+            method: {
+                "kind": self.backends[method].kind,
+                "model": self._get_model_name(method),
+                "active": method == self.extraction_method,
+                "in_failover_chain": method in self.backend_chain,
+                **self.breakers[method].stats(),
+            }
+            for method in self.backends
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Runtime metrics for operators"""
+        return {
+            "extraction_method": self.extraction_method,
+            "backends": self.get_backend_health(),
+            "cache": self.cache.stats(),
+            "backend_stats": {name: backend.stats() for name, backend in self.backends.items()},
+            "scheduler": self.scheduler.stats(),
+            "latency": self.latency_tracker.snapshot(),
+            "timeouts": self.timeout_policy.stats(),
+            "retry_budget": self.retry_budget.stats(),
+            "structured_output": self.schema_validator.stats(),
+            "cascade": self.cascade.stats() if self.cascade else None,
+            "field_recovery": self.field_recovery.stats() if self.field_recovery else None,
+            "rules": self.rules_engine.stats() if self.rules_engine else None,
+            "near_duplicates": self.near_duplicates.stats() if self.near_duplicates else None,
+            "vendor_templates": self.vendor_templates.stats() if self.vendor_templates else None,
+            "classifier": self.classifier.stats(),
+        }
+
     def get_supported_document_types(self) -> list:
         """Get list of supported document types"""
         if hasattr(self, 'prompt_loader'):
@@ -531,32 +714,4 @@ class Processor:
     
     def get_model_display_name(self) -> str:
         """Get display name for the AI model being used"""
-        if self.extraction_method == "ollama":
-            model_mapping = {
-                "tinyllama": "Tiny Llama",
-                "llama2": "Llama 2",
-                "mistral": "Mistral", 
-                "codellama": "Code Llama",
-                "llama3": "Llama 3"
-            }
-            return model_mapping.get(self.ollama_model, self.ollama_model.title())
-            
-        elif self.extraction_method == "huggingface":
-            model_name = self.config.HF_MODEL.split('/')[-1]
-            model_mapping = {
-                "DialoGPT-small": "DialoGPT Small",
-                "DialoGPT-medium": "DialoGPT Medium",
-                "distilbert-base-uncased": "DistilBERT"
-            }
-            return model_mapping.get(model_name, model_name)
-            
-        elif self.extraction_method == "openai":
-            model_mapping = {
-                "gpt-4": "GPT-4",
-                "gpt-3.5-turbo": "GPT-3.5 Turbo",
-                "gpt-4-turbo": "GPT-4 Turbo"
-            }
-            return model_mapping.get(self.config.MODEL_NAME, self.config.MODEL_NAME)
-            
-        else:
-            return "Unknown Model"
\ No newline at end of file
+        return self._get_model_display_name()
\ No newline at end of file
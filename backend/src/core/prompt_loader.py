@@ -3,9 +3,12 @@
 Utility for loading document processing prompts from YAML files
 """
 
+import re
+import json
 import yaml
+import hashlib
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 class PromptLoader:
     """Load and manage document processing prompts"""
@@ -77,6 +80,100 @@ class PromptLoader:
             # Return prompt with text only
             return prompt_template.replace("{text}", text).replace("{text_preview}", text[:300])
     
+    def format_prompt_parts(self, doc_type: str, method: str, text: str) -> Tuple[str, str]:
+        """
+        Split a prompt into a static prefix and a dynamic suffix
+
+        The prefix holds the instructions and field list, identical for every
+        document of this type, so backends can evaluate it once and reuse it.
+        The suffix holds the document text followed by the output cue
+        (e.g. "Return JSON format:") that ends the template.
+
+        Returns:
+            (static_prefix, dynamic_suffix)
+        """
+        format_vars = {
+            "text": text,
+            "text_preview": text[:300] if len(text) > 300 else text
+        }
+        parts = self._split_template(self.get_prompt(doc_type, method), format_vars)
+        if parts is None:
+            return "", self.format_prompt(doc_type, method, text)
+        return parts
+
+    def _split_template(self, template: str, format_vars: Dict[str, str]) -> Optional[Tuple[str, str]]:
+        """Split a template around its {text} line (None when it has none)"""
+        lines = template.strip().splitlines()
+        text_index = next(
+            (i for i, line in enumerate(lines) if "{text" in line), None
+        )
+        if text_index is None:
+            return None
+
+        # The last non-empty line after the text is the output cue
+        cue_index = next(
+            (i for i in range(len(lines) - 1, text_index, -1) if lines[i].strip()), None
+        )
+        before = lines[:text_index]
+        after = lines[text_index + 1:cue_index] if cue_index is not None else lines[text_index + 1:]
+        cue = lines[cue_index] if cue_index is not None else ""
+
+        prefix = "\n".join(before + after).strip()
+        while "\n\n\n" in prefix:
+            prefix = prefix.replace("\n\n\n", "\n\n")
+
+        text_line = lines[text_index].strip().format(**format_vars)
+        suffix = f"{text_line}\n\n{cue.strip()}".strip()
+
+        return prefix, suffix
+
+    def get_field_descriptions(self, doc_type: str) -> Dict[str, str]:
+        """Field name → description, from the "- field: description" lines of the type's prompts"""
+        descriptions: Dict[str, str] = {}
+        for template in self.prompts.get("document_types", {}).get(doc_type, {}).values():
+            for match in re.finditer(r"^\s*-\s*(\w+):\s*(.+?)\s*$", template, re.MULTILINE):
+                descriptions.setdefault(match.group(1), match.group(2))
+        return descriptions
+
+    def get_field_keywords(self, field: str) -> List[str]:
+        """Words that locate a field in the document text (default: the words of its name)"""
+        keywords = self.prompts.get("field_recovery", {}).get("keywords", {}).get(field)
+        return keywords or [word for word in field.split("_") if len(word) > 2]
+
+    def format_field_prompt_parts(self, doc_type: str, fields: List[str], text: str) -> Tuple[str, str]:
+        """(static prefix, dynamic suffix) of a prompt that asks for only the given fields"""
+        template = self.prompts.get("field_recovery", {}).get(
+            "template", "Extract only these fields and return ONLY valid JSON:\n{fields}\n\nText: {text}\n\nReturn JSON format:"
+        )
+        descriptions = self.get_field_descriptions(doc_type)
+        field_lines = "\n".join(
+            f"- {field}: {descriptions.get(field, field.replace('_', ' '))}" for field in fields
+        )
+        # Fill the static placeholders first so the prefix stays cacheable per field set
+        template = template.replace("{doc_type}", doc_type).replace("{fields}", field_lines)
+        parts = self._split_template(template, {"text": text, "text_preview": text[:300]})
+        return parts if parts is not None else ("", template.replace("{text}", text))
+
+    def get_extraction_rules(self, doc_type: str) -> Optional[Dict[str, Any]]:
+        """Deterministic extraction rules for a document type (None if undeclared)"""
+        return self.prompts.get("extraction_rules", {}).get(doc_type)
+
+    def get_merge_rules(self, doc_type: str) -> Dict[str, str]:
+        """Per-field rules for merging chunk results (first / last / union)"""
+        return self.prompts.get("merge_rules", {}).get(doc_type, {})
+    
+    def get_schema(self, doc_type: str) -> Optional[Dict[str, Any]]:
+        """JSON schema of the fields a document type returns (None if undeclared)"""
+        return self.prompts.get("schemas", {}).get(doc_type)
+
+    def get_prompt_version(self, doc_type: str, method: str) -> str:
+        """Short content hash of the prompt template, output schema and field recovery prompt (changes whenever one is edited)"""
+        prompt_template = self.get_prompt(doc_type, method)
+        schema = json.dumps(self.get_schema(doc_type), sort_keys=True)
+        # Recovered fields are cached with the extraction, so their prompt is part of the version
+        recovery = json.dumps(self.prompts.get("field_recovery", {}), sort_keys=True)
+        return hashlib.sha256(f"{prompt_template}\n{schema}\n{recovery}".encode("utf-8")).hexdigest()[:12]
+    
     def reload_prompts(self):
         """Reload prompts from file (useful for development)"""
         self.prompts = self._load_prompts()
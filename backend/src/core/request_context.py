@@ -0,0 +1,9 @@
+# backend/src/core/request_context.py
+"""
+Per-request context shared between middleware and the processor
+"""
+
+from contextvars import ContextVar
+
+# Caller identity used for fair queuing (hashed X-API-Key, client IP, or anonymous)
+current_client_id: ContextVar[str] = ContextVar("current_client_id", default="anonymous")
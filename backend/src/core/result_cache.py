@@ -0,0 +1,291 @@
+# backend/src/core/result_cache.py
+"""
+Content-addressed extraction result cache - in-memory LRU tier + SQLite disk tier
+"""
+
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from src.config.app_config import Config
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for LLM extraction results
+
+    Keys are content hashes of the normalized document text plus everything
+    that changes the output (doc type, prompt version, backend, model), so
+    editing a prompt or switching model invalidates entries automatically.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        memory_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        db_path: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        config = Config()
+        self.enabled = enabled if enabled is not None else config.CACHE_ENABLED
+        self.memory_entries = memory_entries if memory_entries is not None else config.CACHE_MEMORY_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.CACHE_TTL_SECONDS
+        self.db_path = Path(db_path or config.CACHE_DB_PATH)
+        self.max_disk_bytes = (
+            max_disk_bytes if max_disk_bytes is not None else config.CACHE_MAX_DISK_MB * 1024 * 1024
+        )
+
+        # key -> (stored_at, json payload)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # SQLite work runs in worker threads under its own lock, so memory hits never wait for it
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # Running totals of the disk tier (loaded once at startup)
+        self._disk_entries = 0
+        self._disk_bytes = 0
+        self._last_expiry_sweep = 0.0
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+        }
+
+        if self.enabled:
+            self._open_disk_tier()
+
+    def _open_disk_tier(self) -> None:
+        """Open (or create) the SQLite disk tier"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_accessed ON extractions(accessed_at)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_extractions_created ON extractions(created_at)"
+            )
+            self._db.commit()
+            self._disk_entries, self._disk_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+            ).fetchone()
+            print(f"✅ Extraction cache ready ({self.db_path})")
+        except sqlite3.Error as e:
+            print(f"⚠️ Extraction cache disk tier unavailable: {e}. Using memory only.")
+            self._db = None
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different uploads share a key"""
+        text = unicodedata.normalize("NFKC", text)
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(
+        cls,
+        text: str,
+        doc_type: str,
+        prompt_version: str,
+        backend: str,
+        model: str,
+    ) -> str:
+        """Build the content-addressed cache key"""
+        digest = hashlib.sha256()
+        for part in (cls.normalize_text(text), doc_type, prompt_version, backend, model):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached extraction (memory first, then disk)"""
+        if not self.enabled:
+            return None
+        found, data = self._get_memory(key)
+        return data if found else self._get_disk(key)
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() for async callers - the disk tier is read in a worker thread"""
+        if not self.enabled:
+            return None
+        found, data = self._get_memory(key)
+        return data if found else await asyncio.to_thread(self._get_disk, key)
+
+    def put(self, key: str, extracted_data: Dict[str, Any]) -> None:
+        """Store an extraction in both tiers"""
+        if not self.enabled:
+            return
+        now, payload = self._put_memory(key, extracted_data)
+        self._put_disk(key, payload, now)
+
+    async def aput(self, key: str, extracted_data: Dict[str, Any]) -> None:
+        """put() for async callers - the disk tier is written in a worker thread"""
+        if not self.enabled:
+            return
+        now, payload = self._put_memory(key, extracted_data)
+        if self._db is not None:
+            await asyncio.to_thread(self._put_disk, key, payload, now)
+
+    def _get_memory(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return True, json.loads(payload)
+                del self._memory[key]
+                self._stats["expired"] += 1
+        return False, None
+
+    def _get_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._db_lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT payload, created_at, size FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, created_at, size = row
+                    if now - created_at <= self.ttl_seconds:
+                        self._db.execute(
+                            "UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        with self._lock:
+                            self._remember(key, created_at, payload)
+                            self._stats["disk_hits"] += 1
+                        return json.loads(payload)
+                    self._db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._disk_entries -= 1
+                    self._disk_bytes -= size
+                    with self._lock:
+                        self._stats["expired"] += 1
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def _put_memory(self, key: str, extracted_data: Dict[str, Any]) -> Tuple[float, str]:
+        now = time.time()
+        payload = json.dumps(extracted_data, default=str)
+        with self._lock:
+            self._remember(key, now, payload)
+            self._stats["puts"] += 1
+        return now, payload
+
+    def _put_disk(self, key: str, payload: str, now: float) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            previous = self._db.execute(
+                "SELECT size FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions (key, payload, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            if previous is not None:
+                self._disk_bytes -= previous[0]
+            else:
+                self._disk_entries += 1
+            self._disk_bytes += len(payload)
+            self._evict_disk(now)
+            self._db.commit()
+
+    def _remember(self, key: str, stored_at: float, payload: str) -> None:
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (stored_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _evict_disk(self, now: float) -> None:
+        """Drop expired rows (at most once a minute), then least recently used rows until under the size budget"""
+        if now - self._last_expiry_sweep >= 60:
+            self._last_expiry_sweep = now
+            cutoff = now - self.ttl_seconds
+            count, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions WHERE created_at < ?", (cutoff,)
+            ).fetchone()
+            if count:
+                self._db.execute("DELETE FROM extractions WHERE created_at < ?", (cutoff,))
+                self._disk_entries -= count
+                self._disk_bytes -= size
+                with self._lock:
+                    self._stats["expired"] += count
+
+        while self._disk_bytes > self.max_disk_bytes and self._disk_entries > 0:
+            rows = self._db.execute(
+                "SELECT key, size FROM extractions ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                self._db.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self._disk_entries -= 1
+                self._disk_bytes -= size
+                with self._lock:
+                    self._stats["disk_evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM extractions")
+                self._db.commit()
+            self._disk_entries, self._disk_bytes = 0, 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics and tier sizes"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                "enabled": self.enabled,
+                **self._stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
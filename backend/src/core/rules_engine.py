@@ -0,0 +1,211 @@
+# backend/src/core/rules_engine.py
+"""
+Rules-first extraction tier - compiled regex extractors per document type that
+answer regular documents without an LLM call
+"""
+
+import re
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.config.app_config import Config
+from src.core.prompt_loader import PromptLoader
+from src.core.structured_output import SchemaValidator, json_type
+
+# Name the rules tier is reported under (extraction_method / extraction_backend)
+RULES_TIER = "rules"
+
+# Confidence multiplier when a rule matches several different values
+AMBIGUITY_PENALTY = 0.8
+
+
+class FieldRule:
+    """One way of finding a field: a regex, or the first meaningful line of text"""
+
+    def __init__(self, pattern: Optional[str] = None, confidence: float = 0.9, pick: str = "first",
+                 first_line: bool = False, skip: Optional[str] = None):
+        self.regex = re.compile(pattern, re.MULTILINE) if pattern else None
+        self.confidence = float(confidence)
+        self.pick = pick
+        self.first_line = first_line
+        self.skip = re.compile(skip) if skip else None
+
+    def find(self, text: str) -> Optional[Tuple[str, bool]]:
+        """(matched value, whether several different values matched) or None"""
+        if self.first_line:
+            for line in text.splitlines():
+                line = line.strip()
+                if len(re.findall(r"[A-Za-z]", line)) >= 3 and not (self.skip and self.skip.search(line)):
+                    return line, False
+            return None
+
+        values = []
+        for match in self.regex.finditer(text):
+            value = match.group("value") if "value" in self.regex.groupindex else match.group(0)
+            values.append(value.strip())
+        if not values:
+            return None
+
+        value = values[-1] if self.pick == "last" else values[0]
+        # Totals repeat (subtotal, tax, total) - only "first" rules treat repeats as ambiguity
+        ambiguous = self.pick != "last" and len(set(v.lower() for v in values)) > 1
+        return value, ambiguous
+
+
+class RulesAnswer:
+    """What the rules found for a document"""
+
+    def __init__(self, data: Dict[str, Any], complete: bool):
+        # Confidently found fields (schema-shaped; the rest are empty)
+        self.data = data
+        # Whether the rules answer on their own, or only prefill field recovery
+        self.complete = complete
+
+
+class _DocRules:
+    def __init__(self, spec: Dict[str, Any]):
+        self.required: List[str] = list(spec.get("required", []))
+        self.fields: Dict[str, List[FieldRule]] = {
+            field: [FieldRule(**rule) for rule in rules]
+            for field, rules in (spec.get("fields") or {}).items()
+        }
+
+
+class RulesEngine:
+    """
+    Deterministic extraction from the `extraction_rules` section of prompts.yaml
+
+    For each field the first matching rule wins and its confidence is the
+    field's confidence; only fields at min_confidence or above are kept. A
+    document is answered here only when every required field is kept and the
+    kept fields cover min_completeness of the fields that have rules.
+    Otherwise the kept fields are a partial answer that field recovery can
+    complete, and failing that the document goes on to the LLM tiers.
+    """
+
+    def __init__(self, prompt_loader: PromptLoader, schema_validator: SchemaValidator):
+        config = Config()
+        self.prompt_loader = prompt_loader
+        self.schema_validator = schema_validator
+        self.min_confidence = config.RULES_MIN_CONFIDENCE
+        self.min_completeness = config.RULES_MIN_COMPLETENESS
+
+        self._compiled: Dict[str, Tuple[Dict[str, Any], _DocRules]] = {}
+        self._lock = threading.Lock()
+
+        self.documents = 0
+        self.answered = 0
+        self.partial = 0
+        self.completed = 0
+        self._by_type: Dict[str, Dict[str, int]] = {}
+        self._field_hits: Dict[str, int] = {}
+
+    def _rules_for(self, doc_type: str) -> Optional[_DocRules]:
+        """Compiled rules, rebuilt when prompts.yaml is reloaded with different rules"""
+        spec = self.prompt_loader.get_extraction_rules(doc_type)
+        if not spec:
+            return None
+        with self._lock:
+            cached = self._compiled.get(doc_type)
+            if cached is None or cached[0] != spec:
+                cached = self._compiled[doc_type] = (spec, _DocRules(spec))
+            return cached[1]
+
+    def required_fields(self, doc_type: str) -> List[str]:
+        rules = self._rules_for(str(doc_type))
+        return rules.required if rules is not None else []
+
+    def extract(self, text: str, doc_type: str) -> Optional[RulesAnswer]:
+        """What the rules found with confidence (None when they found nothing)"""
+        doc_type = str(doc_type)
+        rules = self._rules_for(doc_type)
+        if rules is None:
+            self._record(doc_type, False, {})
+            return None
+
+        schema = self.prompt_loader.get_schema(doc_type)
+        values: Dict[str, Any] = {}
+        confidences: Dict[str, float] = {}
+
+        for field, field_rules in rules.fields.items():
+            for rule in field_rules:
+                found = rule.find(text)
+                if found is None:
+                    continue
+                value, ambiguous = found
+                valid, value = self._coerce(doc_type, schema, field, value)
+                if not valid:
+                    continue
+                confidence = rule.confidence * (AMBIGUITY_PENALTY if ambiguous else 1.0)
+                # A weak match is left for the LLM rather than reported as found
+                if confidence >= self.min_confidence:
+                    values[field] = value
+                    confidences[field] = confidence
+                break
+
+        # Completeness counts only fields the rules can find - the rest are always the LLM's
+        declared = [
+            field for field in (schema.get("properties", {}) if schema else rules.fields)
+            if field in rules.fields
+        ]
+        completeness = len(values) / len(declared) if declared else 0.0
+        complete = (
+            all(field in values for field in rules.required)
+            and completeness >= self.min_completeness
+        )
+        self._record(doc_type, complete, values)
+        if not values:
+            return None
+
+        if complete:
+            print(f"📐 Rules answered {doc_type} ({len(values)}/{len(declared)} fields, min confidence "
+                  f"{min(confidences.values()):.2f})")
+        if schema:
+            # Same shape as an LLM result - fields the rules did not find are empty
+            values = {field: values.get(field) for field in schema.get("properties", {})}
+        return RulesAnswer(values, complete)
+
+    def record_completed(self) -> None:
+        """A partial answer was completed by field recovery"""
+        with self._lock:
+            self.completed += 1
+
+    def _coerce(self, doc_type: str, schema: Optional[Dict[str, Any]], field: str, value: str) -> Tuple[bool, Any]:
+        if not schema:
+            return True, value
+        spec = schema.get("properties", {}).get(field, {})
+        if json_type(spec) in ("number", "integer"):
+            value = re.sub(r"[^\d.\-]", "", value)
+        elif json_type(spec) == "array":
+            value = [value]
+        return self.schema_validator.coerce_field(doc_type, schema, field, value)
+
+    def _record(self, doc_type: str, answered: bool, values: Dict[str, Any]) -> None:
+        with self._lock:
+            self.documents += 1
+            stats = self._by_type.setdefault(doc_type, {"documents": 0, "answered": 0})
+            stats["documents"] += 1
+            if answered:
+                self.answered += 1
+                stats["answered"] += 1
+            elif values:
+                self.partial += 1
+            for field in values:
+                key = f"{doc_type}.{field}"
+                self._field_hits[key] = self._field_hits.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": self.documents,
+                "answered": self.answered,
+                # Share of documents reaching this tier (not answered by a vendor
+                # template or near-duplicate reuse) that never reached an LLM
+                "served_share": round(self.answered / self.documents, 3) if self.documents else 0.0,
+                "partial": self.partial,
+                "completed_by_field_recovery": self.completed,
+                "min_confidence": self.min_confidence,
+                "min_completeness": self.min_completeness,
+                "by_type": {doc_type: dict(stats) for doc_type, stats in self._by_type.items()},
+                "field_hits": dict(sorted(self._field_hits.items())),
+            }
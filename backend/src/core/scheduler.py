@@ -0,0 +1,191 @@
+# backend/src/core/scheduler.py
+"""
+Extraction scheduler - admission control and fair queuing in front of the LLM backends
+"""
+
+import math
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Deque, Optional
+
+from src.config.app_config import Config
+from src.exceptions.document_exceptions import ExtractionQueueFullError
+
+
+def parse_backend_limits(spec: str) -> Dict[str, int]:
+    """Parse "ollama=4,huggingface=1" into {"ollama": 4, "huggingface": 1}"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class _BackendLane:
+    """Concurrency slots and per-client wait queues for one backend"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.in_flight = 0
+        self.queued = 0
+
+        # client_id -> FIFO of waiting futures; order of keys is the round-robin order
+        self.waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_wait = 0.0
+        self.avg_service_time = 5.0  # seconds, EWMA seeded with a conservative guess
+
+    def retry_after(self) -> int:
+        """Estimate how long until a slot frees up"""
+        estimate = self.avg_service_time * (self.queued + 1) / self.max_concurrency
+        return max(1, math.ceil(estimate))
+
+
+class ExtractionScheduler:
+    """
+    Bounded, fair admission control for LLM extraction
+
+    Each backend gets a concurrency cap and a bounded wait queue. Waiting
+    requests are served round-robin across client ids (API keys) so one
+    noisy caller cannot starve the others. When the queue is full, or a
+    request waits longer than the queue timeout, ExtractionQueueFullError
+    is raised so the API can answer 429 with Retry-After.
+    """
+
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        concurrency: Optional[Dict[str, int]] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ):
+        config = Config()
+        self.concurrency = (
+            concurrency if concurrency is not None
+            else parse_backend_limits(config.EXTRACTION_CONCURRENCY)
+        )
+        self.default_concurrency = config.EXTRACTION_DEFAULT_CONCURRENCY
+        self.max_queue = max_queue if max_queue is not None else config.EXTRACTION_QUEUE_SIZE
+        self.queue_timeout = (
+            queue_timeout if queue_timeout is not None else config.EXTRACTION_QUEUE_TIMEOUT
+        )
+        self._lanes: Dict[str, _BackendLane] = {}
+
+    def _lane(self, backend: str) -> _BackendLane:
+        lane = self._lanes.get(backend)
+        if lane is None:
+            lane = _BackendLane(
+                backend,
+                self.concurrency.get(backend, self.default_concurrency),
+                self.max_queue,
+            )
+            self._lanes[backend] = lane
+        return lane
+
+    @asynccontextmanager
+    async def slot(self, backend: str, client_id: str = "anonymous"):
+        """Hold one concurrency slot on the backend for the duration of the block"""
+        lane = self._lane(backend)
+
+        wait_start = time.monotonic()
+        await self._acquire(lane, client_id)
+        waited = time.monotonic() - wait_start
+        lane.avg_wait += self.EWMA_ALPHA * (waited - lane.avg_wait)
+        lane.admitted += 1
+
+        service_start = time.monotonic()
+        try:
+            yield
+        finally:
+            service_time = time.monotonic() - service_start
+            lane.avg_service_time += self.EWMA_ALPHA * (service_time - lane.avg_service_time)
+            self._release(lane)
+
+    async def _acquire(self, lane: _BackendLane, client_id: str) -> None:
+        # Fast path: free slot and nobody waiting ahead of us
+        if lane.in_flight < lane.max_concurrency and lane.queued == 0:
+            lane.in_flight += 1
+            return
+
+        if lane.queued >= lane.max_queue:
+            lane.rejected += 1
+            raise ExtractionQueueFullError(lane.name, lane.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        lane.waiters.setdefault(client_id, deque()).append(future)
+        lane.queued += 1
+
+        try:
+            await asyncio.wait_for(future, timeout=self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up - pass it on
+                self._release(lane)
+            else:
+                self._remove_waiter(lane, client_id, future)
+
+            if isinstance(exc, asyncio.TimeoutError):
+                lane.timed_out += 1
+                raise ExtractionQueueFullError(
+                    lane.name, lane.retry_after(), reason="queue wait timeout"
+                )
+            raise
+
+    def _release(self, lane: _BackendLane) -> None:
+        """Hand the slot to the next waiter (round-robin across clients) or free it"""
+        while lane.waiters:
+            client_id, queue = next(iter(lane.waiters.items()))
+            future = queue.popleft()
+            lane.queued -= 1
+
+            if queue:
+                lane.waiters.move_to_end(client_id)
+            else:
+                del lane.waiters[client_id]
+
+            if not future.done():
+                # Slot ownership transfers directly; in_flight is unchanged
+                future.set_result(None)
+                return
+
+        lane.in_flight -= 1
+
+    def _remove_waiter(self, lane: _BackendLane, client_id: str, future: asyncio.Future) -> None:
+        queue = lane.waiters.get(client_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+            lane.queued -= 1
+        except ValueError:
+            return
+        if not queue:
+            del lane.waiters[client_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-backend queue depth, admission counters and timing"""
+        return {
+            name: {
+                "max_concurrency": lane.max_concurrency,
+                "max_queue": lane.max_queue,
+                "in_flight": lane.in_flight,
+                "queued": lane.queued,
+                "queued_by_client": {client: len(q) for client, q in lane.waiters.items()},
+                "admitted": lane.admitted,
+                "rejected": lane.rejected,
+                "timed_out": lane.timed_out,
+                "avg_wait_seconds": round(lane.avg_wait, 3),
+                "avg_service_seconds": round(lane.avg_service_time, 3),
+            }
+            for name, lane in self._lanes.items()
+        }
@@ -8,18 +8,24 @@ from fastapi import HTTPException
 
 from .processor import Processor
 from .storage import StorageClient
+from .http_client import AsyncHTTPClient
 
 # Global instances
 _processor: Optional[Processor] = None
 _storage_client: Optional[StorageClient] = None
+_http_client: Optional[AsyncHTTPClient] = None
 
-def initialize_services():
+async def initialize_services():
     """Initialize all services on startup"""
-    global _processor, _storage_client
+    global _processor, _storage_client, _http_client
     
     try:
+        # Shared keep-alive connection pool for the LLM backends
+        _http_client = AsyncHTTPClient()
+
         # Initialize core services
-        _processor = Processor()
+        _processor = Processor(http_client=_http_client)
+        await _processor.start()
         _storage_client = StorageClient()
         
         print("✅ All services initialized")
@@ -30,14 +36,21 @@ def initialize_services():
         print(f"❌ Failed to initialize services: {e}")
         raise e
 
-def cleanup_services():
+async def cleanup_services():
     """Cleanup services on shutdown"""
-    global _processor, _storage_client
+    global _processor, _storage_client, _http_client
     
     print("🔄 Shutting down services...")
     
     # Cleanup processor if needed
+    if _processor is not None:
+        await _processor.aclose()
     _processor = None
+
+    # Close pooled connections
+    if _http_client is not None:
+        await _http_client.close()
+        _http_client = None
     
     # Cleanup storage client if needed  
     _storage_client = None
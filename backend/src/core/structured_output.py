@@ -0,0 +1,125 @@
+# backend/src/core/structured_output.py
+"""
+Schema-constrained structured output - JSON schemas per document type
+compiled into pydantic TypeAdapters for single-pass validation
+"""
+
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, create_model
+
+# JSON schema primitive types → python types accepted by pydantic
+_JSON_TYPES = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+    "object": Dict[str, Any],
+}
+
+
+class _ExtractionModel(BaseModel):
+    # Anything the model invents beyond the declared fields is dropped
+    model_config = ConfigDict(extra="ignore")
+
+
+def json_type(schema: Dict[str, Any]) -> str:
+    """Declared type of a field, ignoring "null" in a nullable one (type: [string, "null"])"""
+    declared = schema.get("type", "string")
+    if isinstance(declared, list):
+        types = [t for t in declared if t != "null"]
+        return types[0] if len(types) == 1 else "any"
+    return declared
+
+
+def _python_type(schema: Dict[str, Any]) -> Any:
+    declared = json_type(schema)
+    if declared == "array":
+        return List[_python_type(schema.get("items", {}))]
+    return _JSON_TYPES.get(declared, Any)
+
+
+class SchemaValidator:
+    """
+    Compile document-type JSON schemas into TypeAdapters (once per schema)
+    and validate raw model output against them in one pass
+    """
+
+    def __init__(self):
+        self._adapters: Dict[str, Tuple[Dict[str, Any], TypeAdapter]] = {}
+        self._field_adapters: Dict[str, Tuple[Dict[str, Any], TypeAdapter]] = {}
+        self._lock = threading.Lock()
+
+        self.validated = 0
+        self.repaired = 0
+        self.invalid = 0
+
+    def adapter_for(self, doc_type: str, schema: Dict[str, Any]) -> TypeAdapter:
+        """Compiled adapter for a schema, rebuilt only when the schema changes"""
+        with self._lock:
+            cached = self._adapters.get(str(doc_type))
+            if cached is not None and cached[0] == schema:
+                return cached[1]
+
+            required = set(schema.get("required", []))
+            fields = {
+                name: (Optional[_python_type(spec)], ... if name in required else None)
+                for name, spec in schema.get("properties", {}).items()
+            }
+            model = create_model(f"{doc_type.title()}Extraction", __base__=_ExtractionModel, **fields)
+            adapter = TypeAdapter(model)
+            self._adapters[str(doc_type)] = (schema, adapter)
+            return adapter
+
+    def validate_json(self, doc_type: str, schema: Dict[str, Any], raw: str) -> Optional[Dict[str, Any]]:
+        """Parse and validate raw output in one pass (None when it does not conform)"""
+        try:
+            result = self.adapter_for(doc_type, schema).validate_json(raw.strip())
+        except ValidationError:
+            return None
+        self.validated += 1
+        return result.model_dump()
+
+    def validate_python(self, doc_type: str, schema: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce an already-parsed dict to the schema, keeping it as-is when it cannot conform"""
+        try:
+            result = self.adapter_for(doc_type, schema).validate_python(data)
+        except ValidationError as e:
+            self.invalid += 1
+            print(f"⚠️ {doc_type} output does not match schema: {e.error_count()} error(s)")
+            return data
+        self.repaired += 1
+        return result.model_dump()
+
+    def conforms(self, doc_type: str, schema: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        """Whether a parsed result matches the schema (does not count towards stats)"""
+        try:
+            self.adapter_for(doc_type, schema).validate_python(data)
+            return True
+        except ValidationError:
+            return False
+
+    def coerce_field(self, doc_type: str, schema: Dict[str, Any], field: str, value: Any) -> Tuple[bool, Any]:
+        """Validate a single field against its declared type: (valid, coerced value)"""
+        spec = schema.get("properties", {}).get(field)
+        if spec is None:
+            return True, value
+
+        key = f"{doc_type}.{field}"
+        with self._lock:
+            cached = self._field_adapters.get(key)
+            if cached is None or cached[0] != spec:
+                cached = self._field_adapters[key] = (spec, TypeAdapter(_python_type(spec)))
+        try:
+            return True, cached[1].validate_python(value)
+        except ValidationError:
+            return False, value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "schemas": list(self._adapters),
+            "validated": self.validated,
+            "repaired": self.repaired,
+            "invalid": self.invalid,
+        }
@@ -0,0 +1,410 @@
+# backend/src/core/vendor_templates.py
+"""
+Vendor template learning - fingerprint recurring document layouts by their
+header and extract them deterministically from templates learned from
+confirmed LLM results
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from src.config.app_config import Config
+from src.core.prompt_loader import PromptLoader
+from src.core.structured_output import SchemaValidator
+
+# Name the template tier is reported under (extraction_method / extraction_backend)
+TEMPLATE_TIER = "template"
+
+# Header lines that identify a vendor
+_HEADER_LINES = 3
+
+# Amounts vary in magnitude and thousands separators between documents
+_AMOUNT = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _shape(value: str) -> str:
+    """Regex matching values shaped like this one (INV-2024-001 → [A-Za-z]+\\-\\d+\\-\\d+)"""
+    parts = []
+    for run in re.findall(r"\d+|[A-Za-z]+|.", value):
+        if run.isdigit():
+            parts.append(r"\d+")
+        elif run.isalpha():
+            parts.append("[A-Za-z]+")
+        else:
+            parts.append(re.escape(run))
+    return "".join(parts)
+
+
+def _label_pattern(label: str) -> str:
+    """Regex for the text before a value on its line (digits and spacing may vary)"""
+    parts = []
+    for run in re.findall(r"\d+|\s+|[^\d\s]+", label):
+        if run.isdigit():
+            parts.append(r"\d+")
+        elif run.isspace():
+            parts.append(r"\s*")
+        else:
+            parts.append(re.escape(run))
+    return "".join(parts)
+
+
+def _line_anchor(line: str) -> str:
+    return "^" + _label_pattern(line) + "$"
+
+
+def _normalize(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return " ".join(str(value).lower().split())
+
+
+class VendorMatch:
+    """A document recognised as coming from a vendor"""
+
+    def __init__(self, key: str, version: Optional[int] = None,
+                 data: Optional[Dict[str, Any]] = None, shadow: bool = False):
+        self.key = key
+        self.version = version
+        self.data = data
+        # Template answer withheld so the LLM result can validate it
+        self.shadow = shadow
+
+
+class VendorTemplates:
+    """
+    Learn, apply, validate and retire per-vendor extraction templates
+
+    A vendor is the document type plus a hash of its first header lines.
+    Each confident LLM result for a vendor without a template is turned into
+    candidate rules per field (label + value shape on a line, a fixed header
+    line, or a block of lines between two anchors for lists). Once
+    min_confirmations results agree on a rule for every field the LLM keeps
+    filling, those rules become the vendor's next template version.
+
+    A share of template answers is validated against the LLM in the
+    background of a normal extraction; misses and disagreements count as
+    failures, and a template whose recent pass rate drops below
+    min_agreement is retired (learning starts over for the next version).
+    """
+
+    def __init__(self, prompt_loader: PromptLoader, schema_validator: SchemaValidator, path: Optional[str] = None):
+        config = Config()
+        self.prompt_loader = prompt_loader
+        self.schema_validator = schema_validator
+        self.path = Path(path or config.VENDOR_TEMPLATES_PATH)
+        self.min_confirmations = config.VENDOR_TEMPLATE_MIN_CONFIRMATIONS
+        self.validation_sample = config.VENDOR_TEMPLATE_VALIDATION_SAMPLE
+        self.min_agreement = config.VENDOR_TEMPLATE_MIN_AGREEMENT
+        self.min_checks = config.VENDOR_TEMPLATE_MIN_CHECKS
+        self.window = config.VENDOR_TEMPLATE_WINDOW
+
+        self._vendors: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = 0
+
+        self.documents = 0
+        self.served = 0
+        self._load()
+
+    # Vendor identification
+
+    def vendor_key(self, text: str, doc_type: str) -> Optional[str]:
+        header = [
+            " ".join(re.sub(r"[^a-z]+", " ", line.lower()).split())
+            for line in _lines(text)[:_HEADER_LINES]
+        ]
+        header = [line for line in header if len(line) >= 3]
+        if not header:
+            return None
+        digest = hashlib.sha1("\n".join(header).encode("utf-8")).hexdigest()[:12]
+        return f"{doc_type}:{digest}"
+
+    def match(self, text: str, doc_type: str) -> Optional[VendorMatch]:
+        """Recognise the vendor and apply its active template (data is None when it does not apply)"""
+        doc_type = str(doc_type)
+        key = self.vendor_key(text, doc_type)
+        if key is None:
+            return None
+
+        with self._lock:
+            self.documents += 1
+            vendor = self._vendors.get(key)
+            template = vendor.get("active") if vendor else None
+            if template is None:
+                return VendorMatch(key)
+
+            data = self._apply(template, text, doc_type)
+            if data is None:
+                # The layout no longer matches - counts against the template
+                self._record_check(key, vendor, template, False)
+                return VendorMatch(key, template["version"])
+
+            template["applied"] += 1
+            shadow = random.random() < self.validation_sample
+            if not shadow:
+                self.served += 1
+            return VendorMatch(key, template["version"], data, shadow)
+
+    def observe(self, match: VendorMatch, text: str, doc_type: str, llm_data: Dict[str, Any]) -> None:
+        """Feed a confident LLM result: validates a shadowed template answer, or teaches the vendor's layout"""
+        with self._lock:
+            vendor = self._vendors.setdefault(match.key, self._new_vendor(text, str(doc_type)))
+            template = vendor.get("active")
+
+            if template is not None:
+                if match.shadow and match.data is not None and template["version"] == match.version:
+                    agreed = all(
+                        _normalize(match.data.get(field)) == _normalize(llm_data.get(field))
+                        for field in template["fields"]
+                    )
+                    self._record_check(match.key, vendor, template, agreed)
+                return
+
+            self._learn(match.key, vendor, text, llm_data)
+
+    # Learning
+
+    @staticmethod
+    def _new_vendor(text: str, doc_type: str) -> Dict[str, Any]:
+        return {
+            "doc_type": doc_type,
+            "header": (_lines(text) or [""])[0][:80],
+            "confirmations": 0,
+            "field_seen": {},
+            "candidates": {},
+            "active": None,
+            "history": [],
+            "next_version": 1,
+        }
+
+    def _learn(self, key: str, vendor: Dict[str, Any], text: str, llm_data: Dict[str, Any]) -> None:
+        lines = _lines(text)
+        schema = self.prompt_loader.get_schema(vendor["doc_type"])
+        declared = schema.get("properties", {}) if schema else llm_data
+        vendor["confirmations"] += 1
+
+        for field, value in llm_data.items():
+            if field not in declared or value in (None, "", [], {}):
+                continue
+            vendor["field_seen"][field] = vendor["field_seen"].get(field, 0) + 1
+            rule = self._derive_rule(lines, value)
+            if rule is not None:
+                candidates = vendor["candidates"].setdefault(field, {})
+                rule_key = json.dumps(rule, sort_keys=True)
+                candidates[rule_key] = candidates.get(rule_key, 0) + 1
+        self._dirty += 1
+
+        if vendor["confirmations"] < self.min_confirmations:
+            return
+
+        # Every field the LLM usually fills needs a rule the confirmations agree on
+        fields = {}
+        for field, seen in vendor["field_seen"].items():
+            if seen * 2 < vendor["confirmations"]:
+                continue
+            agreed = [r for r, n in vendor["candidates"].get(field, {}).items() if n >= self.min_confirmations]
+            if not agreed:
+                return
+            fields[field] = json.loads(max(agreed, key=lambda r: vendor["candidates"][field][r]))
+
+        if fields:
+            self._promote(key, vendor, fields)
+
+    def _derive_rule(self, lines: List[str], value: Any) -> Optional[Dict[str, Any]]:
+        """How to find this value in the text again, or None"""
+        if isinstance(value, list):
+            return self._derive_block(lines, value)
+        if isinstance(value, dict):
+            return None
+
+        if isinstance(value, float):
+            renderings = [f"{value:,.2f}", f"{value:.2f}", f"{value:g}"]
+        else:
+            renderings = [str(value).strip()]
+
+        for rendering in renderings:
+            for index, line in enumerate(lines):
+                position = line.lower().find(rendering.lower())
+                if position < 0:
+                    continue
+                label = line[:position].rstrip()
+                actual = line[position:position + len(rendering)]
+                rest = line[position + len(rendering):].strip()
+
+                if not label and not rest and index < 10:
+                    return {"kind": "line", "line": index}
+                if not label:
+                    continue
+                if isinstance(value, (int, float)) or _AMOUNT.fullmatch(actual):
+                    value_pattern, end = _AMOUNT.pattern, r"(?:\s|$)"
+                elif " " in actual.strip():
+                    if rest:
+                        continue  # Free text that does not end the line has no clear boundary
+                    value_pattern, end = r".+?", r"\s*$"
+                else:
+                    value_pattern, end = _shape(actual), r"(?:\s|$)"
+                return {"kind": "label", "pattern": rf"^{_label_pattern(label)}\s*(?P<value>{value_pattern}){end}"}
+        return None
+
+    def _derive_block(self, lines: List[str], items: List[Any]) -> Optional[Dict[str, Any]]:
+        """Lines between two anchor lines (items located by their first word)"""
+        positions = []
+        for item in items:
+            words = str(item).split()
+            if not words:
+                continue
+            first = words[0].lower()
+            index = next((i for i, line in enumerate(lines) if line.lower().startswith(first)), None)
+            if index is None:
+                return None
+            positions.append(index)
+        if not positions:
+            return None
+        start, end = min(positions), max(positions)
+        if start == 0 or end == len(lines) - 1:
+            return None
+        return {"kind": "block", "start": _line_anchor(lines[start - 1]), "end": _line_anchor(lines[end + 1])}
+
+    def _promote(self, key: str, vendor: Dict[str, Any], fields: Dict[str, Dict[str, Any]]) -> None:
+        version = vendor["next_version"]
+        vendor["next_version"] += 1
+        vendor["active"] = {
+            "version": version,
+            "fields": fields,
+            "created_at": time.time(),
+            "applied": 0,
+            "checks": 0,
+            "passes": 0,
+            "recent": [],
+            "status": "active",
+        }
+        vendor["confirmations"] = 0
+        vendor["field_seen"] = {}
+        vendor["candidates"] = {}
+        print(f"🏷️ Learned template v{version} for {vendor['header']!r} ({len(fields)} fields)")
+        self._save()
+
+    # Applying and validating
+
+    def _apply(self, template: Dict[str, Any], text: str, doc_type: str) -> Optional[Dict[str, Any]]:
+        """Schema-shaped result when every template field is found and valid, else None"""
+        lines = _lines(text)
+        schema = self.prompt_loader.get_schema(doc_type)
+        data: Dict[str, Any] = {}
+        for field, rule in template["fields"].items():
+            value = self._apply_rule(rule, lines)
+            if value in (None, "", []):
+                return None
+            if schema:
+                valid, value = self.schema_validator.coerce_field(doc_type, schema, field, value)
+                if not valid:
+                    return None
+            data[field] = value
+        if schema:
+            return {field: data.get(field) for field in schema.get("properties", {})}
+        return data
+
+    @staticmethod
+    def _apply_rule(rule: Dict[str, Any], lines: List[str]) -> Any:
+        kind = rule["kind"]
+        if kind == "line":
+            return lines[rule["line"]] if rule["line"] < len(lines) else None
+
+        if kind == "label":
+            pattern = re.compile(rule["pattern"], re.IGNORECASE)
+            for line in lines:
+                match = pattern.search(line)
+                if match:
+                    value = match.group("value").strip()
+                    # Schema coercion turns "1234.50" into a number; separators would fail it
+                    return value.replace(",", "") if _AMOUNT.fullmatch(value) else value
+            return None
+
+        if kind == "block":
+            start = re.compile(rule["start"], re.IGNORECASE)
+            end = re.compile(rule["end"], re.IGNORECASE)
+            begin = next((i for i, line in enumerate(lines) if start.search(line)), None)
+            if begin is None:
+                return None
+            finish = next((i for i in range(begin + 1, len(lines)) if end.search(lines[i])), None)
+            return lines[begin + 1:finish] if finish is not None else None
+        return None
+
+    def _record_check(self, key: str, vendor: Dict[str, Any], template: Dict[str, Any], passed: bool) -> None:
+        template["checks"] += 1
+        template["passes"] += int(passed)
+        template["recent"] = (template["recent"] + [int(passed)])[-self.window:]
+        self._dirty += 1
+
+        recent = template["recent"]
+        if len(recent) >= self.min_checks and sum(recent) / len(recent) < self.min_agreement:
+            template["status"] = "retired"
+            template["retired_at"] = time.time()
+            vendor["history"] = (vendor["history"] + [template])[-5:]
+            vendor["active"] = None
+            print(f"🗑️ Retired template v{template['version']} for {vendor['header']!r} "
+                  f"(pass rate {sum(recent) / len(recent):.0%} over {len(recent)} checks)")
+            self._save()
+
+    # Persistence
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self._vendors = json.load(file).get("vendors", {})
+            active = sum(1 for v in self._vendors.values() if v.get("active"))
+            print(f"✅ Loaded vendor templates ({active} active, {len(self._vendors)} vendors)")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load vendor templates: {e}")
+
+    def _save(self) -> None:
+        """Write all vendors atomically (called with the lock held)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"vendors": self._vendors}, file, default=str)
+            temp_path.replace(self.path)
+            self._dirty = 0
+        except OSError as e:
+            print(f"⚠️ Could not save vendor templates: {e}")
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            vendors = {}
+            for key, vendor in self._vendors.items():
+                template = vendor.get("active")
+                recent = template["recent"] if template else []
+                vendors[key] = {
+                    "header": vendor["header"],
+                    "template_version": template["version"] if template else None,
+                    "applied": template["applied"] if template else 0,
+                    "checks": template["checks"] if template else 0,
+                    "recent_pass_rate": round(sum(recent) / len(recent), 3) if recent else None,
+                    "learning_confirmations": vendor["confirmations"],
+                    "retired_versions": [t["version"] for t in vendor["history"]],
+                }
+            return {
+                "documents": self.documents,
+                "served": self.served,
+                "served_share": round(self.served / self.documents, 3) if self.documents else 0.0,
+                "active_templates": sum(1 for v in self._vendors.values() if v.get("active")),
+                "vendors": vendors,
+            }
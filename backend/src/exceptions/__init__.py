@@ -0,0 +1,10 @@
+# backend/src/exceptions/__init__.py
+"""
+Exceptions package
+"""
+
+from .document_exceptions import ExtractionQueueFullError
+
+__all__ = [
+    "ExtractionQueueFullError",
+]
@@ -0,0 +1,16 @@
+# backend/src/exceptions/document_exceptions.py
+"""
+Document processing exceptions
+"""
+
+
+class ExtractionQueueFullError(Exception):
+    """Raised when the extraction scheduler cannot admit another request"""
+
+    def __init__(self, backend: str, retry_after: int, reason: str = "queue full"):
+        self.backend = backend
+        self.retry_after = retry_after
+        self.reason = reason
+        super().__init__(
+            f"Extraction backend '{backend}' is overloaded ({reason}). Retry after {retry_after}s"
+        )
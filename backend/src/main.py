@@ -14,6 +14,7 @@ from fastapi.staticfiles import StaticFiles
 from src.utils.logging_utils import logger
 from src.config.app_config import Config
 from src.core.service_manager import initialize_services, cleanup_services
+from src.middlewares.client_middlewares import setup_client_middleware
 
 from .routes.document_routes import router as document_router
 from .routes.workflow_routes import router as workflow_router
@@ -28,7 +29,7 @@ async def lifespan(app: FastAPI):
     """Handle application lifespan events"""
     # Startup
     try:
-        initialize_services()
+        await initialize_services()
         logger.info("✅ Application startup completed")
     except Exception as e:
         print(f"❌ Application startup failed: {e}")
@@ -37,7 +38,7 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
-    cleanup_services()
+    await cleanup_services()
     print("✅ Application shutdown completed")
 
 # Initialize configuration
@@ -51,6 +52,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Identify API callers (hashed X-API-Key, else client IP) for fair extraction queuing
+setup_client_middleware(app)
+
 # Setup static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
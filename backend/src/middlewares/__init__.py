@@ -5,8 +5,10 @@ Middleware package
 
 from .cors_middlewares import setup_cors_middleware
 from .auth_middlewares import setup_auth_middleware  
+from .client_middlewares import setup_client_middleware
 
 __all__ = [
     "setup_cors_middleware",
     "setup_auth_middleware", 
+    "setup_client_middleware",
 ]
\ No newline at end of file
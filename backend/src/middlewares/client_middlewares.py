@@ -0,0 +1,28 @@
+# backend/src/middlewares/client_middlewares.py
+"""
+Client identification middleware - who is calling, for fair queuing
+"""
+
+import hashlib
+from fastapi import FastAPI, Request
+from src.core.request_context import current_client_id
+
+def client_id_for(request: Request) -> str:
+    """Stable caller id: a short hash of the API key, else the client IP"""
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        # Never expose the key itself - the id shows up in /api/metrics
+        return "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    if request.client is not None and request.client.host:
+        return f"ip-{request.client.host}"
+    return "anonymous"
+
+def setup_client_middleware(app: FastAPI):
+    """Tag each request with its client id (independent of SKIP_AUTH)"""
+
+    @app.middleware("http")
+    async def client_middleware(request: Request, call_next):
+        current_client_id.set(client_id_for(request))
+        return await call_next(request)
+
+    print("✅ Client identification middleware configured")
@@ -32,8 +32,9 @@ def setup_cors_middleware(app: FastAPI):
             "Content-Type",
             "Authorization",
             "X-Requested-With",
+            "X-API-Key",
         ],
-        expose_headers=["Content-Disposition"],  # For file downloads
+        expose_headers=["Content-Disposition", "Retry-After"],  # For file downloads and 429s
     )
     
     print("✅ CORS middleware configured")
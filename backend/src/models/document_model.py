@@ -23,7 +23,11 @@ class ConfidenceLevel(str, Enum):
 class ExtractionMethod(str, Enum):
     OLLAMA = "ollama"
     HUGGINGFACE = "huggingface"
+    ONNX = "onnx"
     OPENAI = "openai"
+    OPENAI_COMPATIBLE = "openai_compatible"
+    RULES = "rules"
+    TEMPLATE = "template"
 
 # Core Models
 class FileInfo(BaseModel):
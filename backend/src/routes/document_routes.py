@@ -92,4 +92,34 @@ async def health_check(
     document_service = Depends(get_document_service)
 ):
     """System health check"""
-    return await controller.health_check_api(document_service)
\ No newline at end of file
+    return await controller.health_check_api(document_service)
+
+@router.get("/api/metrics")
+async def metrics(
+    document_service = Depends(get_document_service)
+):
+    """Processor runtime metrics (cache, latency, backends)"""
+    return await controller.metrics_api(document_service)
+
+@router.get("/api/classifier")
+async def classifier_versions(
+    document_service = Depends(get_document_service)
+):
+    """Classifier versions with accuracy and latency"""
+    return await controller.classifier_api(document_service)
+
+@router.post("/api/classifier/promote")
+async def promote_classifier(
+    body: dict,
+    document_service = Depends(get_document_service)
+):
+    """Make a classifier version active without a restart"""
+    return await controller.promote_classifier_api(body.get("version"), document_service)
+
+@router.post("/api/classifier/feedback")
+async def classifier_feedback(
+    body: dict,
+    document_service = Depends(get_document_service)
+):
+    """Human-reviewed document type - corrected or confirmed (trains the online classifier)"""
+    return await controller.classifier_feedback_api(body.get("text"), body.get("label"), document_service)
\ No newline at end of file
@@ -49,6 +49,8 @@ class HealthCheckResponseSchema(BaseModel):
     processor_ready: bool
     available_methods: List[str]
     available_model: List[str]
+    active_backend: Optional[str] = None
+    backends: Dict[str, Dict[str, Any]] = {}
 
 class DocumentListResponseSchema(BaseModel):
     """Document list API response schema"""
@@ -5,6 +5,7 @@ Document service - Business logic for document processing
 
 import uuid
 import time
+import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 
 from ..models.document_model import (
@@ -16,6 +17,7 @@ from ..models.document_model import (
 from ..core.processor import Processor
 from ..core.storage import StorageClient
 from ..core.textract_core import extract_text_from_file
+from ..exceptions.document_exceptions import ExtractionQueueFullError
 
 
 class FileHandler:
@@ -94,35 +96,69 @@ class DocumentService:
         self.storage_client = storage_client
         self.file_handler = FileHandler()
     
-    async def quick_scan(
-        self, 
-        file_content: bytes, 
-        filename: str
-    ) -> ProcessingResult:
-        """Quick scan: upload → process → remove"""
-        
+    async def _read_document(self, file_content: bytes, filename: str) -> Tuple[FileInfo, str]:
+        """Validate the file and extract its text (the temp file is removed afterwards)"""
+
         # Validate and analyze file
         file_info = self.file_handler.analyze_file(file_content, filename)
-        
-        # Save file temporarily
+
+        # Save file temporarily for text extraction
         temp_path = await self.file_handler.save_temp_file(file_content, filename)
-        
+
         try:
-            # Extract text
-            text = extract_text_from_file(temp_path, file_info.file_type)
-            
-            # Process with AI (synchronous call)
-            raw_result = self.processor.process_document(text)
-            
-            # Convert to structured result
-            result = self._convert_to_processing_result(raw_result, file_info)
-            
-            return result
-            
+            # OCR is blocking - keep it off the event loop
+            text = await asyncio.to_thread(extract_text_from_file, temp_path, file_info.file_type)
+            return file_info, text
+
         finally:
-            # Clean up temp file (quick scan removes file)
             if temp_path.exists():
                 temp_path.unlink(missing_ok=True)
+
+    async def _read_batch(self, files_data: List[Tuple[bytes, str]]) -> List[Any]:
+        """
+        Read every file, then classify all texts in one pass
+
+        Returns per file (file_info, text, classification), or the exception
+        that reading it raised.
+        """
+        documents: List[Any] = []
+        for file_content, filename in files_data:
+            try:
+                documents.append(await self._read_document(file_content, filename))
+            except Exception as e:
+                documents.append(e)
+
+        readable = [d for d in documents if not isinstance(d, Exception)]
+        classifications = iter(self.processor.classify_many([text for _, text in readable]))
+        return [
+            d if isinstance(d, Exception) else (d[0], d[1], next(classifications))
+            for d in documents
+        ]
+
+    async def quick_scan(
+        self, 
+        file_content: bytes, 
+        filename: str
+    ) -> ProcessingResult:
+        """Quick scan: upload → process → remove"""
+        
+        # Extract text (quick scan removes the file)
+        file_info, text = await self._read_document(file_content, filename)
+        return await self._scan_text(file_info, text)
+
+    async def _scan_text(
+        self,
+        file_info: FileInfo,
+        text: str,
+        classification: Optional[Tuple[str, float]] = None
+    ) -> ProcessingResult:
+        """Process extracted text and build the structured result"""
+
+        # Process with AI (non-blocking)
+        raw_result = await self.processor.aprocess_document(text, classification)
+
+        # Convert to structured result
+        return self._convert_to_processing_result(raw_result, file_info)
     
     async def document_workflow(
         self, 
@@ -131,59 +167,58 @@ class DocumentService:
     ) -> Dict[str, Any]:
         """Document workflow: upload → process → store"""
         
+        # Extract text
+        file_info, text = await self._read_document(file_content, filename)
+        return await self._store_document(file_content, filename, file_info, text)
+
+    async def _store_document(
+        self,
+        file_content: bytes,
+        filename: str,
+        file_info: FileInfo,
+        text: str,
+        classification: Optional[Tuple[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Process extracted text, then store the file and its metadata"""
+
         # Generate document ID
         document_id = str(uuid.uuid4())
         
-        # Validate and analyze file
-        file_info = self.file_handler.analyze_file(file_content, filename)
+        # Process with AI (non-blocking)
+        raw_result = await self.processor.aprocess_document(text, classification)
         
-        # Save file temporarily for processing
-        temp_path = await self.file_handler.save_temp_file(file_content, filename)
+        # Convert to structured result
+        processing_result = self._convert_to_processing_result(raw_result, file_info)
         
-        try:
-            # Extract text
-            text = extract_text_from_file(temp_path, file_info.file_type)
-            
-            # Process with AI (synchronous call)
-            raw_result = self.processor.process_document(text)
-            
-            # Convert to structured result
-            processing_result = self._convert_to_processing_result(raw_result, file_info)
-            
-            # Store file to Google Cloud Storage
-            storage_path = f"documents/{document_id}/{filename}"
-            storage_location = await self.storage_client.upload_file(
-                file_content, 
-                storage_path,
-                file_info.file_type
-            )
-            
-            # Store metadata
-            metadata = {
-                "document_id": document_id,
-                "original_filename": filename,
-                "storage_location": storage_location,
-                "processing_result": processing_result.dict(),
-                "uploaded_at": time.time(),
-                "file_info": file_info.dict()
-            }
-            
-            await self.storage_client.store_metadata(document_id, metadata)
-            
-            # Generate access URL
-            access_url = await self.storage_client.get_signed_url(storage_path)
-            
-            return {
-                "document_id": document_id,
-                "processing_result": processing_result,
-                "storage_location": storage_location,
-                "access_url": access_url
-            }
-            
-        finally:
-            # Clean up temp file
-            if temp_path.exists():
-                temp_path.unlink(missing_ok=True)
+        # Store file to Google Cloud Storage
+        storage_path = f"documents/{document_id}/{filename}"
+        storage_location = await self.storage_client.upload_file(
+            file_content, 
+            storage_path,
+            file_info.file_type
+        )
+        
+        # Store metadata
+        metadata = {
+            "document_id": document_id,
+            "original_filename": filename,
+            "storage_location": storage_location,
+            "processing_result": processing_result.dict(),
+            "uploaded_at": time.time(),
+            "file_info": file_info.dict()
+        }
+        
+        await self.storage_client.store_metadata(document_id, metadata)
+        
+        # Generate access URL
+        access_url = await self.storage_client.get_signed_url(storage_path)
+        
+        return {
+            "document_id": document_id,
+            "processing_result": processing_result,
+            "storage_location": storage_location,
+            "access_url": access_url
+        }
     
     async def batch_quick_scan(
         self, 
@@ -193,15 +228,23 @@ class DocumentService:
         
         batch_id = str(uuid.uuid4())
         results = []
+
+        # Text extraction for every file, then one classification pass for the batch
+        documents = await self._read_batch(files_data)
         
-        for i, (file_content, filename) in enumerate(files_data):
+        for i, ((file_content, filename), document) in enumerate(zip(files_data, documents)):
             try:
-                result = await self.quick_scan(file_content, filename)
+                if isinstance(document, Exception):
+                    raise document
+                result = await self._scan_text(*document)
                 # Add batch index if needed
                 if hasattr(result, 'batch_index'):
                     result.batch_index = i
                 results.append(result)
                 
+            except ExtractionQueueFullError:
+                # Overload: fail the batch fast so the client can retry later
+                raise
             except Exception as e:
                 error_result = ProcessingResult(
                     document_type=DocumentType.UNKNOWN,
@@ -236,13 +279,20 @@ class DocumentService:
         
         batch_id = str(uuid.uuid4())
         results = []
+
+        # Text extraction for every file, then one classification pass for the batch
+        documents = await self._read_batch(files_data)
         
-        for i, (file_content, filename) in enumerate(files_data):
+        for i, ((file_content, filename), document) in enumerate(zip(files_data, documents)):
             try:
-                result = await self.document_workflow(file_content, filename)
+                if isinstance(document, Exception):
+                    raise document
+                result = await self._store_document(file_content, filename, *document)
                 result["batch_index"] = i
                 results.append(result)
                 
+            except ExtractionQueueFullError:
+                raise
             except Exception as e:
                 error_result = {
                     "batch_index": i,
@@ -0,0 +1,23 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures - tests run from backend/ against the real prompts.yaml
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.core.prompt_loader import PromptLoader
+from src.core.structured_output import SchemaValidator
+
+PROMPTS_FILE = Path(__file__).resolve().parents[1] / "prompts.yaml"
+
+
+@pytest.fixture
+def prompt_loader() -> PromptLoader:
+    return PromptLoader(str(PROMPTS_FILE))
+
+
+@pytest.fixture
+def schema_validator() -> SchemaValidator:
+    return SchemaValidator()
@@ -0,0 +1,54 @@
+# backend/tests/test_chunking.py
+"""
+Merging per-chunk extractions of long documents
+"""
+
+from src.core.chunking import merge_partial_results
+
+
+def test_first_and_last_skip_empty_values():
+    merged = merge_partial_results(
+        [
+            {"vendor_name": None, "total_amount": 10.0},
+            {"vendor_name": "ACME Supplies Ltd", "total_amount": None},
+            {"vendor_name": "Other Ltd", "total_amount": 135.0},
+            {"vendor_name": "", "total_amount": None},
+        ],
+        {"vendor_name": "first", "total_amount": "last"},
+    )
+
+    assert merged == {"vendor_name": "ACME Supplies Ltd", "total_amount": 135.0}
+
+
+def test_union_combines_lists_without_duplicates():
+    merged = merge_partial_results(
+        [
+            {"parties": ["Contoso Ltd"]},
+            {"parties": None},
+            {"parties": ["Fabrikam Inc", "Contoso Ltd"]},
+        ],
+        {"parties": "union"},
+    )
+
+    assert merged == {"parties": ["Contoso Ltd", "Fabrikam Inc"]}
+
+
+def test_union_keeps_strings_with_commas_whole():
+    merged = merge_partial_results(
+        [{"parties": "Acme, Inc."}, {"parties": ["22 High St, York"]}],
+        {"parties": "union"},
+    )
+
+    assert merged == {"parties": ["Acme, Inc.", "22 High St, York"]}
+
+
+def test_field_missing_from_every_chunk_stays_empty():
+    merged = merge_partial_results([{"key_terms": None}, {"key_terms": []}], {"key_terms": "union"})
+
+    assert merged == {"key_terms": []}
+
+
+def test_unlisted_fields_default_to_first():
+    merged = merge_partial_results([{"form_type": "W-9"}, {"form_type": "W-4"}], {})
+
+    assert merged == {"form_type": "W-9"}
@@ -0,0 +1,101 @@
+# backend/tests/test_circuit_breaker.py
+"""
+Circuit breaker state transitions
+"""
+
+import pytest
+
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+
+
+@pytest.fixture
+def breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("ollama")
+    breaker.min_calls = 4
+    breaker.failure_rate_threshold = 0.5
+    breaker.window_seconds = 60
+    breaker.open_seconds = 30
+    breaker.slow_call_seconds = 10
+    breaker.half_open_max_calls = 1
+    return breaker
+
+
+def _cool_down(breaker: CircuitBreaker) -> None:
+    breaker.opened_at -= breaker.open_seconds + 1
+
+
+def test_opens_when_failure_rate_reaches_threshold(breaker):
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitState.CLOSED  # below min_calls
+
+    breaker.record_failure("boom")
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_slow_calls_count_as_failures(breaker):
+    for _ in range(4):
+        breaker.record_success(11.0)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.last_reason.startswith("slow call")
+
+
+def test_half_open_trial_success_closes(breaker):
+    breaker.trip("startup check failed")
+    breaker.opened_by_probe = False
+    _cool_down(breaker)
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    # Only half_open_max_calls trials at a time
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_half_open_trial_failure_reopens(breaker):
+    breaker.trip("startup check failed")
+    _cool_down(breaker)
+    assert breaker.allow_request()
+
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.opened_by_probe
+    assert not breaker.is_available()
+
+
+def test_probe_success_closes_a_circuit_a_probe_opened(breaker):
+    breaker.record_probe(False)
+    assert breaker.state == CircuitState.OPEN and breaker.opened_by_probe
+
+    breaker.record_probe(True)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_probe_success_does_not_close_a_circuit_real_calls_opened(breaker):
+    for _ in range(4):
+        breaker.record_failure("generation error")
+    assert breaker.state == CircuitState.OPEN and not breaker.opened_by_probe
+
+    breaker.record_probe(True)
+    assert breaker.state == CircuitState.OPEN
+
+    # After the cool-down it still has to pass a real half-open trial
+    _cool_down(breaker)
+    breaker.record_probe(True)
+    assert breaker.state == CircuitState.HALF_OPEN
+
+
+def test_release_trial_frees_the_slot(breaker):
+    breaker.trip("startup check failed")
+    _cool_down(breaker)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release_trial()
+    assert breaker.allow_request()
@@ -0,0 +1,84 @@
+# backend/tests/test_json_stream.py
+"""
+Early stop of streamed generation once the JSON object closes
+"""
+
+import asyncio
+import json
+
+from src.core.backends.ollama_backend import OllamaBackend
+from src.core.json_stream import IncrementalJSONParser
+
+
+def _feed(tokens):
+    parser = IncrementalJSONParser()
+    for index, token in enumerate(tokens):
+        if parser.feed(token):
+            return parser, index
+    return parser, None
+
+
+def test_stops_when_the_object_closes():
+    parser, stopped_at = _feed(['Here is the JSON: {"a"', ': 1, "b": {"c": 2}', "}", " and some", " chatter"])
+
+    assert stopped_at == 2
+    assert parser.json_text == '{"a": 1, "b": {"c": 2}}'
+
+
+def test_braces_inside_strings_do_not_close_the_object():
+    parser, stopped_at = _feed(['{"note": "a } and a \\" {', '", "x": 1}', "trailing"])
+
+    assert stopped_at == 1
+    assert json.loads(parser.json_text) == {"note": 'a } and a " {', "x": 1}
+
+
+def test_unclosed_object_returns_everything():
+    parser, stopped_at = _feed(['{"a": 1', ', "b": 2'])
+
+    assert stopped_at is None and not parser.complete
+    assert parser.json_text == '{"a": 1, "b": 2'
+
+
+class _StreamedResponse:
+    """Ollama NDJSON stream that records how far it was read"""
+
+    def __init__(self, tokens):
+        self.events = [{"response": token, "done": False} for token in tokens]
+        self.events.append({"response": "", "done": True, "load_duration": 0})
+        self.read = 0
+        self.closed = False
+
+    @property
+    def content(self):
+        return self._lines()
+
+    async def _lines(self):
+        for event in self.events:
+            if self.closed:
+                return
+            self.read += 1
+            yield (json.dumps(event) + "\n").encode()
+
+    def close(self):
+        self.closed = True
+
+
+def test_ollama_stream_is_closed_after_the_object():
+    backend = OllamaBackend.__new__(OllamaBackend)
+    response = _StreamedResponse(['{"total_amount"', ": 3.5}", " Let me explain", " the result"])
+
+    text, timing = asyncio.run(backend._read_stream(response))
+
+    assert text == '{"total_amount": 3.5}'
+    assert response.closed and response.read == 2
+    # Cut short - only the time to first token is known
+    assert set(timing) == {"first_token_seconds"}
+
+
+def test_ollama_stream_continues_from_prefix():
+    backend = OllamaBackend.__new__(OllamaBackend)
+    response = _StreamedResponse(['"b": 2}'])
+
+    text, _ = asyncio.run(backend._read_stream(response, prefix='{"a": 1, '))
+
+    assert json.loads(text) == {"a": 1, "b": 2}
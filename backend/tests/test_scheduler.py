@@ -0,0 +1,124 @@
+# backend/tests/test_scheduler.py
+"""
+Extraction scheduler - round-robin fairness across clients and 429 on overload
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.controllers.document_controller import DocumentController
+from src.core.scheduler import ExtractionScheduler
+from src.exceptions.document_exceptions import ExtractionQueueFullError
+
+
+async def _admission_order(scheduler: ExtractionScheduler, arrivals):
+    """Client ids in the order they got the single slot, after queuing behind a holder"""
+    order = []
+    release = asyncio.Event()
+
+    async def holder():
+        async with scheduler.slot("ollama", "holder"):
+            await release.wait()
+
+    async def request(client_id):
+        async with scheduler.slot("ollama", client_id):
+            order.append(client_id)
+            await asyncio.sleep(0)
+
+    holding = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiting = []
+    for client_id in arrivals:
+        waiting.append(asyncio.create_task(request(client_id)))
+        await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(holding, *waiting)
+    return order
+
+
+def test_waiters_are_served_round_robin_across_clients():
+    scheduler = ExtractionScheduler(concurrency={"ollama": 1}, max_queue=10, queue_timeout=5)
+    order = asyncio.run(_admission_order(scheduler, ["noisy", "noisy", "noisy", "quiet"]))
+
+    # The quiet client is served second, not behind the noisy client's whole backlog
+    assert order == ["noisy", "quiet", "noisy", "noisy"]
+    stats = scheduler.stats()["ollama"]
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["admitted"] == 5
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    scheduler = ExtractionScheduler(concurrency={"ollama": 1}, max_queue=1, queue_timeout=5)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold(client_id):
+            async with scheduler.slot("ollama", client_id):
+                await release.wait()
+
+        tasks = [asyncio.create_task(hold("a")), asyncio.create_task(hold("b"))]
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractionQueueFullError) as excinfo:
+            async with scheduler.slot("ollama", "c"):
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+        return excinfo.value
+
+    error = asyncio.run(run())
+    assert error.backend == "ollama"
+    assert error.reason == "queue full"
+    assert error.retry_after >= 1
+    assert scheduler.stats()["ollama"]["rejected"] == 1
+
+
+def test_queue_wait_timeout_is_rejected_and_frees_the_queue():
+    scheduler = ExtractionScheduler(concurrency={"ollama": 1}, max_queue=5, queue_timeout=0.05)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("ollama", "a"):
+                await release.wait()
+
+        holding = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractionQueueFullError) as excinfo:
+            async with scheduler.slot("ollama", "b"):
+                pass
+        release.set()
+        await holding
+        return excinfo.value
+
+    error = asyncio.run(run())
+    assert error.reason == "queue wait timeout"
+    stats = scheduler.stats()["ollama"]
+    assert stats["timed_out"] == 1
+    assert stats["queued"] == 0 and stats["in_flight"] == 0
+
+
+class _OverloadedService:
+    async def quick_scan(self, file_content, filename):
+        raise ExtractionQueueFullError("ollama", 7)
+
+
+class _Upload:
+    filename = "receipt.txt"
+
+    async def read(self):
+        return b"TOTAL 1.00"
+
+
+def test_overload_is_answered_with_429():
+    controller = DocumentController()
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(controller.quick_scan_api(_Upload(), _OverloadedService()))
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers == {"Retry-After": "7"}